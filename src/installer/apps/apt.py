@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from shlex import quote
+from threading import RLock
+from time import time
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+from utilities.subprocess import (
+    APT_UPDATE,
+    apt_install_cmd,
+    apt_remove_cmd,
+    maybe_sudo_cmd,
+    run,
+)
+
+from installer.apps.constants import APT_LISTS_TTL, PATH_APT_SOURCES, PATH_APT_STAMPS
+from installer.apps.dpkg import get_installed_packages, get_missing_packages
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+
+_LOGGER = to_logger(__name__)
+_LOCK = RLock()
+
+
+##
+
+
+def apt_install(
+    package: str,
+    /,
+    *packages: str,
+    sudo: bool = False,
+    force: bool = False,
+    ttl: int = APT_LISTS_TTL,
+) -> None:
+    """Install the missing packages of a set in a single transaction."""
+    all_packages = [package, *packages]
+    with _LOCK:
+        missing = all_packages if force else get_missing_packages(all_packages)
+        if len(missing) == 0:
+            _LOGGER.info("%r are already installed", all_packages)
+            return
+        apt_update(sudo=sudo, ttl=ttl)
+        run(*maybe_sudo_cmd(*apt_install_cmd(*missing), sudo=sudo))
+
+
+def apt_remove(package: str, /, *packages: str, sudo: bool = False) -> None:
+    """Remove the installed packages of a set in a single transaction."""
+    with _LOCK:
+        installed = get_installed_packages([package, *packages])
+        if len(installed) == 0:
+            return
+        run(*maybe_sudo_cmd(*apt_remove_cmd(*installed), sudo=sudo))
+
+
+def apt_update(
+    *,
+    sudo: bool = False,
+    ttl: int = APT_LISTS_TTL,
+    stamps: Sequence[Path] = PATH_APT_STAMPS,
+    sources: Path = PATH_APT_SOURCES,
+) -> None:
+    """Update 'apt', unless its lists are fresh."""
+    with _LOCK:
+        if is_apt_lists_fresh(ttl=ttl, stamps=stamps, sources=sources):
+            _LOGGER.info("'apt' lists are fresh; skipping update")
+            return
+        run(*maybe_sudo_cmd(*APT_UPDATE, sudo=sudo))
+
+
+def apt_update_cmd(
+    *,
+    sudo: bool = False,
+    ttl: int = APT_LISTS_TTL,
+    stamps: Sequence[Path] = PATH_APT_STAMPS,
+    sources: Path = PATH_APT_SOURCES,
+) -> list[str]:
+    """Command to update 'apt', unless its lists are fresh."""
+    stamps_, sources_ = " ".join(quote(str(s)) for s in stamps), quote(str(sources))
+    # '-mmin' counts whole minutes, so round up; a sub-minute TTL stays positive
+    minutes = max(-(-ttl // 60), 1)
+    script = " ".join([
+        f'stamp=; for p in {stamps_}; do if [ -e "$p" ]; then stamp=$p; break; fi; done;',
+        'if [ -n "$stamp" ]',
+        f'&& [ -n "$(find "$stamp" -maxdepth 0 -mmin -{minutes} 2>/dev/null)" ]',
+        f'&& [ -z "$(find {sources_}/sources.list {sources_}/sources.list.d',
+        '-newer "$stamp" 2>/dev/null)" ];',
+        "then echo \"'apt' lists are fresh; skipping update\";",
+        f"else {' '.join(APT_UPDATE)}; fi",
+    ])
+    return maybe_sudo_cmd("sh", "-c", script, sudo=sudo)
+
+
+def is_apt_lists_fresh(
+    *,
+    ttl: int = APT_LISTS_TTL,
+    stamps: Sequence[Path] = PATH_APT_STAMPS,
+    sources: Path = PATH_APT_SOURCES,
+) -> bool:
+    """Check if the last 'apt update' is within the TTL and newer than every source."""
+    try:
+        mtime = next(s for s in stamps if s.exists()).stat().st_mtime
+    except (StopIteration, OSError):
+        return False
+    if time() - mtime >= ttl:
+        return False
+    paths = [
+        sources / "sources.list",
+        sources / "sources.list.d",
+        *(sources / "sources.list.d").glob("*"),
+    ]
+    return all(p.stat().st_mtime <= mtime for p in paths if p.exists())
+
+
+__all__ = [
+    "apt_install",
+    "apt_remove",
+    "apt_update",
+    "apt_update_cmd",
+    "is_apt_lists_fresh",
+]
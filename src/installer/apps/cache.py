@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from os import utime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+from utilities.inflect import counted_noun
+
+from installer.apps.constants import ASSET_CACHE_MAX_SIZE, PATH_ASSET_CACHE
+
+if TYPE_CHECKING:
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+_PARTIAL_SUFFIXES = {".checkpoint", ".part", ".tmp"}
+
+
+##
+
+
+def get_asset_cache_path(
+    owner: str,
+    repo: str,
+    tag: str,
+    name: str,
+    /,
+    *,
+    size: int,
+    digest: str | None = None,
+    root: PathLike = PATH_ASSET_CACHE,
+) -> Path:
+    """Get the cache path of a GitHub asset."""
+    key = str(size) if digest is None else digest.replace(":", "-")
+    return Path(root, owner, repo, tag, key, name)
+
+
+##
+
+
+def get_cached_asset(path: PathLike, /, *, size: int) -> Path | None:
+    """Get a cached GitHub asset, marking it as recently used."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    if stat.st_size != size:
+        _LOGGER.warning(
+            "Ignoring cached %r; expected %d bytes but got %d",
+            str(path),
+            size,
+            stat.st_size,
+        )
+        return None
+    utime(path)
+    return path
+
+
+##
+
+
+def evict_asset_cache(
+    *,
+    root: PathLike = PATH_ASSET_CACHE,
+    max_size: int = ASSET_CACHE_MAX_SIZE,
+    keep: PathLike | None = None,
+) -> list[Path]:
+    """Evict the least recently used assets until the cache fits its size cap."""
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    entries = [
+        (p, p.stat())
+        for p in root.rglob("*")
+        if p.is_file() and (p.suffix not in _PARTIAL_SUFFIXES)
+    ]
+    total = sum(s.st_size for _, s in entries)
+    keep_use = None if keep is None else Path(keep)
+    evicted: list[Path] = []
+    for path, stat in sorted(entries, key=lambda e: e[1].st_mtime):
+        if total <= max_size:
+            break
+        if path == keep_use:
+            continue
+        path.unlink(missing_ok=True)
+        total -= stat.st_size
+        evicted.append(path)
+        _remove_empty_parents(path, root)
+    if len(evicted) >= 1:
+        _LOGGER.info("Evicted %s from %r", counted_noun(evicted, "asset"), str(root))
+    return evicted
+
+
+def _remove_empty_parents(path: Path, root: Path, /) -> None:
+    for parent in path.parents:
+        if parent == root:
+            return
+        try:
+            parent.rmdir()
+        except OSError:
+            return
+
+
+__all__ = ["evict_asset_cache", "get_asset_cache_path", "get_cached_asset"]
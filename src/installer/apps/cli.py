@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import json
+from dataclasses import asdict
 from typing import TYPE_CHECKING
 
 import utilities.click
-from click import argument, option
+from click import ClickException, argument, echo, get_text_stream, option
 from utilities.click import Str
 from utilities.core import PermissionsLike, is_pytest, set_up_logging
 
 from installer.apps.click import (
     force_option,
     group_option,
+    latest_option,
     owner_option,
     path_binaries_option,
     perms_binary_option,
@@ -17,6 +20,12 @@ from installer.apps.click import (
     perms_option,
     token_option,
 )
+from installer.apps.install import (
+    format_results,
+    install_apps,
+    install_apps_over_ssh,
+    run_batch,
+)
 from installer.apps.lib import (
     set_up_age,
     set_up_apt_package,
@@ -50,6 +59,8 @@ from installer.apps.lib import (
     setup_watchexec,
     setup_yq,
 )
+from installer.apps.push import push_apps
+from installer.apps.status import format_statuses, get_statuses
 from installer.click import retry_option, ssh_option, sudo_option
 from installer.configs.click import etc_option, home_option, root_option, shell_option
 
@@ -58,17 +69,17 @@ if TYPE_CHECKING:
     from utilities.types import PathLike, Retry, SecretLike
 
 
-@argument("package", type=str)
+@argument("packages", type=str, nargs=-1, required=True)
 @ssh_option
 @sudo_option
 @retry_option
 def apt_package_sub_cmd(
-    *, package: str, ssh: str | None, sudo: bool, retry: Retry | None
+    *, packages: tuple[str, ...], ssh: str | None, sudo: bool, retry: Retry | None
 ) -> None:
     if is_pytest():
         return
     set_up_logging(__name__, root=True)
-    set_up_apt_package(package, ssh=ssh, sudo=sudo, retry=retry)
+    set_up_apt_package(*packages, ssh=ssh, sudo=sudo, retry=retry)
 
 
 ##
@@ -82,6 +93,7 @@ def apt_package_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def age_sub_cmd(
     *,
@@ -93,6 +105,7 @@ def age_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -107,6 +120,7 @@ def age_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -122,6 +136,7 @@ def age_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def bat_sub_cmd(
     *,
@@ -133,6 +148,7 @@ def bat_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -147,6 +163,7 @@ def bat_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -162,6 +179,7 @@ def bat_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def btm_sub_cmd(
     *,
@@ -173,6 +191,7 @@ def btm_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -187,6 +206,7 @@ def btm_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -215,6 +235,7 @@ def curl_sub_cmd(*, ssh: str | None, sudo: bool, retry: Retry | None) -> None:
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def delta_sub_cmd(
     *,
@@ -226,6 +247,7 @@ def delta_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -240,6 +262,7 @@ def delta_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -260,6 +283,7 @@ def delta_sub_cmd(
 @root_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def direnv_sub_cmd(
     *,
@@ -276,6 +300,7 @@ def direnv_sub_cmd(
     root: PathLike | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -295,6 +320,7 @@ def direnv_sub_cmd(
         root=root,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -327,6 +353,7 @@ def docker_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def dust_sub_cmd(
     *,
@@ -338,6 +365,7 @@ def dust_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -352,6 +380,7 @@ def dust_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -367,6 +396,7 @@ def dust_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def eza_sub_cmd(
     *,
@@ -378,6 +408,7 @@ def eza_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -392,6 +423,7 @@ def eza_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -407,6 +439,7 @@ def eza_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def fd_sub_cmd(
     *,
@@ -418,6 +451,7 @@ def fd_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -432,6 +466,7 @@ def fd_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -452,6 +487,7 @@ def fd_sub_cmd(
 @root_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def fzf_sub_cmd(
     *,
@@ -468,6 +504,7 @@ def fzf_sub_cmd(
     root: PathLike | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -487,6 +524,7 @@ def fzf_sub_cmd(
         root=root,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -514,6 +552,7 @@ def git_sub_cmd(*, ssh: str | None, sudo: bool, retry: Retry | None) -> None:
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def jq_sub_cmd(
     *,
     force: bool,
@@ -523,6 +562,7 @@ def jq_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -535,6 +575,7 @@ def jq_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -549,6 +590,7 @@ def jq_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def just_sub_cmd(
     *,
@@ -560,6 +602,7 @@ def just_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -574,6 +617,7 @@ def just_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -589,6 +633,7 @@ def just_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def nvim_sub_cmd(
     *,
@@ -600,6 +645,7 @@ def nvim_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -614,6 +660,7 @@ def nvim_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -624,14 +671,22 @@ def nvim_sub_cmd(
 @token_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def pve_fake_subscription_sub_cmd(
-    *, token: SecretLike | None, ssh: str | None, force: bool, retry: Retry | None
+    *,
+    token: SecretLike | None,
+    ssh: str | None,
+    force: bool,
+    latest: bool,
+    retry: Retry | None,
 ) -> None:
     if is_pytest():
         return
     set_up_logging(__name__, root=True)
-    set_up_pve_fake_subscription(token=token, ssh=ssh, force=force, retry=retry)
+    set_up_pve_fake_subscription(
+        token=token, ssh=ssh, force=force, latest=latest, retry=retry
+    )
 
 
 ##
@@ -645,6 +700,7 @@ def pve_fake_subscription_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def restic_sub_cmd(
     *,
@@ -656,6 +712,7 @@ def restic_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -670,6 +727,7 @@ def restic_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -683,6 +741,7 @@ def restic_sub_cmd(
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def ripgrep_sub_cmd(
     *,
     token: SecretLike | None,
@@ -691,6 +750,7 @@ def ripgrep_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -702,6 +762,7 @@ def ripgrep_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -727,6 +788,7 @@ def rsync_sub_cmd(*, ssh: str | None, sudo: bool, retry: Retry | None) -> None:
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def ruff_sub_cmd(
     *,
     token: SecretLike | None,
@@ -735,6 +797,7 @@ def ruff_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -746,6 +809,7 @@ def ruff_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -758,6 +822,7 @@ def ruff_sub_cmd(
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def sd_sub_cmd(
     *,
     token: SecretLike | None,
@@ -766,6 +831,7 @@ def sd_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -777,6 +843,7 @@ def sd_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -789,6 +856,7 @@ def sd_sub_cmd(
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def shellcheck_sub_cmd(
     *,
     token: SecretLike | None,
@@ -797,6 +865,7 @@ def shellcheck_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -808,6 +877,7 @@ def shellcheck_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -820,6 +890,7 @@ def shellcheck_sub_cmd(
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def shfmt_sub_cmd(
     *,
     token: SecretLike | None,
@@ -828,6 +899,7 @@ def shfmt_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -839,6 +911,7 @@ def shfmt_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -853,6 +926,7 @@ def shfmt_sub_cmd(
 @group_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def sops_sub_cmd(
     *,
@@ -864,6 +938,7 @@ def sops_sub_cmd(
     group: str | int | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -878,6 +953,7 @@ def sops_sub_cmd(
         group=group,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -901,6 +977,7 @@ def sops_sub_cmd(
 )
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def starship_sub_cmd(
     *,
@@ -918,6 +995,7 @@ def starship_sub_cmd(
     starship_toml: PathLike | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -938,6 +1016,7 @@ def starship_sub_cmd(
         starship_toml=starship_toml,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
@@ -951,6 +1030,7 @@ def starship_sub_cmd(
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def taplo_sub_cmd(
     *,
     token: SecretLike | None,
@@ -959,6 +1039,7 @@ def taplo_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -970,6 +1051,7 @@ def taplo_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -984,6 +1066,7 @@ def taplo_sub_cmd(
 @owner_option
 @group_option
 @retry_option
+@latest_option
 def uv_sub_cmd(
     *,
     ssh: str | None,
@@ -994,6 +1077,7 @@ def uv_sub_cmd(
     owner: str | int | None,
     group: str | int | None,
     retry: Retry | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -1007,6 +1091,7 @@ def uv_sub_cmd(
         owner=owner,
         group=group,
         retry=retry,
+        latest=latest,
     )
 
 
@@ -1019,6 +1104,7 @@ def uv_sub_cmd(
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def watchexec_sub_cmd(
     *,
     token: SecretLike | None,
@@ -1027,6 +1113,7 @@ def watchexec_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -1038,6 +1125,7 @@ def watchexec_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -1050,6 +1138,7 @@ def watchexec_sub_cmd(
 @perms_option
 @owner_option
 @group_option
+@latest_option
 def yq_sub_cmd(
     *,
     token: SecretLike | None,
@@ -1058,6 +1147,7 @@ def yq_sub_cmd(
     perms: PermissionsLike,
     owner: str | int | None,
     group: str | int | None,
+    latest: bool,
 ) -> None:
     if is_pytest():
         return
@@ -1069,6 +1159,7 @@ def yq_sub_cmd(
         perms=perms,
         owner=owner,
         group=group,
+        latest=latest,
     )
 
 
@@ -1088,6 +1179,7 @@ def yq_sub_cmd(
 @root_option
 @ssh_option
 @force_option
+@latest_option
 @retry_option
 def zoxide_sub_cmd(
     *,
@@ -1104,6 +1196,7 @@ def zoxide_sub_cmd(
     root: PathLike | None,
     ssh: str | None,
     force: bool,
+    latest: bool,
     retry: Retry | None,
 ) -> None:
     if is_pytest():
@@ -1123,14 +1216,151 @@ def zoxide_sub_cmd(
         root=root,
         ssh=ssh,
         force=force,
+        latest=latest,
         retry=retry,
     )
 
 
+##
+
+
+def batch_sub_cmd() -> None:
+    if is_pytest():
+        return
+    set_up_logging(__name__, root=True)
+    lines = get_text_stream("stdin").read().splitlines()
+    specs = [json.loads(line) for line in lines if line.strip() != ""]
+    failed: list[str] = []
+    for result in run_batch(specs):
+        echo(json.dumps(asdict(result)))
+        if not result.ok:
+            failed.append(result.app)
+    if len(failed) >= 1:
+        msg = f"Failed to install {failed}"
+        raise ClickException(msg)
+
+
+##
+
+
+@argument("apps", type=Str(), nargs=-1, required=True)
+@token_option
+@path_binaries_option
+@sudo_option
+@force_option
+@latest_option
+@ssh_option
+@retry_option
+def install_sub_cmd(
+    *,
+    apps: tuple[str, ...],
+    token: SecretLike | None,
+    path_binaries: PathLike,
+    sudo: bool,
+    force: bool,
+    latest: bool,
+    ssh: str | None,
+    retry: Retry | None,
+) -> None:
+    if is_pytest():
+        return
+    set_up_logging(__name__, root=True)
+    if ssh is not None:
+        specs = [
+            {
+                "app": app,
+                "token": token,
+                "path_binaries": path_binaries,
+                "sudo": sudo,
+                "force": force,
+                "latest": latest,
+            }
+            for app in apps
+        ]
+        try:
+            _ = install_apps_over_ssh(specs, ssh, retry=retry)
+        except (RuntimeError, ValueError) as error:
+            raise ClickException(str(error)) from None
+        return
+    results = install_apps(
+        apps,
+        token=token,
+        path_binaries=path_binaries,
+        sudo=sudo,
+        force=force,
+        latest=latest,
+    )
+    echo(format_results(results))
+    if not all(r.ok for r in results):
+        msg = f"Failed to install {[r.app for r in results if not r.ok]}"
+        raise ClickException(msg)
+
+
+@argument("apps", type=Str(), nargs=-1, required=True)
+@ssh_option
+@token_option
+@path_binaries_option
+@sudo_option
+@perms_option
+@owner_option
+@group_option
+@retry_option
+def push_sub_cmd(
+    *,
+    apps: tuple[str, ...],
+    ssh: str | None,
+    token: SecretLike | None,
+    path_binaries: PathLike,
+    sudo: bool,
+    perms: PermissionsLike,
+    owner: str | int | None,
+    group: str | int | None,
+    retry: Retry | None,
+) -> None:
+    if is_pytest():
+        return
+    if ssh is None:
+        msg = "'--ssh' is required"
+        raise ClickException(msg)
+    set_up_logging(__name__, root=True)
+    try:
+        _ = push_apps(
+            apps,
+            ssh,
+            token=token,
+            path_binaries=path_binaries,
+            sudo=sudo,
+            perms=perms,
+            owner=owner,
+            group=group,
+            retry=retry,
+        )
+    except (RuntimeError, ValueError) as error:
+        raise ClickException(str(error)) from None
+
+
+@token_option
+def outdated_sub_cmd(*, token: SecretLike | None) -> None:
+    if is_pytest():
+        return
+    set_up_logging(__name__, root=True)
+    statuses = [s for s in get_statuses(token=token) if s.outdated]
+    echo(format_statuses(statuses))
+
+
+@token_option
+def status_sub_cmd(*, token: SecretLike | None) -> None:
+    if is_pytest():
+        return
+    set_up_logging(__name__, root=True)
+    echo(format_statuses(get_statuses(token=token)))
+
+
 __all__ = [
     "age_sub_cmd",
     "apt_package_sub_cmd",
     "bat_sub_cmd",
+    "batch_sub_cmd",
     "btm_sub_cmd",
     "curl_sub_cmd",
     "delta_sub_cmd",
@@ -1140,9 +1370,12 @@ __all__ = [
     "fd_sub_cmd",
     "fzf_sub_cmd",
     "git_sub_cmd",
+    "install_sub_cmd",
     "jq_sub_cmd",
     "just_sub_cmd",
     "nvim_sub_cmd",
+    "outdated_sub_cmd",
+    "push_sub_cmd",
     "pve_fake_subscription_sub_cmd",
     "restic_sub_cmd",
     "ripgrep_sub_cmd",
@@ -1153,6 +1386,7 @@ __all__ = [
     "shfmt_sub_cmd",
     "sops_sub_cmd",
     "starship_sub_cmd",
+    "status_sub_cmd",
     "taplo_sub_cmd",
     "uv_sub_cmd",
     "watchexec_sub_cmd",
@@ -17,6 +17,12 @@ force_option = option(
     help="Force the installation even if the command already exists",
 )
 group_option = option("--group", type=Str(), default=None, help="Binary group")
+latest_option = option(
+    "--latest",
+    is_flag=True,
+    default=False,
+    help="Upgrade the command if it was not installed from the latest release",
+)
 owner_option = option("--owner", type=Str(), default=None, help="Binary owner")
 path_binaries_option = option(
     "--path-binaries",
@@ -39,6 +45,7 @@ token_option = option(
 __all__ = [
     "force_option",
     "group_option",
+    "latest_option",
     "owner_option",
     "path_binaries_option",
     "perms_binary_option",
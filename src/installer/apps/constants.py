@@ -1,117 +1,78 @@
 from __future__ import annotations
 
-from collections.abc import Set as AbstractSet
 from pathlib import Path
-from platform import machine, system
-from re import IGNORECASE, search
-from typing import TYPE_CHECKING
 
 from pydantic import SecretStr
-from utilities.core import OneEmptyError, get_env, has_env, one
-from utilities.shellingham import get_shell
-from utilities.subprocess import RunFileNotFoundError, run
-from utilities.typing import get_args
-
-from installer.types import System
-
-if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
-
+from utilities.constants import HOME
+from utilities.core import get_env, has_env
 
 TIMEOUT = 60
+APT_LISTS_TTL = get_env("INSTALLER_APT_LISTS_TTL", default="3600", transform=int)
 CHUNK_SIZE = 8196
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_CHUNK_SIZE = 20
+GITHUB_GRAPHQL_NUM_RELEASES = 20
 GITHUB_TOKEN = SecretStr(get_env("GITHUB_TOKEN")) if has_env("GITHUB_TOKEN") else None
 PATH_BINARIES = Path("/usr/local/bin/")
+PATH_CACHE = Path(get_env("XDG_CACHE_HOME", default=str(HOME / ".cache")), "installer")
+# the first which exists is the time of the last successful 'apt update'
+PATH_APT_STAMPS = (
+    Path("/var/lib/apt/periodic/update-success-stamp"),
+    Path("/var/cache/apt/pkgcache.bin"),
+)
+PATH_APT_SOURCES = Path("/etc/apt")
+PATH_ASSET_CACHE = PATH_CACHE / "assets"
+PATH_DPKG_STATUS = Path("/var/lib/dpkg/status")
+PATH_METADATA_CACHE = PATH_CACHE / "metadata"
+PATH_PLATFORM_CACHE = PATH_CACHE / "platform.json"
+PATH_VERSION_CACHE = PATH_CACHE / "versions.json"
+PATH_STATE = Path(
+    get_env("XDG_STATE_HOME", default=str(HOME / ".local" / "state")), "installer"
+)
+PATH_STATE_DB = PATH_STATE / "state.sqlite"
+ASSET_CACHE_MAX_SIZE = 2 * 1024**3
+DOWNLOAD_CONNECTIONS = get_env(
+    "INSTALLER_DOWNLOAD_CONNECTIONS", default="4", transform=int
+)
+DOWNLOAD_MIN_PART_SIZE = get_env(
+    "INSTALLER_DOWNLOAD_MIN_PART_SIZE", default=str(8 * 1024**2), transform=int
+)
+DOWNLOAD_RETRIES = get_env("INSTALLER_DOWNLOAD_RETRIES", default="3", transform=int)
+INSTALL_MAX_WORKERS = get_env(
+    "INSTALLER_INSTALL_MAX_WORKERS", default="8", transform=int
+)
+STATUS_MAX_WORKERS = get_env(
+    "INSTALLER_STATUS_MAX_WORKERS", default="16", transform=int
+)
 PERMISSIONS_BINARY = "u=rwx,g=rx,o=rx"
 PERMISSIONS_CONFIG = "u=rw,g=r,o=r"
-SHELL = get_shell()
-
-
-def _get_system_name() -> System:
-    sys = system()
-    systems: tuple[System, ...] = get_args(System)
-    if sys in systems:
-        return sys
-    msg = f"Invalid system name; must be in {systems} but got {sys!r}"
-    raise ValueError(msg)
-
-
-SYSTEM_NAME = _get_system_name()
-
-
-def _get_unique_group[T: AbstractSet[str]](
-    groups: Iterable[T], predicate: Callable[[str], bool], /
-) -> T:
-    return one(g for g in groups if any(map(predicate, g)))
-
-
-def _get_system_name_group() -> set[str]:
-    groups: list[set[str]] = [{"darwin", "macos"}, {"linux"}]
-    system_ = SYSTEM_NAME.lower()
-
-    def predicate(text: str, /) -> bool:
-        return text.lower() == system_
-
-    try:
-        return _get_unique_group(groups, predicate)
-    except OneEmptyError:
-        msg = f"Invalid system name; must be in {groups} but got {system_!r}"
-        raise ValueError(msg) from None
-
-
-SYSTEM_NAME_GROUP = _get_system_name_group()
-
-
-def _get_c_std_lib_group() -> set[str] | None:
-    try:
-        result = run("ldd", "--version", return_=True)
-    except RunFileNotFoundError:
-        return None
-    groups: list[set[str]] = [{"gnu", "glibc"}, {"musl"}]
-
-    def predicate(text: str, /) -> bool:
-        return search(text, result, flags=IGNORECASE) is not None
-
-    try:
-        return _get_unique_group(groups, predicate)
-    except OneEmptyError:
-        msg = f"Invalid C standard library; must be in {groups} but got {result!r}"
-        raise ValueError(msg) from None
-
-
-C_STD_LIB_GROUP = _get_c_std_lib_group()
-
-
-def _get_machine_type_group() -> set[str]:
-    groups: list[set[str]] = [
-        {"amd64", "intel64", "x64", "x86_64"},
-        {"aarch64", "arm64"},
-    ]
-    machine_ = machine().lower()
-
-    def predicate(text: str, /) -> bool:
-        return text.lower() == machine_
-
-    try:
-        return _get_unique_group(groups, predicate)
-    except OneEmptyError:
-        msg = f"Invalid machine type; must be in {groups} but got {machine_!r}"
-        raise ValueError(msg) from None
-
-
-MACHINE_TYPE_GROUP = _get_machine_type_group()
 
 
 __all__ = [
+    "APT_LISTS_TTL",
+    "ASSET_CACHE_MAX_SIZE",
     "CHUNK_SIZE",
-    "C_STD_LIB_GROUP",
+    "DOWNLOAD_CONNECTIONS",
+    "DOWNLOAD_MIN_PART_SIZE",
+    "DOWNLOAD_RETRIES",
+    "GITHUB_API_URL",
+    "GITHUB_GRAPHQL_CHUNK_SIZE",
+    "GITHUB_GRAPHQL_NUM_RELEASES",
     "GITHUB_TOKEN",
-    "MACHINE_TYPE_GROUP",
+    "INSTALL_MAX_WORKERS",
+    "PATH_APT_SOURCES",
+    "PATH_APT_STAMPS",
+    "PATH_ASSET_CACHE",
     "PATH_BINARIES",
+    "PATH_CACHE",
+    "PATH_DPKG_STATUS",
+    "PATH_METADATA_CACHE",
+    "PATH_PLATFORM_CACHE",
+    "PATH_STATE",
+    "PATH_STATE_DB",
+    "PATH_VERSION_CACHE",
     "PERMISSIONS_BINARY",
     "PERMISSIONS_CONFIG",
-    "SHELL",
-    "SYSTEM_NAME",
-    "SYSTEM_NAME_GROUP",
+    "STATUS_MAX_WORKERS",
     "TIMEOUT",
 ]
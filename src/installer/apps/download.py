@@ -1,41 +1,77 @@
 from __future__ import annotations
 
+import json
+import shutil
+import tarfile
+from bz2 import BZ2File
 from contextlib import contextmanager
-from re import IGNORECASE, search
-from typing import TYPE_CHECKING, Any
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+from gzip import GzipFile
+from hashlib import file_digest, sha256
+from io import RawIOBase
+from lzma import LZMAFile
+from os import pwrite
+from pathlib import Path
+from shutil import copyfileobj
+from tarfile import BLOCKSIZE, ENCODING, NUL, HeaderError, TarInfo
+from typing import TYPE_CHECKING, BinaryIO, cast, override
+from urllib.parse import urlsplit
 
-from github import Github
-from github.Auth import Token
-from requests import get
+from requests import HTTPError, RequestException, Response
+from requests.exceptions import ChunkedEncodingError, Timeout
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from utilities.concurrent import concurrent_map
 from utilities.core import (
+    OneEmptyError,
     OneNonUniqueError,
+    ReadTextError,
     TemporaryDirectory,
     one,
+    read_text,
     to_logger,
-    yield_bz2,
-    yield_gzip,
-    yield_lzma,
+    write_text,
+    yield_write_path,
 )
 from utilities.inflect import counted_noun
 from utilities.pydantic import extract_secret
 
+from installer.apps.cache import (
+    evict_asset_cache,
+    get_asset_cache_path,
+    get_cached_asset,
+)
 from installer.apps.constants import (
-    C_STD_LIB_GROUP,
     CHUNK_SIZE,
+    DOWNLOAD_CONNECTIONS,
+    DOWNLOAD_MIN_PART_SIZE,
+    DOWNLOAD_RETRIES,
     GITHUB_TOKEN,
-    MACHINE_TYPE_GROUP,
-    SYSTEM_NAME_GROUP,
     TIMEOUT,
 )
+from installer.apps.github import (
+    GitHubAsset,
+    GitHubRelease,
+    get_latest_release,
+    get_release,
+)
+from installer.apps.host import get_platform, get_system_name
+from installer.apps.selection import select_asset
+from installer.apps.session import get_session
+from installer.apps.state import note_resolved_asset
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
-    from pathlib import Path
+    from collections.abc import Buffer, Callable, Iterator
+
+    from utilities.types import MaybeSequenceStr, SecretLike, StrMapping
 
-    from utilities.types import MaybeSequenceStr, SecretLike
+    from installer.apps.registry import App, Decompress
 
 
 _LOGGER = to_logger(__name__)
+_EXTRACTED: ContextVar[Path | None] = ContextVar("_EXTRACTED", default=None)
 
 
 ##
@@ -55,99 +91,759 @@ def yield_asset(
     not_matches: MaybeSequenceStr | None = None,
     endswith: MaybeSequenceStr | None = None,
     not_endswith: MaybeSequenceStr | None = None,
+    cache: bool = True,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
 ) -> Iterator[Path]:
     """Yield a GitHub asset."""
     _LOGGER.info("Yielding asset...")
-    gh = Github(auth=None if token is None else Token(extract_secret(token)))
-    repository = gh.get_repo(f"{owner}/{repo}")
-    if tag is None:
-        release = repository.get_latest_release()
-    else:
-        release = next(r for r in repository.get_releases() if search(tag, r.tag_name))
-    assets = list(release.get_assets())
-    _LOGGER.debug("Got %s: %s", counted_noun(assets, "asset"), [a.name for a in assets])
-    if match_system:
-        assets = [
-            a
-            for a in assets
-            if any(search(c, a.name, flags=IGNORECASE) for c in SYSTEM_NAME_GROUP)
-        ]
-        _LOGGER.debug(
-            "Post system name group %s, got %s: %s",
-            SYSTEM_NAME_GROUP,
-            counted_noun(assets, "asset"),
-            [a.name for a in assets],
+    release, asset = _resolve_asset(
+        owner,
+        repo,
+        tag=tag,
+        token=token,
+        match_system=match_system,
+        match_c_std_lib=match_c_std_lib,
+        match_machine=match_machine,
+        not_matches=not_matches,
+        endswith=endswith,
+        not_endswith=not_endswith,
+    )
+    with _yield_downloaded_asset(
+        owner,
+        repo,
+        release,
+        asset,
+        token=token,
+        cache=cache,
+        connections=connections,
+        min_part_size=min_part_size,
+    ) as path:
+        yield path
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ResolvedAsset:
+    owner: str
+    repo: str
+    release: GitHubRelease
+    asset: GitHubAsset
+    decompress: Decompress | None = None
+
+
+def resolve_asset(
+    app: App, /, *, token: SecretLike | None = GITHUB_TOKEN
+) -> ResolvedAsset | None:
+    """Resolve the GitHub asset an app is installed from, if any."""
+    if (spec := app.get_asset(get_system_name())) is None:
+        return None
+    owner = app.owner if spec.owner is None else spec.owner
+    repo = app.repo if spec.repo is None else spec.repo
+    if (owner is None) or (repo is None):
+        return None
+    release, asset = _resolve_asset(
+        owner,
+        repo,
+        tag=spec.tag,
+        token=token,
+        match_system=spec.match_system,
+        match_c_std_lib=spec.match_c_std_lib,
+        match_machine=spec.match_machine,
+        not_matches=spec.not_matches,
+        endswith=spec.endswith,
+        not_endswith=spec.not_endswith,
+    )
+    return ResolvedAsset(
+        owner=owner, repo=repo, release=release, asset=asset, decompress=spec.decompress
+    )
+
+
+def extract_asset(
+    resolved: ResolvedAsset,
+    root: Path,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
+) -> None:
+    """Download an asset into the cache, and extract it under a root directory."""
+    path = _ensure_cached(
+        resolved.owner,
+        resolved.repo,
+        resolved.release,
+        resolved.asset,
+        token=token,
+        connections=connections,
+        min_part_size=min_part_size,
+    )
+    if resolved.decompress is None:
+        return
+    dest = _get_extracted_path(
+        root, resolved.owner, resolved.repo, resolved.release, resolved.asset
+    )
+    if dest.exists():
+        return
+    part = dest.with_name(f"{dest.name}.part")
+    shutil.rmtree(part, ignore_errors=True)
+    part.mkdir(parents=True)
+    with path.open(mode="rb") as fh:
+        _ = _extract(
+            fh, _DECOMPRESSORS[resolved.decompress], part, name=resolved.asset.name
         )
-    if match_c_std_lib and (C_STD_LIB_GROUP is not None):
-        assets = [
-            a
-            for a in assets
-            if any(search(c, a.name, flags=IGNORECASE) for c in C_STD_LIB_GROUP)
-        ]
-        _LOGGER.debug(
-            "Post 'match_c_std_lib' %s, got %s: %s",
-            C_STD_LIB_GROUP,
-            counted_noun(assets, "asset"),
-            [a.name for a in assets],
+    _ = part.replace(dest)
+
+
+@contextmanager
+def yield_extracted_assets() -> Iterator[Path]:
+    """Yield a root directory, from which extracted assets are then yielded."""
+    with TemporaryDirectory() as temp_dir:
+        token = _EXTRACTED.set(temp_dir)
+        try:
+            yield temp_dir
+        finally:
+            _EXTRACTED.reset(token)
+
+
+@contextmanager
+def yield_app_asset(
+    app: App,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    cache: bool = True,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
+) -> Iterator[Path]:
+    """Yield the GitHub asset an app is installed from."""
+    _LOGGER.info("Yielding %r asset...", app.name)
+    if (resolved := resolve_asset(app, token=token)) is None:
+        msg = f"{app.name!r} is not installed from an asset on {get_system_name()!r}"
+        raise ValueError(msg)
+    args = (resolved.owner, resolved.repo, resolved.release, resolved.asset)
+    if resolved.decompress is None:
+        context = _yield_downloaded_asset(
+            *args,
+            token=token,
+            cache=cache,
+            connections=connections,
+            min_part_size=min_part_size,
         )
-    if match_machine:
-        assets = [
-            a
-            for a in assets
-            if any(search(m, a.name, flags=IGNORECASE) for m in MACHINE_TYPE_GROUP)
-        ]
-        _LOGGER.debug(
-            "Post 'match_machine' %s, got %s: %s",
-            MACHINE_TYPE_GROUP,
-            counted_noun(assets, "asset"),
-            [a.name for a in assets],
+    else:
+        context = _yield_extracted_asset(
+            *args,
+            _DECOMPRESSORS[resolved.decompress],
+            token=token,
+            cache=cache,
+            connections=connections,
+            min_part_size=min_part_size,
         )
-    if not_matches is not None:
-        assets = [
-            a for a in assets if all(search(p, a.name) is None for p in not_matches)
-        ]
-        _LOGGER.debug(
-            "Post 'not_matches', got %s: %s",
-            counted_noun(assets, "asset"),
-            [a.name for a in assets],
+    with context as path:
+        yield path
+
+
+##
+
+
+@contextmanager
+def _yield_downloaded_asset(
+    owner: str,
+    repo: str,
+    release: GitHubRelease,
+    asset: GitHubAsset,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    cache: bool = True,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
+) -> Iterator[Path]:
+    if cache:
+        path = _ensure_cached(
+            owner,
+            repo,
+            release,
+            asset,
+            token=token,
+            connections=connections,
+            min_part_size=min_part_size,
         )
-    if endswith is not None:
-        assets = [a for a in assets if any(a.name.endswith(e) for e in endswith)]
-        _LOGGER.debug(
-            "Post 'endswith', got %s: %s",
-            counted_noun(assets, "asset"),
-            [a.name for a in assets],
+        _LOGGER.info("Yielding %r...", str(path))
+        yield path
+        return
+    with TemporaryDirectory() as temp_dir:
+        dest = temp_dir / asset.name
+        ranged = _probe_ranges(
+            asset, token=token, connections=connections, min_part_size=min_part_size
         )
-    if not_endswith is not None:
-        assets = [
-            a for a in assets if all(not a.name.endswith(e) for e in not_endswith)
-        ]
-        _LOGGER.debug(
-            "Post 'not_endswith', got %s: %s",
-            counted_noun(assets, "asset"),
-            [a.name for a in assets],
+        _download_asset(asset, dest, token=token, ranged=ranged)
+        _LOGGER.info("Yielding %r...", str(dest))
+        yield dest
+
+
+def _ensure_cached(
+    owner: str,
+    repo: str,
+    release: GitHubRelease,
+    asset: GitHubAsset,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
+) -> Path:
+    path = get_asset_cache_path(
+        owner, repo, release.tag_name, asset.name, size=asset.size, digest=asset.digest
+    )
+    if get_cached_asset(path, size=asset.size) is None:
+        ranged = _probe_ranges(
+            asset,
+            dest=path,
+            token=token,
+            connections=connections,
+            min_part_size=min_part_size,
         )
+        _download_asset(asset, path, token=token, ranged=ranged)
+        _ = evict_asset_cache(keep=path)
+    else:
+        _LOGGER.info("Using cached %r...", str(path))
+    return path
+
+
+def _resolve_asset(
+    owner: str,
+    repo: str,
+    /,
+    *,
+    tag: str | None = None,
+    token: SecretLike | None = GITHUB_TOKEN,
+    match_system: bool = False,
+    match_c_std_lib: bool = False,
+    match_machine: bool = False,
+    not_matches: MaybeSequenceStr | None = None,
+    endswith: MaybeSequenceStr | None = None,
+    not_endswith: MaybeSequenceStr | None = None,
+) -> tuple[GitHubRelease, GitHubAsset]:
+    if tag is None:
+        release = get_latest_release(owner, repo, token=token)
+    else:
+        release = get_release(owner, repo, tag, token=token)
+    _LOGGER.debug("Got %s", counted_noun(release.assets, "asset"))
+    asset = select_asset(
+        release.assets,
+        system=get_platform().system_group if match_system else None,
+        c_std_lib=get_platform().c_std_lib_group if match_c_std_lib else None,
+        machine=get_platform().machine_group if match_machine else None,
+        not_matches=not_matches,
+        endswith=endswith,
+        not_endswith=not_endswith,
+    )
+    note_resolved_asset(owner, repo, release, asset)
+    return release, asset
+
+
+def _download_asset(
+    asset: GitHubAsset,
+    dest: Path,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    ranged: _RangedDownload | None = None,
+    retries: int = DOWNLOAD_RETRIES,
+) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    offset, etag = _read_checkpoint(asset, dest)
+    if (offset == 0) and (ranged is not None):
+        with yield_write_path(dest, overwrite=True) as temp:
+            _download_ranges(asset, ranged, temp, retries=retries)
+        return
+    if offset >= 1:
+        _LOGGER.info("Resuming %r at byte %d...", asset.name, offset)
+    part, checkpoint = _get_part_paths(dest)
+    with _yield_asset_reader(
+        asset, token=token, offset=offset, etag=etag, retries=retries
+    ) as reader:
+        _write_checkpoint(checkpoint, asset, etag=reader.etag)
+        with part.open(mode="ab" if reader.offset >= 1 else "wb") as fh:
+            copyfileobj(reader, fh, length=CHUNK_SIZE)
+    with part.open(mode="rb") as fh:
+        actual = file_digest(fh, "sha256").hexdigest()
+    _commit_part(asset, dest, actual)
+
+
+def _get_auth_headers(*, token: SecretLike | None = GITHUB_TOKEN) -> dict[str, str]:
+    return {} if token is None else {"Authorization": f"Bearer {extract_secret(token)}"}
+
+
+def _check_digest(asset: GitHubAsset, actual: str, /) -> None:
+    digest = asset.digest
+    if (digest is None) or not digest.startswith("sha256:"):
+        return
+    expected = digest.removeprefix("sha256:")
+    if actual != expected:
+        msg = f"Invalid digest for {asset.name!r}; expected {expected!r} but got {actual!r}"
+        raise ValueError(msg)
+
+
+##
+
+
+def _get_part_paths(dest: Path, /) -> tuple[Path, Path]:
+    return dest.with_name(f"{dest.name}.part"), dest.with_name(
+        f"{dest.name}.checkpoint"
+    )
+
+
+def _read_checkpoint(asset: GitHubAsset, dest: Path, /) -> tuple[int, str | None]:
+    part, checkpoint = _get_part_paths(dest)
     try:
-        asset = one(assets)
-    except OneNonUniqueError as error:
-        raise OneNonUniqueError(
-            iterables=([a.name for a in assets],),
-            first=error.first.name,
-            second=error.second.name,
-        ) from None
-    headers: dict[str, Any] = {}
-    if token is not None:
-        headers["Authorization"] = f"Bearer {extract_secret(token)}"
-    with TemporaryDirectory() as temp_dir:
-        with get(
-            asset.browser_download_url, headers=headers, timeout=TIMEOUT, stream=True
+        data = json.loads(read_text(checkpoint))
+        size = part.stat().st_size
+    except (ReadTextError, json.JSONDecodeError, FileNotFoundError):
+        return 0, None
+    if (
+        (data.get("url") != asset.browser_download_url)
+        or (data.get("size") != asset.size)
+        or not (0 < size < asset.size)
+    ):
+        return 0, None
+    return size, data.get("etag")
+
+
+def _write_checkpoint(path: Path, asset: GitHubAsset, /, *, etag: str | None) -> None:
+    data = {"url": asset.browser_download_url, "size": asset.size, "etag": etag}
+    write_text(path, json.dumps(data), overwrite=True)
+
+
+def _commit_part(asset: GitHubAsset, dest: Path, actual: str, /) -> None:
+    part, checkpoint = _get_part_paths(dest)
+    try:
+        _check_digest(asset, actual)
+    except ValueError:
+        part.unlink(missing_ok=True)
+        checkpoint.unlink(missing_ok=True)
+        raise
+    _ = part.replace(dest)
+    checkpoint.unlink(missing_ok=True)
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class _RangedDownload:
+    url: str
+    headers: dict[str, str]
+    num_parts: int
+
+
+def _probe_ranges(
+    asset: GitHubAsset,
+    /,
+    *,
+    dest: Path | None = None,
+    token: SecretLike | None = GITHUB_TOKEN,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
+) -> _RangedDownload | None:
+    num_parts = min(connections, asset.size // max(min_part_size, 1))
+    if num_parts <= 1:
+        return None
+    if (dest is not None) and (_read_checkpoint(asset, dest)[0] >= 1):
+        return None
+    url = asset.browser_download_url
+    headers = _get_auth_headers(token=token)
+    try:
+        with get_session().head(
+            url, headers=headers, timeout=TIMEOUT, allow_redirects=True
         ) as resp:
             resp.raise_for_status()
-            dest = temp_dir / asset.name
+    except RequestException as error:
+        _LOGGER.debug("Failed to probe %r for ranges: %s", url, error)
+        return None
+    if (resp.headers.get("Accept-Ranges") != "bytes") or (
+        resp.headers.get("Content-Length") != str(asset.size)
+    ):
+        _LOGGER.debug("%r does not support ranges; using a single stream", url)
+        return None
+    if urlsplit(resp.url).netloc != urlsplit(url).netloc:
+        headers = {}
+    return _RangedDownload(url=resp.url, headers=headers, num_parts=num_parts)
+
+
+def _download_ranges(
+    asset: GitHubAsset,
+    ranged: _RangedDownload,
+    dest: Path,
+    /,
+    *,
+    retries: int = DOWNLOAD_RETRIES,
+) -> None:
+    _LOGGER.info(
+        "Downloading %r in %s...", asset.name, counted_noun(ranged.num_parts, "part")
+    )
+    bounds = [
+        (i * asset.size // ranged.num_parts, (i + 1) * asset.size // ranged.num_parts)
+        for i in range(ranged.num_parts)
+    ]
+    with dest.open(mode="wb") as fh:
+        _ = fh.truncate(asset.size)
+        func = partial(
+            _download_range,
+            ranged.url,
+            fh.fileno(),
+            headers=ranged.headers,
+            retries=retries,
+        )
+        _ = concurrent_map(
+            func,
+            *zip(*bounds, strict=True),
+            parallelism="threads",
+            max_workers=len(bounds),
+        )
+    with dest.open(mode="rb") as fh:
+        _check_digest(asset, file_digest(fh, "sha256").hexdigest())
+
+
+def _download_range(
+    url: str,
+    fd: int,
+    start: int,
+    stop: int,
+    /,
+    *,
+    headers: StrMapping,
+    retries: int = DOWNLOAD_RETRIES,
+) -> None:
+    offset = start
+    attempt = 0
+    while True:
+        headers_use = {**headers, "Range": f"bytes={offset}-{stop - 1}"}
+        try:
+            with get_session().get(
+                url, headers=headers_use, timeout=TIMEOUT, stream=True
+            ) as resp:
+                resp.raise_for_status()
+                if resp.status_code != 206:
+                    msg = f"Expected a partial response from {url!r}; got {resp.status_code}"
+                    raise ValueError(msg)
+                for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                    view = memoryview(chunk)
+                    while len(view) >= 1:
+                        n = pwrite(fd, view, offset)
+                        view, offset = view[n:], offset + n
+        except _RESUMABLE_ERRORS as error:
+            attempt += 1
+            if attempt > retries:
+                raise
+            _LOGGER.warning(
+                "Range %d-%d of %r interrupted at byte %d (%s); resuming...",
+                start,
+                stop - 1,
+                url,
+                offset,
+                error,
+            )
+        else:
+            break
+    if offset != stop:
+        msg = f"Incomplete range from {url!r}; expected {stop - start} bytes but got {offset - start}"
+        raise ValueError(msg)
+
+
+##
+
+
+_RESUMABLE_ERRORS = (
+    ChunkedEncodingError,
+    ProtocolError,
+    ReadTimeoutError,
+    RequestsConnectionError,
+    Timeout,
+)
+
+
+@contextmanager
+def _yield_asset_reader(
+    asset: GitHubAsset,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    offset: int = 0,
+    etag: str | None = None,
+    sink: BinaryIO | None = None,
+    retries: int = DOWNLOAD_RETRIES,
+) -> Iterator[_AssetReader]:
+    reader = _AssetReader(
+        asset, token=token, offset=offset, etag=etag, sink=sink, retries=retries
+    )
+    try:
+        yield reader
+    finally:
+        reader.close()
+
+
+class _AssetReader(RawIOBase):
+    def __init__(
+        self,
+        asset: GitHubAsset,
+        /,
+        *,
+        token: SecretLike | None = GITHUB_TOKEN,
+        offset: int = 0,
+        etag: str | None = None,
+        sink: BinaryIO | None = None,
+        retries: int = DOWNLOAD_RETRIES,
+    ) -> None:
+        super().__init__()
+        self._asset = asset
+        self._headers = _get_auth_headers(token=token)
+        self._sink = sink
+        self._retries = retries
+        self._hasher = sha256()
+        self.offset = offset
+        self.etag = etag
+        self._resp: Response | None = self._connect(restart=True)
+
+    @override
+    def close(self) -> None:
+        if self._resp is not None:
+            self._resp.close()
+            self._resp = None
+        super().close()
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Buffer, /) -> int:
+        view = memoryview(buffer).cast("B")
+        attempt = 0
+        while True:
+            try:
+                if self._resp is None:
+                    self._resp = self._connect()
+                data = self._resp.raw.read(len(view))
+            except _RESUMABLE_ERRORS as error:
+                attempt += 1
+                if attempt > self._retries:
+                    raise
+                _LOGGER.warning(
+                    "Download of %r interrupted at byte %d (%s); resuming...",
+                    self._asset.name,
+                    self.offset,
+                    error,
+                )
+                if self._resp is not None:
+                    self._resp.close()
+                    self._resp = None
+            else:
+                break
+        n = len(data)
+        view[:n] = data
+        self._hasher.update(data)
+        if self._sink is not None:
+            _ = self._sink.write(data)
+        self.offset += n
+        return n
+
+    def hexdigest(self) -> str:
+        while len(self.read(CHUNK_SIZE)) >= 1:
+            pass
+        return self._hasher.hexdigest()
+
+    def _connect(self, *, restart: bool = False) -> Response:
+        headers = self._headers.copy()
+        if self.offset >= 1:
+            headers["Range"] = f"bytes={self.offset}-"
+            if self.etag is not None:
+                headers["If-Range"] = self.etag
+        resp = get_session().get(
+            self._asset.browser_download_url,
+            headers=headers,
+            timeout=TIMEOUT,
+            stream=True,
+        )
+        try:
+            resp.raise_for_status()
+        except HTTPError:
+            resp.close()
+            raise
+        if (self.offset >= 1) and (resp.status_code != 206):
+            if not restart:
+                resp.close()
+                msg = f"Unable to resume {self._asset.name!r} at byte {self.offset}; got {resp.status_code}"
+                raise ValueError(msg)
+            _LOGGER.info("Unable to resume %r; restarting...", self._asset.name)
+            self.offset = 0
+        self.etag = resp.headers.get("ETag", self.etag)
+        resp.raw.decode_content = True
+        return resp
+
+
+##
+
+
+@contextmanager
+def _yield_extracted_asset(
+    owner: str,
+    repo: str,
+    release: GitHubRelease,
+    asset: GitHubAsset,
+    decompress: Callable[[BinaryIO], BinaryIO],
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    cache: bool = True,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
+) -> Iterator[Path]:
+    if (root := _EXTRACTED.get()) is not None:
+        extracted = _get_extracted_path(root, owner, repo, release, asset)
+        if extracted.is_dir():
+            _LOGGER.info("Using extracted %r...", str(extracted))
+            yield _get_extracted_result(extracted)
+            return
+    path = (
+        get_asset_cache_path(
+            owner,
+            repo,
+            release.tag_name,
+            asset.name,
+            size=asset.size,
+            digest=asset.digest,
+        )
+        if cache
+        else None
+    )
+    with TemporaryDirectory() as temp_dir:
+        if (path is not None) and (get_cached_asset(path, size=asset.size) is not None):
+            _LOGGER.info("Using cached %r...", str(path))
+            with path.open(mode="rb") as fh:
+                result = _extract(fh, decompress, temp_dir, name=asset.name)
+        elif (
+            (
+                ranged := _probe_ranges(
+                    asset,
+                    dest=path,
+                    token=token,
+                    connections=connections,
+                    min_part_size=min_part_size,
+                )
+            )
+            is not None
+        ) or ((path is not None) and (_read_checkpoint(asset, path)[0] >= 1)):
+            with TemporaryDirectory() as download_dir:
+                dest = download_dir / asset.name if path is None else path
+                _download_asset(asset, dest, token=token, ranged=ranged)
+                with dest.open(mode="rb") as fh:
+                    result = _extract(fh, decompress, temp_dir, name=asset.name)
+            if path is not None:
+                _ = evict_asset_cache(keep=path)
+        elif path is None:
+            with _yield_asset_reader(asset, token=token) as reader:
+                result = _extract(
+                    cast("BinaryIO", reader), decompress, temp_dir, name=asset.name
+                )
+                _check_digest(asset, reader.hexdigest())
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            part, checkpoint = _get_part_paths(path)
+            with (
+                part.open(mode="wb") as sink,
+                _yield_asset_reader(asset, token=token, sink=sink) as reader,
+            ):
+                _write_checkpoint(checkpoint, asset, etag=reader.etag)
+                result = _extract(
+                    cast("BinaryIO", reader), decompress, temp_dir, name=asset.name
+                )
+                actual = reader.hexdigest()
+            _commit_part(asset, path, actual)
+            _ = evict_asset_cache(keep=path)
+        _LOGGER.info("Yielding %r...", str(result))
+        yield result
+
+
+def _extract(
+    fileobj: BinaryIO,
+    decompress: Callable[[BinaryIO], BinaryIO],
+    temp_dir: Path,
+    /,
+    *,
+    name: str,
+) -> Path:
+    with decompress(fileobj) as buffer:
+        header = buffer.read(BLOCKSIZE)
+        if (len(header) == 0) or (header.count(NUL) == BLOCKSIZE):
+            return temp_dir
+        try:
+            _ = TarInfo.frombuf(header, ENCODING, "surrogateescape")
+        except HeaderError:
+            dest = temp_dir / Path(name).stem
             with dest.open(mode="wb") as fh:
-                fh.writelines(resp.iter_content(chunk_size=CHUNK_SIZE))
-        _LOGGER.info("Yielding %r...", str(dest))
-        yield dest
+                _ = fh.write(header)
+                copyfileobj(buffer, fh, length=CHUNK_SIZE)
+            return dest
+        with tarfile.open(
+            fileobj=cast("BinaryIO", _PrefixedReader(header, buffer)), mode="r|"
+        ) as tf:
+            tf.extractall(path=temp_dir, filter="data")
+    return _get_extracted_result(temp_dir)
+
+
+def _get_extracted_path(
+    root: Path, owner: str, repo: str, release: GitHubRelease, asset: GitHubAsset, /
+) -> Path:
+    return Path(root, owner, repo, release.tag_name, asset.name)
+
+
+def _get_extracted_result(path: Path, /) -> Path:
+    try:
+        return one(path.iterdir())
+    except (OneEmptyError, OneNonUniqueError):
+        return path
+
+
+class _PrefixedReader(RawIOBase):
+    def __init__(self, prefix: bytes, stream: BinaryIO, /) -> None:
+        super().__init__()
+        self._prefix = prefix
+        self._stream = stream
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Buffer, /) -> int:
+        view = memoryview(buffer).cast("B")
+        if len(self._prefix) >= 1:
+            n = min(len(view), len(self._prefix))
+            view[:n], self._prefix = self._prefix[:n], self._prefix[n:]
+            return n
+        data = self._stream.read(len(view))
+        view[: len(data)] = data
+        return len(data)
+
+
+def _decompress_bz2(fileobj: BinaryIO, /) -> BinaryIO:
+    return cast("BinaryIO", BZ2File(fileobj, mode="rb"))
+
+
+def _decompress_gzip(fileobj: BinaryIO, /) -> BinaryIO:
+    return cast("BinaryIO", GzipFile(fileobj=fileobj, mode="rb"))
+
+
+def _decompress_lzma(fileobj: BinaryIO, /) -> BinaryIO:
+    return cast("BinaryIO", LZMAFile(fileobj, mode="rb"))
+
+
+_DECOMPRESSORS: dict[Decompress, Callable[[BinaryIO], BinaryIO]] = {
+    "bz2": _decompress_bz2,
+    "gzip": _decompress_gzip,
+    "lzma": _decompress_lzma,
+}
 
 
 ##
@@ -166,23 +862,34 @@ def yield_bz2_asset(
     match_machine: bool = False,
     not_matches: MaybeSequenceStr | None = None,
     not_endswith: MaybeSequenceStr | None = None,
+    cache: bool = True,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
 ) -> Iterator[Path]:
     _LOGGER.info("Yielding BZ2 asset...")
-    with (
-        yield_asset(
-            owner,
-            repo,
-            tag=tag,
-            token=token,
-            match_system=match_system,
-            match_c_std_lib=match_c_std_lib,
-            match_machine=match_machine,
-            not_matches=not_matches,
-            not_endswith=not_endswith,
-        ) as temp1,
-        yield_bz2(temp1) as temp2,
-    ):
-        yield temp2
+    release, asset = _resolve_asset(
+        owner,
+        repo,
+        tag=tag,
+        token=token,
+        match_system=match_system,
+        match_c_std_lib=match_c_std_lib,
+        match_machine=match_machine,
+        not_matches=not_matches,
+        not_endswith=not_endswith,
+    )
+    with _yield_extracted_asset(
+        owner,
+        repo,
+        release,
+        asset,
+        _decompress_bz2,
+        token=token,
+        cache=cache,
+        connections=connections,
+        min_part_size=min_part_size,
+    ) as temp:
+        yield temp
 
 
 ##
@@ -202,24 +909,35 @@ def yield_gzip_asset(
     not_matches: MaybeSequenceStr | None = None,
     endswith: MaybeSequenceStr | None = None,
     not_endswith: MaybeSequenceStr | None = None,
+    cache: bool = True,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
 ) -> Iterator[Path]:
     _LOGGER.info("Yielding Gzip asset...")
-    with (
-        yield_asset(
-            owner,
-            repo,
-            tag=tag,
-            token=token,
-            match_system=match_system,
-            match_c_std_lib=match_c_std_lib,
-            match_machine=match_machine,
-            not_matches=not_matches,
-            endswith=endswith,
-            not_endswith=not_endswith,
-        ) as temp1,
-        yield_gzip(temp1) as temp2,
-    ):
-        yield temp2
+    release, asset = _resolve_asset(
+        owner,
+        repo,
+        tag=tag,
+        token=token,
+        match_system=match_system,
+        match_c_std_lib=match_c_std_lib,
+        match_machine=match_machine,
+        not_matches=not_matches,
+        endswith=endswith,
+        not_endswith=not_endswith,
+    )
+    with _yield_extracted_asset(
+        owner,
+        repo,
+        release,
+        asset,
+        _decompress_gzip,
+        token=token,
+        cache=cache,
+        connections=connections,
+        min_part_size=min_part_size,
+    ) as temp:
+        yield temp
 
 
 ##
@@ -239,24 +957,45 @@ def yield_lzma_asset(
     not_matches: MaybeSequenceStr | None = None,
     endswith: MaybeSequenceStr | None = None,
     not_endswith: MaybeSequenceStr | None = None,
+    cache: bool = True,
+    connections: int = DOWNLOAD_CONNECTIONS,
+    min_part_size: int = DOWNLOAD_MIN_PART_SIZE,
 ) -> Iterator[Path]:
     _LOGGER.info("Yielding LZMA asset...")
-    with (
-        yield_asset(
-            owner,
-            repo,
-            tag=tag,
-            token=token,
-            match_system=match_system,
-            match_c_std_lib=match_c_std_lib,
-            match_machine=match_machine,
-            not_matches=not_matches,
-            endswith=endswith,
-            not_endswith=not_endswith,
-        ) as temp1,
-        yield_lzma(temp1) as temp2,
-    ):
-        yield temp2
+    release, asset = _resolve_asset(
+        owner,
+        repo,
+        tag=tag,
+        token=token,
+        match_system=match_system,
+        match_c_std_lib=match_c_std_lib,
+        match_machine=match_machine,
+        not_matches=not_matches,
+        endswith=endswith,
+        not_endswith=not_endswith,
+    )
+    with _yield_extracted_asset(
+        owner,
+        repo,
+        release,
+        asset,
+        _decompress_lzma,
+        token=token,
+        cache=cache,
+        connections=connections,
+        min_part_size=min_part_size,
+    ) as temp:
+        yield temp
 
 
-__all__ = ["yield_asset", "yield_bz2_asset", "yield_gzip_asset", "yield_lzma_asset"]
+__all__ = [
+    "ResolvedAsset",
+    "extract_asset",
+    "resolve_asset",
+    "yield_app_asset",
+    "yield_asset",
+    "yield_bz2_asset",
+    "yield_extracted_assets",
+    "yield_gzip_asset",
+    "yield_lzma_asset",
+]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from installer.apps.constants import PATH_DPKG_STATUS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from utilities.types import PathLike
+
+
+_CACHE: dict[Path, tuple[tuple[int, int], dict[str, DpkgPackage]]] = {}
+_LOCK = Lock()
+
+
+##
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class DpkgPackage:
+    name: str
+    status: str
+    version: str | None = None
+    architecture: str | None = None
+
+    @property
+    def installed(self) -> bool:
+        return self.status.split()[-1:] == ["installed"]
+
+
+def get_dpkg_index(*, path: PathLike = PATH_DPKG_STATUS) -> dict[str, DpkgPackage]:
+    """Get the 'dpkg' status index, re-reading it only when it has changed."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _LOCK:
+        try:
+            cached_key, index = _CACHE[path]
+        except KeyError:
+            pass
+        else:
+            if cached_key == key:
+                return index
+        index = parse_dpkg_status(path.read_text(errors="replace"))
+        _CACHE[path] = (key, index)
+        return index
+
+
+def get_installed_packages(
+    packages: Iterable[str], /, *, path: PathLike = PATH_DPKG_STATUS
+) -> list[str]:
+    """Get the packages which are installed."""
+    index = get_dpkg_index(path=path)
+    return [p for p in packages if (p in index) and index[p].installed]
+
+
+def get_missing_packages(
+    packages: Iterable[str], /, *, path: PathLike = PATH_DPKG_STATUS
+) -> list[str]:
+    """Get the packages which are not installed."""
+    index = get_dpkg_index(path=path)
+    return [p for p in packages if (p not in index) or not index[p].installed]
+
+
+def parse_dpkg_status(text: str, /) -> dict[str, DpkgPackage]:
+    """Parse the contents of a 'dpkg' status file."""
+    index: dict[str, DpkgPackage] = {}
+    for paragraph in text.split("\n\n"):
+        fields: dict[str, str] = {}
+        for line in paragraph.splitlines():
+            if line.startswith((" ", "\t")) or (":" not in line):
+                continue
+            key, value = line.split(":", 1)
+            fields[key] = value.strip()
+        try:
+            name, status = fields["Package"], fields["Status"]
+        except KeyError:
+            continue
+        package = DpkgPackage(
+            name=name,
+            status=status,
+            version=fields.get("Version"),
+            architecture=fields.get("Architecture"),
+        )
+        if (name not in index) or (package.installed and not index[name].installed):
+            index[name] = package
+    return index
+
+
+__all__ = [
+    "DpkgPackage",
+    "get_dpkg_index",
+    "get_installed_packages",
+    "get_missing_packages",
+    "parse_dpkg_status",
+]
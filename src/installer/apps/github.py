@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import contextlib
+import json
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from re import search
+from typing import TYPE_CHECKING, Any
+
+from requests import HTTPError
+from utilities.core import ReadTextError, read_text, to_logger, write_text
+from utilities.inflect import counted_noun
+from utilities.pydantic import extract_secret
+
+from installer.apps.constants import (
+    GITHUB_API_URL,
+    GITHUB_GRAPHQL_CHUNK_SIZE,
+    GITHUB_GRAPHQL_NUM_RELEASES,
+    GITHUB_TOKEN,
+    PATH_METADATA_CACHE,
+    TIMEOUT,
+)
+from installer.apps.session import get_session
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from utilities.types import PathLike, SecretLike, StrMapping
+
+
+_LOGGER = to_logger(__name__)
+_RELEASES: dict[tuple[str, str, str | None], GitHubRelease] = {}
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class GitHubAsset:
+    name: str
+    size: int
+    browser_download_url: str
+    digest: str | None = None
+
+    @classmethod
+    def from_json(cls, data: StrMapping, /) -> GitHubAsset:
+        return cls(
+            name=data["name"],
+            size=data["size"],
+            browser_download_url=data["browser_download_url"],
+            digest=data.get("digest"),
+        )
+
+
+@dataclass(kw_only=True, slots=True)
+class GitHubRelease:
+    tag_name: str
+    assets: list[GitHubAsset] = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data: StrMapping, /) -> GitHubRelease:
+        return cls(
+            tag_name=data["tag_name"],
+            assets=[GitHubAsset.from_json(a) for a in data["assets"]],
+        )
+
+
+##
+
+
+def get_github_json(
+    path: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    params: StrMapping | None = None,
+    cache: bool = True,
+    root: PathLike = PATH_METADATA_CACHE,
+) -> Any:
+    """Get a GitHub REST API resource, revalidating any cached copy."""
+    body, _ = _get_json(
+        f"{GITHUB_API_URL}/{path}", token=token, params=params, cache=cache, root=root
+    )
+    return body
+
+
+def iter_github_json(
+    path: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    params: StrMapping | None = None,
+    cache: bool = True,
+    root: PathLike = PATH_METADATA_CACHE,
+) -> Iterator[Any]:
+    """Iterate over the items of a paginated GitHub REST API collection."""
+    url: str | None = f"{GITHUB_API_URL}/{path}"
+    params_use: StrMapping | None = {
+        "per_page": 100,
+        **({} if params is None else params),
+    }
+    while url is not None:
+        body, url = _get_json(
+            url, token=token, params=params_use, cache=cache, root=root
+        )
+        params_use = None
+        yield from body
+
+
+def _get_json(
+    url: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    params: StrMapping | None = None,
+    cache: bool = True,
+    root: PathLike = PATH_METADATA_CACHE,
+) -> tuple[Any, str | None]:
+    headers: dict[str, str] = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if token is not None:
+        headers["Authorization"] = f"Bearer {extract_secret(token)}"
+    entry_path = _get_entry_path(url, params=params, token=token, root=root)
+    entry = _read_entry(entry_path) if cache else None
+    if entry is not None:
+        if (etag := entry.get("etag")) is not None:
+            headers["If-None-Match"] = etag
+        if (last_modified := entry.get("last_modified")) is not None:
+            headers["If-Modified-Since"] = last_modified
+    with get_session().get(
+        url, headers=headers, params=params, timeout=TIMEOUT
+    ) as resp:
+        _LOGGER.debug(
+            "GET %r -> %d (rate limit remaining: %s)",
+            url,
+            resp.status_code,
+            resp.headers.get("X-RateLimit-Remaining"),
+        )
+        if (entry is not None) and (resp.status_code == 304):
+            return entry["body"], entry.get("next")
+        resp.raise_for_status()
+        body = resp.json()
+        next_ = resp.links.get("next", {}).get("url")
+        if cache and (("ETag" in resp.headers) or ("Last-Modified" in resp.headers)):
+            entry = {
+                "url": url,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "next": next_,
+                "body": body,
+            }
+            write_text(entry_path, json.dumps(entry), overwrite=True)
+    return body, next_
+
+
+def _get_entry_path(
+    url: str,
+    /,
+    *,
+    params: StrMapping | None = None,
+    token: SecretLike | None = None,
+    root: PathLike = PATH_METADATA_CACHE,
+) -> Path:
+    hasher = sha256(url.encode())
+    if params is not None:
+        hasher.update(json.dumps(params, sort_keys=True).encode())
+    if token is not None:
+        hasher.update(sha256(extract_secret(token).encode()).digest())
+    return Path(root, f"{hasher.hexdigest()}.json")
+
+
+def _read_entry(path: Path, /) -> dict[str, Any] | None:
+    try:
+        text = read_text(path)
+    except ReadTextError:
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        _LOGGER.warning("Ignoring corrupt metadata cache entry %r", str(path))
+        return None
+
+
+##
+
+
+def get_latest_release(
+    owner: str,
+    repo: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    root: PathLike = PATH_METADATA_CACHE,
+) -> GitHubRelease:
+    """Get the latest release of a GitHub repository."""
+    if (release := _RELEASES.get((owner, repo, None))) is not None:
+        return release
+    data = get_github_json(
+        f"repos/{owner}/{repo}/releases/latest", token=token, root=root
+    )
+    return GitHubRelease.from_json(data)
+
+
+def get_release(
+    owner: str,
+    repo: str,
+    tag: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    root: PathLike = PATH_METADATA_CACHE,
+) -> GitHubRelease:
+    """Get the most recent release of a GitHub repository matching a tag pattern."""
+    if (release := _RELEASES.get((owner, repo, tag))) is not None:
+        return release
+    for rebuild in [False, True]:
+        index, fresh = _refresh_tag_index(
+            owner, repo, token=token, root=root, rebuild=rebuild
+        )
+        try:
+            id_ = next(i for t, i in index.items() if search(tag, t))
+        except StopIteration:
+            break
+        if (data := fresh.get(id_)) is not None:
+            return GitHubRelease.from_json(data)
+        try:
+            data = get_github_json(
+                f"repos/{owner}/{repo}/releases/{id_}", token=token, root=root
+            )
+        except HTTPError as error:
+            if not _is_not_found(error):
+                raise
+            _LOGGER.info("Tag index of %s/%s is stale; rebuilding...", owner, repo)
+        else:
+            return GitHubRelease.from_json(data)
+    msg = f"No release of {owner}/{repo} matches {tag!r}"
+    raise ValueError(msg)
+
+
+def _is_not_found(error: HTTPError, /) -> bool:
+    return (error.response is not None) and (error.response.status_code == 404)
+
+
+def _refresh_tag_index(
+    owner: str,
+    repo: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    root: PathLike = PATH_METADATA_CACHE,
+    rebuild: bool = False,
+) -> tuple[dict[str, int], dict[int, Any]]:
+    path = Path(root, "tags", owner, f"{repo}.json")
+    index: dict[str, int] = {}
+    if not rebuild:
+        with contextlib.suppress(ReadTextError, json.JSONDecodeError):
+            index = json.loads(read_text(path))
+    known = set(index.values())
+    fresh: dict[int, Any] = {}
+    for data in iter_github_json(
+        f"repos/{owner}/{repo}/releases", token=token, root=root
+    ):
+        if data["id"] in known:
+            break
+        fresh[data["id"]] = data
+    if len(fresh) >= 1:
+        _LOGGER.debug(
+            "Indexed %s of %s/%s", counted_noun(fresh, "new release"), owner, repo
+        )
+        new = {d["tag_name"]: i for i, d in fresh.items()}
+        index = new | {t: i for t, i in index.items() if t not in new}
+        write_text(path, json.dumps(index), overwrite=True)
+    return index, fresh
+
+
+##
+
+
+_GRAPHQL_RELEASE = (
+    "tagName releaseAssets(first: 100) { nodes { name size downloadUrl } }"
+)
+
+
+def resolve_releases(
+    specs: Iterable[tuple[str, str, str | None]],
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    chunk_size: int = GITHUB_GRAPHQL_CHUNK_SIZE,
+    num_releases: int = GITHUB_GRAPHQL_NUM_RELEASES,
+) -> dict[tuple[str, str, str | None], GitHubRelease]:
+    """Resolve and memoize the releases of many GitHub repositories via GraphQL."""
+    if token is None:
+        _LOGGER.debug("GraphQL requires a token; resolving releases one by one")
+        return {}
+    specs = list(dict.fromkeys(specs))
+    resolved: dict[tuple[str, str, str | None], GitHubRelease] = {}
+    for start in range(0, len(specs), chunk_size):
+        chunk = specs[start : start + chunk_size]
+        data = _post_graphql(
+            *_build_releases_query(chunk, num_releases=num_releases), token=token
+        )
+        for i, spec in enumerate(chunk):
+            if (release := _parse_releases_result(spec, data.get(f"r{i}"))) is None:
+                _LOGGER.debug("Unable to resolve %s/%s via GraphQL", *spec[:2])
+            else:
+                resolved[spec] = _RELEASES[spec] = release
+    _LOGGER.info("Resolved %s via GraphQL", counted_noun(resolved, "release"))
+    return resolved
+
+
+def _build_releases_query(
+    specs: Sequence[tuple[str, str, str | None]],
+    /,
+    *,
+    num_releases: int = GITHUB_GRAPHQL_NUM_RELEASES,
+) -> tuple[str, dict[str, str]]:
+    params: list[str] = []
+    fields: list[str] = []
+    variables: dict[str, str] = {}
+    for i, (owner, repo, tag) in enumerate(specs):
+        params.extend([f"$o{i}: String!", f"$n{i}: String!"])
+        variables |= {f"o{i}": owner, f"n{i}": repo}
+        if tag is None:
+            selection = f"latestRelease {{ {_GRAPHQL_RELEASE} }}"
+        else:
+            selection = f"releases(first: {num_releases}, orderBy: {{field: CREATED_AT, direction: DESC}}) {{ nodes {{ {_GRAPHQL_RELEASE} }} }}"
+        fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {selection} }}")
+    return f"query({', '.join(params)}) {{ {' '.join(fields)} }}", variables
+
+
+def _parse_releases_result(
+    spec: tuple[str, str, str | None], data: StrMapping | None, /
+) -> GitHubRelease | None:
+    if data is None:
+        return None
+    _, _, tag = spec
+    if tag is None:
+        nodes = [] if data["latestRelease"] is None else [data["latestRelease"]]
+    else:
+        nodes = [n for n in data["releases"]["nodes"] if search(tag, n["tagName"])]
+    try:
+        node = nodes[0]
+    except IndexError:
+        return None
+    return GitHubRelease(
+        tag_name=node["tagName"],
+        assets=[
+            GitHubAsset(
+                name=a["name"], size=a["size"], browser_download_url=a["downloadUrl"]
+            )
+            for a in node["releaseAssets"]["nodes"]
+        ],
+    )
+
+
+def _post_graphql(
+    query: str, variables: StrMapping, /, *, token: SecretLike | None = GITHUB_TOKEN
+) -> dict[str, Any]:
+    headers: dict[str, str] = {}
+    if token is not None:
+        headers["Authorization"] = f"Bearer {extract_secret(token)}"
+    with get_session().post(
+        f"{GITHUB_API_URL}/graphql",
+        headers=headers,
+        json={"query": query, "variables": variables},
+        timeout=TIMEOUT,
+    ) as resp:
+        resp.raise_for_status()
+        body = resp.json()
+    for error in body.get("errors", []):
+        _LOGGER.debug("GraphQL error: %s", error.get("message"))
+    return body.get("data") or {}
+
+
+__all__ = [
+    "GitHubAsset",
+    "GitHubRelease",
+    "get_github_json",
+    "get_latest_release",
+    "get_release",
+    "iter_github_json",
+    "resolve_releases",
+]
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import contextlib
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cache
+from hashlib import sha256
+from os import confstr, uname
+from re import IGNORECASE, search
+from typing import TYPE_CHECKING
+
+from utilities.core import (
+    OneEmptyError,
+    ReadTextError,
+    one,
+    read_text,
+    to_logger,
+    write_text,
+)
+from utilities.subprocess import RunFileNotFoundError, run
+from utilities.typing import get_args
+
+from installer.apps.constants import PATH_PLATFORM_CACHE
+from installer.types import System
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from collections.abc import Set as AbstractSet
+
+    from utilities.types import PathLike, StrMapping
+
+
+_LOGGER = to_logger(__name__)
+_PLATFORM: ContextVar[Platform | None] = ContextVar("_PLATFORM", default=None)
+_SYSTEM_NAME_GROUPS: list[frozenset[str]] = [
+    frozenset({"darwin", "macos"}),
+    frozenset({"linux"}),
+]
+_C_STD_LIB_GROUPS: list[frozenset[str]] = [
+    frozenset({"gnu", "glibc"}),
+    frozenset({"musl"}),
+]
+_MACHINE_TYPE_GROUPS: list[frozenset[str]] = [
+    frozenset({"amd64", "intel64", "x64", "x86_64"}),
+    frozenset({"aarch64", "arm64"}),
+]
+
+
+##
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Platform:
+    system: System
+    system_group: frozenset[str]
+    c_std_lib_group: frozenset[str] | None
+    machine_group: frozenset[str]
+
+    @classmethod
+    def from_json(cls, data: StrMapping, /) -> Platform:
+        c_std_lib_group = data["c_std_lib_group"]
+        return cls(
+            system=_to_system(data["system"]),
+            system_group=frozenset(data["system_group"]),
+            c_std_lib_group=None
+            if c_std_lib_group is None
+            else frozenset(c_std_lib_group),
+            machine_group=frozenset(data["machine_group"]),
+        )
+
+    def to_json(self) -> StrMapping:
+        return {
+            "system": self.system,
+            "system_group": sorted(self.system_group),
+            "c_std_lib_group": None
+            if self.c_std_lib_group is None
+            else sorted(self.c_std_lib_group),
+            "machine_group": sorted(self.machine_group),
+        }
+
+
+def make_platform(system: str, machine: str, /, *, ldd: str | None) -> Platform:
+    """Make a platform from its system name, machine type and `ldd` banner."""
+    system_ = _to_system(system)
+    return Platform(
+        system=system_,
+        system_group=_get_system_name_group(system_),
+        c_std_lib_group=None if ldd is None else _get_c_std_lib_group(ldd),
+        machine_group=_get_machine_type_group(machine),
+    )
+
+
+def get_platform() -> Platform:
+    """Get the platform of the current host, probing it at most once per kernel."""
+    if (platform := _PLATFORM.get()) is not None:
+        return platform
+    return _get_local_platform()
+
+
+def load_platform(*, path: PathLike = PATH_PLATFORM_CACHE) -> Platform:
+    """Load the platform of the current host, probing it on a cache miss."""
+    key = _get_platform_key()
+    with contextlib.suppress(
+        ReadTextError, json.JSONDecodeError, KeyError, TypeError, ValueError
+    ):
+        entry = json.loads(read_text(path))
+        if entry["key"] == key:
+            return Platform.from_json(entry["platform"])
+    platform = probe_platform()
+    _LOGGER.debug("Probed platform %s", platform)
+    write_text(
+        path, json.dumps({"key": key, "platform": platform.to_json()}), overwrite=True
+    )
+    return platform
+
+
+def probe_platform() -> Platform:
+    """Probe the platform of the current host."""
+    uname_ = uname()
+    try:
+        ldd = run("ldd", "--version", return_=True)
+    except RunFileNotFoundError:
+        ldd = None
+    return make_platform(uname_.sysname, uname_.machine, ldd=ldd)
+
+
+def get_system_name() -> System:
+    """Get the system name of the current host, without probing its platform."""
+    if (platform := _PLATFORM.get()) is not None:
+        return platform.system
+    return _get_local_system_name()
+
+
+@contextmanager
+def yield_platform(platform: Platform, /) -> Iterator[None]:
+    """Resolve assets for another platform, e.g. a remote host."""
+    token = _PLATFORM.set(platform)
+    try:
+        yield
+    finally:
+        _PLATFORM.reset(token)
+
+
+##
+
+
+@cache
+def _get_local_platform() -> Platform:
+    return load_platform()
+
+
+@cache
+def _get_local_system_name() -> System:
+    return _to_system(uname().sysname)
+
+
+def _get_platform_key() -> str:
+    uname_ = uname()
+    try:
+        libc = confstr("CS_GNU_LIBC_VERSION")
+    except (OSError, ValueError):
+        libc = None
+    parts = [uname_.sysname, uname_.release, uname_.version, uname_.machine, libc]
+    return sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _to_system(text: str, /) -> System:
+    systems: tuple[System, ...] = get_args(System)
+    if text in systems:
+        return text
+    msg = f"Invalid system name; must be in {systems} but got {text!r}"
+    raise ValueError(msg)
+
+
+def _get_unique_group[T: AbstractSet[str]](
+    groups: Iterable[T], predicate: Callable[[str], bool], /
+) -> T:
+    return one(g for g in groups if any(map(predicate, g)))
+
+
+def _get_system_name_group(system: str, /) -> frozenset[str]:
+    system_ = system.lower()
+
+    def predicate(text: str, /) -> bool:
+        return text.lower() == system_
+
+    try:
+        return _get_unique_group(_SYSTEM_NAME_GROUPS, predicate)
+    except OneEmptyError:
+        msg = (
+            f"Invalid system name; must be in {_SYSTEM_NAME_GROUPS} but got {system_!r}"
+        )
+        raise ValueError(msg) from None
+
+
+def _get_c_std_lib_group(ldd: str, /) -> frozenset[str]:
+    def predicate(text: str, /) -> bool:
+        return search(text, ldd, flags=IGNORECASE) is not None
+
+    try:
+        return _get_unique_group(_C_STD_LIB_GROUPS, predicate)
+    except OneEmptyError:
+        msg = f"Invalid C standard library; must be in {_C_STD_LIB_GROUPS} but got {ldd!r}"
+        raise ValueError(msg) from None
+
+
+def _get_machine_type_group(machine: str, /) -> frozenset[str]:
+    machine_ = machine.lower()
+
+    def predicate(text: str, /) -> bool:
+        return text.lower() == machine_
+
+    try:
+        return _get_unique_group(_MACHINE_TYPE_GROUPS, predicate)
+    except OneEmptyError:
+        msg = f"Invalid machine type; must be in {_MACHINE_TYPE_GROUPS} but got {machine_!r}"
+        raise ValueError(msg) from None
+
+
+__all__ = [
+    "Platform",
+    "get_platform",
+    "get_system_name",
+    "load_platform",
+    "make_platform",
+    "probe_platform",
+    "yield_platform",
+]
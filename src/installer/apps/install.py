@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import shutil
+from dataclasses import dataclass
+from importlib import import_module
+from inspect import signature
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+import utilities.subprocess
+from requests import RequestException
+from utilities.concurrent import concurrent_starmap
+from utilities.core import to_logger
+from utilities.inflect import counted_noun
+from utilities.pydantic import extract_secret
+from utilities.subprocess import BASH_LS, RunCalledProcessError
+
+from installer.apps.constants import GITHUB_TOKEN, INSTALL_MAX_WORKERS
+from installer.apps.download import extract_asset, resolve_asset, yield_extracted_assets
+from installer.apps.github import resolve_releases
+from installer.apps.host import get_system_name
+from installer.apps.inventory import probe_inventory
+from installer.apps.registry import get_app
+from installer.apps.state import is_up_to_date
+from installer.fleet import run_on_ssh_targets
+from installer.utilities import installer_cli_script, split_ssh
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    from utilities.types import Retry, SecretLike, StrMapping
+
+    from installer.apps.registry import App
+
+
+_LOGGER = to_logger(__name__)
+_LIB = "installer.apps.lib"
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class InstallResult:
+    app: str
+    duration: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def install_apps(
+    names: Iterable[str],
+    /,
+    *,
+    max_workers: int = INSTALL_MAX_WORKERS,
+    token: SecretLike | None = GITHUB_TOKEN,
+    **kwargs: Any,
+) -> list[InstallResult]:
+    """Download a set of apps concurrently, then install them one at a time."""
+    apps = [get_app(n) for n in dict.fromkeys(names)]
+    _resolve_releases(apps, token=token)
+    pairs = [(a, {"token": token, **kwargs}) for a in apps]
+    with yield_extracted_assets() as root:
+        _extract_assets(pairs, root, max_workers=max_workers)
+        _set_up_packages(pairs)
+        _LOGGER.info("Installing %s...", counted_noun(apps, "app"))
+        return [_install_app(a, token=token, **kwargs) for a in apps]
+
+
+def run_batch(
+    specs: Iterable[StrMapping], /, *, max_workers: int = INSTALL_MAX_WORKERS
+) -> Iterator[InstallResult]:
+    """Download a batch of app specs concurrently, then install them in order."""
+    specs = [dict(s) for s in specs]
+    apps = [a for s in specs if (a := _get_app_or_none(s["app"])) is not None]
+    tokens = [t for s in specs if (t := s.get("token")) is not None]
+    _resolve_releases(apps, token=tokens[0] if len(tokens) >= 1 else GITHUB_TOKEN)
+    pairs = [
+        (a, {k: v for k, v in s.items() if k != "app"})
+        for s in specs
+        if (a := _get_app_or_none(s["app"])) is not None
+    ]
+    with yield_extracted_assets() as root:
+        _extract_assets(pairs, root, max_workers=max_workers)
+        _set_up_packages(pairs)
+        for spec in specs:
+            yield _run_spec(spec)
+
+
+def install_apps_over_ssh(
+    specs: Iterable[StrMapping], ssh: str, /, *, retry: Retry | None = None
+) -> dict[str, list[InstallResult]]:
+    """Install a batch of app specs on each SSH target, in one remote process each."""
+    specs = [dict(s) for s in specs]
+    apps = {s["app"]: get_app(s["app"]) for s in specs}
+    results: dict[str, list[InstallResult]] = {}
+
+    def set_up_remote(target: str, /) -> None:
+        ssh_user, ssh_hostname = split_ssh(target)
+        inventory = probe_inventory(
+            ssh_user, ssh_hostname, apps=apps.values(), retry=retry
+        )
+        todo = [
+            s
+            for s in specs
+            if s.get("force")
+            or s.get("latest")
+            or (apps[s["app"]].cmd not in inventory.apps)
+        ]
+        if len(todo) == 0:
+            _LOGGER.info("%r already set up on %r", list(apps), ssh_hostname)
+            results[target] = []
+            return
+        _LOGGER.info("Installing %s on %r...", counted_noun(todo, "app"), ssh_hostname)
+        stdin = "\n".join(map(_dump_spec, todo))
+        try:
+            output = utilities.subprocess.ssh(
+                ssh_user,
+                ssh_hostname,
+                *BASH_LS,
+                input=installer_cli_script("batch", stdin=stdin),
+                return_stdout=True,
+                retry=retry,
+                logger=_LOGGER,
+            )
+        except RunCalledProcessError as error:
+            if len(parse_results(error.stdout)) == 0:
+                raise
+            output = error.stdout
+        results[target] = parsed = parse_results(output or "")
+        _LOGGER.info("Results on %r:\n%s", ssh_hostname, format_results(parsed))
+        done = {r.app for r in parsed}
+        failed = [r.app for r in parsed if not r.ok]
+        failed.extend(a for s in todo if (a := s["app"]) not in done)
+        if len(failed) >= 1:
+            msg = f"Failed to install {failed}"
+            raise RuntimeError(msg)
+
+    _ = run_on_ssh_targets(ssh, set_up_remote)
+    return results
+
+
+def parse_results(text: str, /) -> list[InstallResult]:
+    """Parse the JSON lines written by a batch, ignoring any other output."""
+    results: list[InstallResult] = []
+    for line in text.splitlines():
+        if line.startswith("{"):
+            try:
+                results.append(InstallResult(**json.loads(line)))
+            except (json.JSONDecodeError, TypeError):
+                continue
+    return results
+
+
+def format_results(results: Iterable[InstallResult], /) -> str:
+    """Format a set of install results as a summary."""
+    results = list(results)
+    rows = [("APP", "RESULT", "TIME")]
+    rows.extend(
+        (r.app, "ok" if r.ok else f"failed: {r.error}", f"{r.duration:.1f}s")
+        for r in results
+    )
+    widths = [max(map(len, col)) for col in zip(*rows, strict=True)]
+    lines = [
+        "  ".join(c.ljust(w) for c, w in zip(row, widths, strict=True)).rstrip()
+        for row in rows
+    ]
+    total = max((r.duration for r in results), default=0.0)
+    installed = counted_noun(sum(r.ok for r in results), "app")
+    failed = sum(not r.ok for r in results)
+    lines.append(f"{installed} installed, {failed} failed in {total:.1f}s")
+    return "\n".join(lines)
+
+
+##
+
+
+def _dump_spec(spec: StrMapping, /) -> str:
+    if (token := spec.get("token")) is not None:
+        spec = {**spec, "token": extract_secret(token)}
+    return json.dumps(spec, default=str)
+
+
+def _extract_asset(app: App, kwargs: StrMapping, root: Path, /) -> None:
+    token = kwargs.get("token", GITHUB_TOKEN)
+    # a failed download is retried, & reported, by the install which follows
+    try:
+        if _is_set_up(app, kwargs, token=token):
+            return
+        if (resolved := resolve_asset(app, token=token)) is not None:
+            extract_asset(resolved, root, token=token)
+    except Exception as error:  # noqa: BLE001
+        _LOGGER.warning("Unable to download %r up front: %s", app.name, error)
+
+
+def _extract_assets(
+    pairs: Iterable[tuple[App, StrMapping]],
+    root: Path,
+    /,
+    *,
+    max_workers: int = INSTALL_MAX_WORKERS,
+) -> None:
+    triples = [
+        (a, k, root)
+        for a, k in pairs
+        if (len(a.assets) >= 1) and (k.get("ssh") is None)
+    ]
+    _LOGGER.info("Downloading %s...", counted_noun(triples, "app"))
+    _ = concurrent_starmap(
+        _extract_asset, triples, parallelism="threads", max_workers=max_workers
+    )
+
+
+def _get_app_or_none(name: str, /) -> App | None:
+    try:
+        return get_app(name)
+    except ValueError:
+        return None
+
+
+def _get_set_up(app: App, /) -> Callable[..., None]:
+    return getattr(import_module(_LIB), app.set_up)
+
+
+def _install_app(app: App, /, **kwargs: Any) -> InstallResult:
+    set_up = _get_set_up(app)
+    parameters = signature(set_up).parameters
+    start = perf_counter()
+    try:
+        set_up(**{k: v for k, v in kwargs.items() if k in parameters})
+    except Exception as error:
+        _LOGGER.exception("Failed to install %r", app.name)
+        return InstallResult(
+            app=app.name, duration=perf_counter() - start, error=repr(error)
+        )
+    return InstallResult(app=app.name, duration=perf_counter() - start)
+
+
+def _is_set_up(
+    app: App, kwargs: StrMapping, /, *, token: SecretLike | None = GITHUB_TOKEN
+) -> bool:
+    if kwargs.get("force", False) or (shutil.which(app.cmd) is None):
+        return False
+    return (not kwargs.get("latest", False)) or is_up_to_date(app.name, token=token)
+
+
+def _resolve_releases(apps: Iterable[App], /, *, token: SecretLike | None) -> None:
+    specs = [(a.owner, a.repo, None) for a in apps if a.owner and a.repo]
+    try:
+        _ = resolve_releases(specs, token=token)
+    except RequestException as error:
+        _LOGGER.warning("Unable to resolve releases up front: %s", error)
+
+
+def _set_up_packages(pairs: Iterable[tuple[App, StrMapping]], /) -> None:
+    if get_system_name() != "Linux":
+        return
+    by_sudo: dict[bool, list[str]] = {}
+    for app, kwargs in pairs:
+        if kwargs.get("ssh") is None:
+            by_sudo.setdefault(kwargs.get("sudo", False), []).extend(app.packages)
+    set_up: Callable[..., None] = import_module(_LIB).set_up_apt_package
+    # a failed transaction is retried, & reported, by each app's own install
+    for sudo, packages in by_sudo.items():
+        if len(packages) >= 1:
+            try:
+                set_up(*dict.fromkeys(packages), sudo=sudo)
+            except Exception as error:  # noqa: BLE001
+                _LOGGER.warning("Unable to set up %r up front: %s", packages, error)
+
+
+def _run_spec(spec: StrMapping, /) -> InstallResult:
+    name, kwargs = spec["app"], {k: v for k, v in spec.items() if k != "app"}
+    try:
+        app = get_app(name)
+    except ValueError as error:
+        return InstallResult(app=name, duration=0.0, error=repr(error))
+    return _install_app(app, **kwargs)
+
+
+__all__ = [
+    "InstallResult",
+    "format_results",
+    "install_apps",
+    "install_apps_over_ssh",
+    "parse_results",
+    "run_batch",
+]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from shlex import join
+from typing import TYPE_CHECKING
+
+import utilities.subprocess
+from utilities.core import normalize_multi_line_str, to_logger
+
+from installer.apps.host import make_platform
+from installer.apps.registry import APPS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from utilities.types import Retry
+
+    from installer.apps.host import Platform
+    from installer.apps.registry import App
+
+
+_LOGGER = to_logger(__name__)
+_SCRIPT = normalize_multi_line_str(r"""
+    q() {
+        printf '"%s"' "$(printf '%s' "$1" | sed -e 's/\\/\\\\/g' -e 's/"/\\"/g' | tr -d '\000-\037')"
+    }
+    qn() {
+        if [ -n "$1" ]; then q "$1"; else printf null; fi
+    }
+    app() {
+        cmd=$1
+        shift
+        if path=$(command -v "$cmd" 2>/dev/null); then
+            version=$("$cmd" "$@" </dev/null 2>&1 | head -n 1)
+            printf '%s%s:{"path":%s,"version":%s}' "$sep" "$(q "$cmd")" "$(q "$path")" "$(qn "$version")"
+            sep=,
+        fi
+    }
+    package() {
+        status=$(dpkg-query -W -f='${Status}' "$1" 2>/dev/null || true)
+        case $status in
+            *' installed') installed=true ;;
+            *) installed=false ;;
+        esac
+        printf '%s%s:%s' "$sep" "$(q "$1")" "$installed"
+        sep=,
+    }
+    ldd=
+    if command -v ldd >/dev/null 2>&1; then
+        ldd=$(ldd --version 2>&1 | head -n 1)
+    fi
+    printf '{"system":%s,"machine":%s' "$(q "$(uname -s)")" "$(q "$(uname -m)")"
+    printf ',"ldd":%s,"shell":%s' "$(qn "$ldd")" "$(qn "${SHELL##*/}")"
+    printf ',"apps":{'
+    sep=
+""")
+
+
+##
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class RemoteApp:
+    path: str
+    version: str | None = None
+
+
+@dataclass(kw_only=True, slots=True)
+class Inventory:
+    platform: Platform
+    shell: str | None = None
+    apps: dict[str, RemoteApp] = field(default_factory=dict)
+    packages: dict[str, bool] = field(default_factory=dict)
+
+    def get_missing_packages(self, packages: Iterable[str], /) -> list[str]:
+        return [p for p in packages if not self.packages.get(p, False)]
+
+
+def inventory_script(
+    *, apps: Iterable[App] = APPS, packages: Iterable[str] = ()
+) -> str:
+    """POSIX script to print the inventory of a host as a line of JSON."""
+    lines = [_SCRIPT.rstrip("\n")]
+    lines.extend(join(["app", a.cmd, *a.version_args]) for a in apps)
+    lines.extend(["printf '},\"packages\":{'", "sep="])
+    lines.extend(join(["package", p]) for p in packages)
+    lines.append("printf '}}\\n'")
+    return "\n".join(lines) + "\n"
+
+
+def parse_inventory(text: str, /) -> Inventory:
+    """Parse the output of an inventory script, ignoring any other output."""
+    try:
+        line = next(
+            line for line in reversed(text.splitlines()) if line.startswith("{")
+        )
+    except StopIteration:
+        msg = f"No inventory in {text!r}"
+        raise ValueError(msg) from None
+    data = json.loads(line)
+    return Inventory(
+        platform=make_platform(data["system"], data["machine"], ldd=data["ldd"]),
+        shell=data["shell"],
+        apps={k: RemoteApp(**v) for k, v in data["apps"].items()},
+        packages=data["packages"],
+    )
+
+
+def probe_inventory(
+    user: str,
+    hostname: str,
+    /,
+    *,
+    apps: Iterable[App] = APPS,
+    packages: Iterable[str] = (),
+    retry: Retry | None = None,
+) -> Inventory:
+    """Probe the inventory of a remote host in one round trip, without Python."""
+    output = utilities.subprocess.ssh(
+        user,
+        hostname,
+        "sh",
+        "-l",
+        input=inventory_script(apps=apps, packages=packages),
+        return_stdout=True,
+        retry=retry,
+        logger=_LOGGER,
+    )
+    inventory = parse_inventory(output or "")
+    _LOGGER.debug("Inventory of %r: %s", hostname, inventory)
+    return inventory
+
+
+__all__ = [
+    "Inventory",
+    "RemoteApp",
+    "inventory_script",
+    "parse_inventory",
+    "probe_inventory",
+]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 import shutil
+from contextlib import ExitStack
 from pathlib import Path
 from shlex import join
 from typing import TYPE_CHECKING, assert_never
@@ -15,13 +16,10 @@ from utilities.core import (
     one,
     to_logger,
 )
+from utilities.shellingham import SHELL
 from utilities.subprocess import (
-    APT_UPDATE,
     BASH_LS,
-    apt_install,
     apt_install_cmd,
-    apt_remove,
-    apt_update,
     chmod,
     cp,
     curl,
@@ -34,24 +32,29 @@ from utilities.subprocess import (
     yield_ssh_temp_dir,
 )
 
+from installer.apps.apt import apt_install, apt_remove, apt_update_cmd
 from installer.apps.constants import (
     GITHUB_TOKEN,
     PATH_BINARIES,
     PERMISSIONS_BINARY,
     PERMISSIONS_CONFIG,
-    SHELL,
-    SYSTEM_NAME,
 )
-from installer.apps.download import (
-    yield_asset,
-    yield_bz2_asset,
-    yield_gzip_asset,
-    yield_lzma_asset,
+from installer.apps.download import yield_app_asset, yield_asset
+from installer.apps.dpkg import get_missing_packages
+from installer.apps.host import get_system_name
+from installer.apps.inventory import probe_inventory
+from installer.apps.registry import get_app
+from installer.apps.state import (
+    is_up_to_date,
+    note_installed_path,
+    yield_recorded_install,
 )
 from installer.configs.constants import FILE_SYSTEM_ROOT
 from installer.configs.lib import set_up_shell_config
+from installer.fleet import run_on_ssh_targets
 from installer.utilities import (
-    set_up_local_or_ssh,
+    get_path_lock,
+    run_cmds_over_ssh,
     set_up_local_or_ssh_installer_cli,
     split_ssh,
 )
@@ -68,30 +71,62 @@ _LOGGER = to_logger(__name__)
 def set_up_apt_package(
     package: str,
     /,
-    *,
+    *packages: str,
     sudo: bool = False,
     ssh: str | None = None,
     force: bool = False,
     retry: Retry | None = None,
 ) -> None:
-    """Setup an 'apt' package."""
-    cmds: list[list[str]] = [
-        maybe_sudo_cmd(*APT_UPDATE, sudo=sudo),
-        maybe_sudo_cmd(*apt_install_cmd(package), sudo=sudo),
-    ]
-
-    def set_up_local() -> None:
-        match SYSTEM_NAME:
-            case "Darwin":
-                msg = f"Unsupported system: {SYSTEM_NAME!r}"
-                raise ValueError(msg)
-            case "Linux":
-                for cmds_i in cmds:
-                    run(*cmds_i)
-            case never:
-                assert_never(never)
+    """Setup a set of 'apt' packages in a single transaction."""
+    all_packages = list(dict.fromkeys([package, *packages]))
+    match ssh:
+        case None:
+            match get_system_name():
+                case "Darwin":
+                    msg = f"Unsupported system: {get_system_name()!r}"
+                    raise ValueError(msg)
+                case "Linux":
+                    pass
+                case never:
+                    assert_never(never)
+            missing = all_packages if force else get_missing_packages(all_packages)
+            if len(missing) == 0:
+                _LOGGER.info("%r already set up", all_packages)
+                return
+            _LOGGER.info("Setting up %r...", missing)
+            with ExitStack() as stack:
+                for package_i in missing:
+                    stack.enter_context(yield_recorded_install(package_i))
+                apt_install(*missing, sudo=sudo, force=force)
+        case str():
+
+            def set_up_remote(target: str, /) -> None:
+                ssh_user, ssh_hostname = split_ssh(target)
+                if force:
+                    missing = all_packages
+                else:
+                    inventory = probe_inventory(
+                        ssh_user,
+                        ssh_hostname,
+                        apps=(),
+                        packages=all_packages,
+                        retry=retry,
+                    )
+                    missing = inventory.get_missing_packages(all_packages)
+                if len(missing) == 0:
+                    _LOGGER.info("%r already set up on %r", all_packages, ssh_hostname)
+                    return
+                _LOGGER.info("Setting up %r on %r...", missing, ssh_hostname)
+                run_cmds_over_ssh(
+                    target,
+                    apt_update_cmd(sudo=sudo),
+                    maybe_sudo_cmd(*apt_install_cmd(*missing), sudo=sudo),
+                    retry=retry,
+                )
 
-    set_up_local_or_ssh(package, set_up_local, *cmds, ssh=ssh, force=force, retry=retry)
+            _ = run_on_ssh_targets(ssh, set_up_remote)
+        case never:
+            assert_never(never)
 
 
 ##
@@ -130,7 +165,7 @@ def setup_asset(
         endswith=endswith,
         not_endswith=not_endswith,
     ) as src:
-        cp(src, path, sudo=sudo, perms=perms, owner=owner, group=group)
+        _install_binary(src, path, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -146,29 +181,26 @@ def set_up_age(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'age'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "FiloSottile",
-            "age",
-            token=token,
-            match_system=True,
-            match_machine=True,
-            not_endswith=["proof"],
-        ) as temp:
+        with yield_app_asset(get_app("age"), token=token) as temp:
             srcs = {p for p in temp.iterdir() if p.name.startswith("age")}
             for src in srcs:
                 dest = Path(path_binaries, src.name)
-                cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+                _install_binary(
+                    src, dest, sudo=sudo, perms=perms, owner=owner, group=group
+                )
 
     set_up_local_or_ssh_installer_cli(
         "age",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -192,28 +224,23 @@ def set_up_bat(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'bat'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "sharkdp",
-            "bat",
-            token=token,
-            match_system=True,
-            match_c_std_lib=True,
-            match_machine=True,
-        ) as temp:
+        with yield_app_asset(get_app("bat"), token=token) as temp:
             src = temp / "bat"
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "bat",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -237,29 +264,23 @@ def set_up_btm(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'bottom'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "ClementTsang",
-            "bottom",
-            token=token,
-            match_system=True,
-            match_c_std_lib=True,
-            match_machine=True,
-            not_matches=[r"\d+\.tar\.gz$"],
-        ) as temp:
+        with yield_app_asset(get_app("btm"), token=token) as temp:
             src = temp / "btm"
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "btm",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -293,28 +314,23 @@ def set_up_delta(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'delta'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "dandavison",
-            "delta",
-            token=token,
-            match_system=True,
-            match_c_std_lib=True,
-            match_machine=True,
-        ) as temp:
+        with yield_app_asset(get_app("delta"), token=token) as temp:
             src = temp / "delta"
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "delta",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -343,24 +359,17 @@ def set_up_direnv(
     root: PathLike | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'direnv'."""
 
     def set_up_local() -> None:
         dest = Path(path_binaries, "direnv")
-        setup_asset(
-            "direnv",
-            "direnv",
-            dest,
-            token=token,
-            match_system=True,
-            match_machine=True,
-            sudo=sudo,
-            perms=perms_binary,
-            owner=owner,
-            group=group,
-        )
+        with yield_app_asset(get_app("direnv"), token=token) as src:
+            _install_binary(
+                src, dest, sudo=sudo, perms=perms_binary, owner=owner, group=group
+            )
         set_up_shell_config(
             'eval "$(direnv hook bash)"',
             'eval "$(direnv hook fish)"',
@@ -379,6 +388,7 @@ def set_up_direnv(
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -406,9 +416,9 @@ def set_up_docker(
     retry: Retry | None = None,
 ) -> None:
     def set_up_local() -> None:
-        match SYSTEM_NAME:
+        match get_system_name():
             case "Darwin":
-                msg = f"Unsupported system: {SYSTEM_NAME!r}"
+                msg = f"Unsupported system: {get_system_name()!r}"
                 raise ValueError(msg)
             case "Linux":
                 apt_remove(
@@ -420,7 +430,6 @@ def set_up_docker(
                     "runc",
                     sudo=sudo,
                 )
-                apt_update(sudo=sudo)
                 apt_install("ca-certificates", "curl", sudo=sudo)
                 docker_asc = Path("/etc/apt/keyrings/docker.asc")
                 install(
@@ -455,7 +464,6 @@ def set_up_docker(
                     "containerd.io",
                     "docker-buildx-plugin",
                     "docker-compose-plugin",
-                    update=True,
                     sudo=sudo,
                 )
                 if user is not None:
@@ -479,35 +487,23 @@ def set_up_dust(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'dust'."""
 
     def set_up_local() -> None:
-        match SYSTEM_NAME:
-            case "Darwin":
-                match_machine = False
-            case "Linux":
-                match_machine = True
-            case never:
-                assert_never(never)
-        with yield_gzip_asset(
-            "bootandy",
-            "dust",
-            token=token,
-            match_system=True,
-            match_c_std_lib=True,
-            match_machine=match_machine,
-        ) as temp:
+        with yield_app_asset(get_app("dust"), token=token) as temp:
             src = temp / "dust"
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "dust",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -531,44 +527,22 @@ def set_up_eza(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'eza'."""
 
     def set_up_local() -> None:
-        match SYSTEM_NAME:
-            case "Darwin":
-                asset_owner = "cargo-bins"
-                asset_repo = "cargo-quickinstall"
-                tag = "eza"
-                match_c_std_lib = False
-                not_endswith = ["sig"]
-            case "Linux":
-                asset_owner = "eza-community"
-                asset_repo = "eza"
-                tag = None
-                match_c_std_lib = True
-                not_endswith = ["zip"]
-            case never:
-                assert_never(never)
-        with yield_gzip_asset(
-            asset_owner,
-            asset_repo,
-            tag=tag,
-            token=token,
-            match_system=True,
-            match_c_std_lib=match_c_std_lib,
-            match_machine=True,
-            not_endswith=not_endswith,
-        ) as src:
+        with yield_app_asset(get_app("eza"), token=token) as src:
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "eza",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -592,28 +566,23 @@ def set_up_fd(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'fd'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "sharkdp",
-            "fd",
-            token=token,
-            match_system=True,
-            match_c_std_lib=True,
-            match_machine=True,
-        ) as temp:
+        with yield_app_asset(get_app("fd"), token=token) as temp:
             src = temp / "fd"
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "fd",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -642,16 +611,17 @@ def set_up_fzf(
     root: PathLike | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'fzf'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "junegunn", "fzf", token=token, match_system=True, match_machine=True
-        ) as src:
+        with yield_app_asset(get_app("fzf"), token=token) as src:
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms_binary, owner=owner, group=group)
+            _install_binary(
+                src, dest, sudo=sudo, perms=perms_binary, owner=owner, group=group
+            )
         set_up_shell_config(
             'eval "$(fzf --bash)"',
             "source <(fzf --zsh)",
@@ -670,6 +640,7 @@ def set_up_fzf(
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -707,24 +678,21 @@ def setup_jq(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'jq'."""
-    if (shutil.which("jq") is None) or force:
+    if (
+        (shutil.which("jq") is None)
+        or force
+        or (latest and not _is_latest_installed("jq", token=token))
+    ):
         _LOGGER.info("Setting up 'jq'...")
-        dest = Path(path_binaries, "jq")
-        setup_asset(
-            "jqlang",
-            "jq",
-            dest,
-            token=token,
-            match_system=True,
-            match_machine=True,
-            not_endswith=["linux64"],
-            sudo=sudo,
-            perms=perms,
-            owner=owner,
-            group=group,
-        )
+        with yield_recorded_install("jq"):
+            dest = Path(path_binaries, "jq")
+            with yield_app_asset(get_app("jq"), token=token) as src:
+                _install_binary(
+                    src, dest, sudo=sudo, perms=perms, owner=owner, group=group
+                )
     else:
         _LOGGER.info("'jq' is already set up")
 
@@ -742,23 +710,23 @@ def set_up_just(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'just'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "casey", "just", token=token, match_system=True, match_machine=True
-        ) as temp:
+        with yield_app_asset(get_app("just"), token=token) as temp:
             src = temp / "just"
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "just",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -782,21 +750,17 @@ def set_up_nvim(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'neovim'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "neovim",
-            "neovim",
-            token=token,
-            match_system=True,
-            match_machine=True,
-            not_endswith=["appimage", "zsync"],
-        ) as temp:
+        with yield_app_asset(get_app("nvim"), token=token) as temp:
             dest_dir = Path(path_binaries, "nvim-dir")
-            cp(temp, dest_dir, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(
+                temp, dest_dir, sudo=sudo, perms=perms, owner=owner, group=group
+            )
             dest_bin = Path(path_binaries, "nvim")
             symlink(dest_dir / "bin/nvim", dest_bin, sudo=sudo)
 
@@ -805,6 +769,7 @@ def set_up_nvim(
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -823,14 +788,15 @@ def set_up_pve_fake_subscription(
     token: SecretLike | None = GITHUB_TOKEN,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'pve-fake-subscription'."""
 
     def set_up_local() -> None:
-        match SYSTEM_NAME:
+        match get_system_name():
             case "Darwin":
-                msg = f"Unsupported system: {SYSTEM_NAME!r}"
+                msg = f"Unsupported system: {get_system_name()!r}"
                 raise ValueError(msg)
             case "Linux":
                 with yield_asset(
@@ -845,6 +811,7 @@ def set_up_pve_fake_subscription(
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         retry=retry,
     )
@@ -863,22 +830,22 @@ def set_up_restic(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'restic'."""
 
     def set_up_local() -> None:
-        with yield_bz2_asset(
-            "restic", "restic", token=token, match_system=True, match_machine=True
-        ) as src:
+        with yield_app_asset(get_app("restic"), token=token) as src:
             dest = Path(path_binaries, "restic")
-            cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
-        "age",
+        "restic",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -900,20 +867,19 @@ def setup_ripgrep(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'ripgrep'."""
+    if latest and _is_latest_installed("ripgrep", token=token):
+        return
     _LOGGER.info("Setting up 'ripgrep'...")
-    with yield_gzip_asset(
-        "burntsushi",
-        "ripgrep",
-        token=token,
-        match_system=True,
-        match_machine=True,
-        not_endswith=["sha256"],
-    ) as temp:
+    with (
+        yield_recorded_install("ripgrep"),
+        yield_app_asset(get_app("ripgrep"), token=token) as temp,
+    ):
         src = temp / "rg"
         dest = Path(path_binaries, src.name)
-        cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+        _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -937,21 +903,19 @@ def setup_ruff(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'ruff'."""
+    if latest and _is_latest_installed("ruff", token=token):
+        return
     _LOGGER.info("Setting up 'ruff'...")
-    with yield_gzip_asset(
-        "astral-sh",
-        "ruff",
-        token=token,
-        match_system=True,
-        match_c_std_lib=True,
-        match_machine=True,
-        not_endswith=["sha256"],
-    ) as temp:
+    with (
+        yield_recorded_install("ruff"),
+        yield_app_asset(get_app("ruff"), token=token) as temp,
+    ):
         src = temp / "ruff"
         dest = Path(path_binaries, src.name)
-        cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+        _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -965,20 +929,19 @@ def setup_sd(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'sd'."""
+    if latest and _is_latest_installed("sd", token=token):
+        return
     _LOGGER.info("Setting up 'sd'...")
-    with yield_gzip_asset(
-        "chmln",
-        "sd",
-        token=token,
-        match_system=True,
-        match_c_std_lib=True,
-        match_machine=True,
-    ) as temp:
+    with (
+        yield_recorded_install("sd"),
+        yield_app_asset(get_app("sd"), token=token) as temp,
+    ):
         src = temp / "sd"
         dest = Path(path_binaries, src.name)
-        cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+        _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -992,20 +955,19 @@ def setup_shellcheck(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'shellcheck'."""
+    if latest and _is_latest_installed("shellcheck", token=token):
+        return
     _LOGGER.info("Setting up 'shellcheck'...")
-    with yield_gzip_asset(
-        "koalaman",
-        "shellcheck",
-        token=token,
-        match_system=True,
-        match_machine=True,
-        not_endswith=["tar.xz"],
-    ) as temp:
+    with (
+        yield_recorded_install("shellcheck"),
+        yield_app_asset(get_app("shellcheck"), token=token) as temp,
+    ):
         src = temp / "shellcheck"
         dest = Path(path_binaries, src.name)
-        cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+        _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -1019,22 +981,16 @@ def setup_shfmt(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'shfmt'."""
+    if latest and _is_latest_installed("shfmt", token=token):
+        return
     _LOGGER.info("Setting up 'shfmt'...")
-    dest = Path(path_binaries, "shfmt")
-    setup_asset(
-        "mvdan",
-        "sh",
-        dest,
-        token=token,
-        match_system=True,
-        match_machine=True,
-        sudo=sudo,
-        perms=perms,
-        owner=owner,
-        group=group,
-    )
+    with yield_recorded_install("shfmt"):
+        dest = Path(path_binaries, "shfmt")
+        with yield_app_asset(get_app("shfmt"), token=token) as src:
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -1050,31 +1006,22 @@ def set_up_sops(
     group: str | int | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'sops'."""
 
     def set_up_local() -> None:
         dest = Path(path_binaries, "sops")
-        setup_asset(
-            "getsops",
-            "sops",
-            dest,
-            token=token,
-            match_system=True,
-            match_machine=True,
-            not_endswith=["json"],
-            sudo=sudo,
-            perms=perms,
-            owner=owner,
-            group=group,
-        )
+        with yield_app_asset(get_app("sops"), token=token) as src:
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
     set_up_local_or_ssh_installer_cli(
         "sops",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -1104,22 +1051,17 @@ def set_up_starship(
     starship_toml: PathLike | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'starship'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "starship",
-            "starship",
-            token=token,
-            match_system=True,
-            match_c_std_lib=True,
-            match_machine=True,
-            not_endswith=["sha256"],
-        ) as src:
+        with yield_app_asset(get_app("starship"), token=token) as src:
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms_binary, owner=owner, group=group)
+            _install_binary(
+                src, dest, sudo=sudo, perms=perms_binary, owner=owner, group=group
+            )
         export = ["export STARSHIP_CONFIG='/etc/starship.toml'"] if etc else []
         set_up_shell_config(
             [*export, 'eval "$(starship init bash)"'],
@@ -1148,10 +1090,11 @@ def set_up_starship(
             )
 
     set_up_local_or_ssh_installer_cli(
-        "zoxide",
+        "starship",
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -1179,14 +1122,18 @@ def setup_taplo(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'taplo'."""
+    if latest and _is_latest_installed("taplo", token=token):
+        return
     _LOGGER.info("Setting up 'taplo'...")
-    with yield_gzip_asset(
-        "tamasfe", "taplo", token=token, match_system=True, match_machine=True
-    ) as src:
+    with (
+        yield_recorded_install("taplo"),
+        yield_app_asset(get_app("taplo"), token=token) as src,
+    ):
         dest = Path(path_binaries, "taplo")
-        cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+        _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -1202,41 +1149,47 @@ def set_up_uv(
     owner: str | int | None = None,
     group: str | int | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'uv'."""
     _LOGGER.info("Setting up 'uv'...")
+    if (ssh is None) and latest and (not force):
+        force = not _is_latest_installed("uv", token=token)
     match ssh, shutil.which("uv"), force:
         case (None, None, _) | (None, str(), True):
             _LOGGER.info("Setting up 'uv'...")
-            with yield_gzip_asset(
-                "astral-sh",
-                "uv",
-                token=token,
-                match_system=True,
-                match_c_std_lib=True,
-                match_machine=True,
-                not_endswith=["sha256"],
-            ) as temp:
+            with (
+                yield_recorded_install("uv"),
+                yield_app_asset(get_app("uv"), token=token) as temp,
+            ):
                 src = temp / "uv"
                 dest = Path(path_binaries, src.name)
-                cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+                _install_binary(
+                    src, dest, sudo=sudo, perms=perms, owner=owner, group=group
+                )
         case None, str(), False:
             _LOGGER.info("Setting up 'uv'...")
         case str(), _, _:
-            ssh_user, ssh_hostname = split_ssh(ssh)
-            _LOGGER.info("Setting up 'uv' on %r...", ssh_hostname)
-            with yield_ssh_temp_dir(
-                ssh_user, ssh_hostname, retry=retry, logger=_LOGGER
-            ) as temp:
-                utilities.subprocess.ssh(
-                    ssh_user,
-                    ssh_hostname,
-                    *BASH_LS,
-                    input=set_up_uv_cmd(temp, path_binaries=path_binaries, sudo=sudo),
-                    retry=retry,
-                    logger=_LOGGER,
-                )
+
+            def set_up_remote(target: str, /) -> None:
+                ssh_user, ssh_hostname = split_ssh(target)
+                _LOGGER.info("Setting up 'uv' on %r...", ssh_hostname)
+                with yield_ssh_temp_dir(
+                    ssh_user, ssh_hostname, retry=retry, logger=_LOGGER
+                ) as temp:
+                    utilities.subprocess.ssh(
+                        ssh_user,
+                        ssh_hostname,
+                        *BASH_LS,
+                        input=set_up_uv_cmd(
+                            temp, path_binaries=path_binaries, sudo=sudo
+                        ),
+                        retry=retry,
+                        logger=_LOGGER,
+                    )
+
+            _ = run_on_ssh_targets(ssh, set_up_remote)
         case never:
             assert_never(never)
 
@@ -1275,21 +1228,19 @@ def setup_watchexec(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'watchexec'."""
+    if latest and _is_latest_installed("watchexec", token=token):
+        return
     _LOGGER.info("Setting up 'watchexec'...")
-    with yield_lzma_asset(
-        "watchexec",
-        "watchexec",
-        token=token,
-        match_system=True,
-        match_c_std_lib=True,
-        match_machine=True,
-        not_endswith=["b3", "deb", "rpm", "sha256", "sha512"],
-    ) as temp:
+    with (
+        yield_recorded_install("watchexec"),
+        yield_app_asset(get_app("watchexec"), token=token) as temp,
+    ):
         src = temp / "watchexec"
         dest = Path(path_binaries, src.name)
-        cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+        _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -1303,23 +1254,16 @@ def setup_yq(
     perms: PermissionsLike = PERMISSIONS_BINARY,
     owner: str | int | None = None,
     group: str | int | None = None,
+    latest: bool = False,
 ) -> None:
     """Set up 'yq'."""
+    if latest and _is_latest_installed("yq", token=token):
+        return
     _LOGGER.info("Setting up 'yq'...")
-    dest = Path(path_binaries, "yq")
-    setup_asset(
-        "mikefarah",
-        "yq",
-        dest,
-        token=token,
-        match_system=True,
-        match_machine=True,
-        not_endswith=["tar.gz"],
-        sudo=sudo,
-        perms=perms,
-        owner=owner,
-        group=group,
-    )
+    with yield_recorded_install("yq"):
+        dest = Path(path_binaries, "yq")
+        with yield_app_asset(get_app("yq"), token=token) as src:
+            _install_binary(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
 
 
 ##
@@ -1340,17 +1284,18 @@ def set_up_zoxide(
     root: PathLike | None = None,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     retry: Retry | None = None,
 ) -> None:
     """Set up 'zoxide'."""
 
     def set_up_local() -> None:
-        with yield_gzip_asset(
-            "ajeetdsouza", "zoxide", token=token, match_system=True, match_machine=True
-        ) as temp:
+        with yield_app_asset(get_app("zoxide"), token=token) as temp:
             src = temp / "zoxide"
             dest = Path(path_binaries, src.name)
-            cp(src, dest, sudo=sudo, perms=perms_binary, owner=owner, group=group)
+            _install_binary(
+                src, dest, sudo=sudo, perms=perms_binary, owner=owner, group=group
+            )
         set_up_shell_config(
             'eval "$(zoxide init --cmd j bash)"',
             'eval "$(zoxide init --cmd j zsh)"',
@@ -1369,6 +1314,7 @@ def set_up_zoxide(
         set_up_local,
         ssh=ssh,
         force=force,
+        latest=latest,
         token=token,
         path_binaries=path_binaries,
         sudo=sudo,
@@ -1384,6 +1330,33 @@ def set_up_zoxide(
     )
 
 
+##
+
+
+def _is_latest_installed(
+    app: str, /, *, token: SecretLike | None = GITHUB_TOKEN
+) -> bool:
+    if (shutil.which(get_app(app).cmd) is not None) and is_up_to_date(app, token=token):
+        _LOGGER.info("%r is already at the latest release", app)
+        return True
+    return False
+
+
+def _install_binary(
+    src: PathLike,
+    dest: PathLike,
+    /,
+    *,
+    sudo: bool = False,
+    perms: PermissionsLike | None = None,
+    owner: str | int | None = None,
+    group: str | int | None = None,
+) -> None:
+    with get_path_lock(dest):
+        cp(src, dest, sudo=sudo, perms=perms, owner=owner, group=group)
+    note_installed_path(dest)
+
+
 __all__ = [
     "set_up_age",
     "set_up_apt_package",
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+from functools import partial
+from importlib import import_module
+from inspect import signature
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from utilities.concurrent import concurrent_map
+from utilities.core import to_logger
+from utilities.inflect import counted_noun
+from utilities.subprocess import chmod_cmd, maybe_sudo_cmd, rsync
+
+from installer.apps.constants import GITHUB_TOKEN, PATH_BINARIES, PERMISSIONS_BINARY
+from installer.apps.host import yield_platform
+from installer.apps.inventory import probe_inventory
+from installer.apps.registry import get_app
+from installer.apps.state import yield_staged_install
+from installer.fleet import SSH_MAX_WORKERS, get_ssh_targets, run_on_ssh_targets
+from installer.utilities import run_cmds_over_ssh, split_ssh
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from utilities.core import PermissionsLike
+    from utilities.types import PathLike, Retry, SecretLike
+
+    from installer.apps.host import Platform
+    from installer.apps.registry import App
+    from installer.fleet import HostResult
+
+
+_LOGGER = to_logger(__name__)
+# 'nvim' installs a directory & a symlink into it, so it cannot be staged
+_UNPUSHABLE = {"nvim"}
+
+
+##
+
+
+def probe_remote_platform(target: str, /, *, retry: Retry | None = None) -> Platform:
+    """Probe the platform of a remote host."""
+    ssh_user, ssh_hostname = split_ssh(target)
+    return probe_inventory(ssh_user, ssh_hostname, apps=(), retry=retry).platform
+
+
+def push_apps(
+    names: Iterable[str],
+    ssh: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    path_binaries: PathLike = PATH_BINARIES,
+    sudo: bool = False,
+    perms: PermissionsLike = PERMISSIONS_BINARY,
+    owner: str | int | None = None,
+    group: str | int | None = None,
+    max_workers: int = SSH_MAX_WORKERS,
+    retry: Retry | None = None,
+) -> list[HostResult]:
+    """Download a set of apps once per remote platform, then copy them to each host."""
+    apps = [get_app(n) for n in dict.fromkeys(names)]
+    for app in apps:
+        _check_pushable(app)
+    targets = get_ssh_targets(ssh)
+    _LOGGER.info("Probing %s...", counted_noun(targets, "host"))
+    probes = concurrent_map(
+        partial(_probe_or_error, retry=retry),
+        targets,
+        parallelism="threads",
+        max_workers=max_workers,
+    )
+    platforms = {
+        t: p
+        for t, p in zip(targets, probes, strict=True)
+        if not isinstance(p, Exception)
+    }
+    probe_errors = {
+        t: p for t, p in zip(targets, probes, strict=True) if isinstance(p, Exception)
+    }
+    staged: dict[Platform, Path] = {}
+    errors: dict[Platform, Exception] = {}
+    with ExitStack() as stack:
+        for platform in dict.fromkeys(platforms.values()):
+            hosts = [t for t, p in platforms.items() if p == platform]
+            _LOGGER.info(
+                "Staging %s for %s...",
+                counted_noun(apps, "app"),
+                counted_noun(hosts, "host"),
+            )
+            stage = Path(stack.enter_context(TemporaryDirectory()))
+            try:
+                _stage_apps(apps, platform, stage, token=token)
+            except Exception as error:
+                _LOGGER.exception("Failed to stage apps for %s", hosts)
+                errors[platform] = error
+            else:
+                staged[platform] = stage
+
+        def push_remote(target: str, /) -> None:
+            if (error := probe_errors.get(target)) is not None:
+                raise error
+            if (error := errors.get(platforms[target])) is not None:
+                raise error
+            _push_files(
+                sorted(staged[platforms[target]].iterdir()),
+                target,
+                path_binaries=path_binaries,
+                sudo=sudo,
+                perms=perms,
+                owner=owner,
+                group=group,
+                retry=retry,
+            )
+
+        return run_on_ssh_targets(ssh, push_remote, max_workers=max_workers)
+
+
+##
+
+
+def _check_pushable(app: App, /) -> None:
+    parameters = signature(_get_set_up(app)).parameters
+    if (
+        (app.owner is None)
+        or (app.name in _UNPUSHABLE)
+        or ("path_binaries" not in parameters)
+        or ("shell" in parameters)
+    ):
+        msg = f"{app.name!r} cannot be pushed; it is not a standalone binary"
+        raise ValueError(msg)
+
+
+def _probe_or_error(
+    target: str, /, *, retry: Retry | None = None
+) -> Platform | Exception:
+    try:
+        return probe_remote_platform(target, retry=retry)
+    except Exception as error:
+        _LOGGER.exception("Failed to probe %r", target)
+        return error
+
+
+def _get_set_up(app: App, /) -> Callable[..., None]:
+    return getattr(import_module("installer.apps.lib"), app.set_up)
+
+
+def _stage_apps(
+    apps: Sequence[App],
+    platform: Platform,
+    stage: Path,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+) -> None:
+    kwargs = {"token": token, "path_binaries": stage, "force": True}
+    with yield_platform(platform), yield_staged_install():
+        for app in apps:
+            set_up = _get_set_up(app)
+            parameters = signature(set_up).parameters
+            set_up(**{k: v for k, v in kwargs.items() if k in parameters})
+
+
+def _push_files(
+    files: Sequence[Path],
+    target: str,
+    /,
+    *,
+    path_binaries: PathLike = PATH_BINARIES,
+    sudo: bool = False,
+    perms: PermissionsLike = PERMISSIONS_BINARY,
+    owner: str | int | None = None,
+    group: str | int | None = None,
+    retry: Retry | None = None,
+) -> None:
+    ssh_user, ssh_hostname = split_ssh(target)
+    _LOGGER.info("Pushing %s to %r...", counted_noun(files, "file"), ssh_hostname)
+    rsync(
+        files,
+        ssh_user,
+        ssh_hostname,
+        path_binaries,
+        sudo=sudo,
+        chown_user=None if owner is None else str(owner),
+        chown_group=None if group is None else str(group),
+        retry=retry,
+        logger=_LOGGER,
+    )
+    # 'rsync(chmod=...)' would change the destination directory, not the files
+    cmds = [
+        maybe_sudo_cmd(*chmod_cmd(Path(path_binaries, f.name), perms), sudo=sudo)
+        for f in files
+    ]
+    run_cmds_over_ssh(target, *cmds, retry=retry)
+
+
+__all__ = ["probe_remote_platform", "push_apps"]
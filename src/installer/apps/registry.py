@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from utilities.core import OneEmptyError, one
+
+if TYPE_CHECKING:
+    from installer.types import System
+
+
+type Decompress = Literal["bz2", "gzip", "lzma"]
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Asset:
+    decompress: Decompress | None = "gzip"
+    system: System | None = None
+    owner: str | None = None
+    repo: str | None = None
+    tag: str | None = None
+    match_system: bool = True
+    match_c_std_lib: bool = False
+    match_machine: bool = True
+    not_matches: tuple[str, ...] | None = None
+    endswith: tuple[str, ...] | None = None
+    not_endswith: tuple[str, ...] | None = None
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class App:
+    name: str
+    cmd: str
+    set_up: str
+    owner: str | None = None
+    repo: str | None = None
+    version_args: tuple[str, ...] = ("--version",)
+    packages: tuple[str, ...] = ()
+    assets: tuple[Asset, ...] = ()
+
+    def get_asset(self, system: System, /) -> Asset | None:
+        """Get the asset this app installs from on a given system, if any."""
+        return next((a for a in self.assets if a.system in {None, system}), None)
+
+
+APPS: list[App] = [
+    App(
+        name="age",
+        cmd="age",
+        set_up="set_up_age",
+        owner="FiloSottile",
+        repo="age",
+        assets=(Asset(not_endswith=("proof",)),),
+    ),
+    App(
+        name="bat",
+        cmd="bat",
+        set_up="set_up_bat",
+        owner="sharkdp",
+        repo="bat",
+        assets=(Asset(match_c_std_lib=True),),
+    ),
+    App(
+        name="btm",
+        cmd="btm",
+        set_up="set_up_btm",
+        owner="ClementTsang",
+        repo="bottom",
+        assets=(Asset(match_c_std_lib=True, not_matches=(r"\d+\.tar\.gz$",)),),
+    ),
+    App(name="curl", cmd="curl", set_up="set_up_curl", packages=("curl",)),
+    App(
+        name="delta",
+        cmd="delta",
+        set_up="set_up_delta",
+        owner="dandavison",
+        repo="delta",
+        assets=(Asset(match_c_std_lib=True),),
+    ),
+    App(
+        name="direnv",
+        cmd="direnv",
+        set_up="set_up_direnv",
+        owner="direnv",
+        repo="direnv",
+        assets=(Asset(decompress=None),),
+    ),
+    App(
+        name="docker",
+        cmd="docker",
+        set_up="set_up_docker",
+        packages=("ca-certificates", "curl"),
+    ),
+    App(
+        name="dust",
+        cmd="dust",
+        set_up="set_up_dust",
+        owner="bootandy",
+        repo="dust",
+        assets=(
+            Asset(system="Darwin", match_c_std_lib=True, match_machine=False),
+            Asset(system="Linux", match_c_std_lib=True),
+        ),
+    ),
+    App(
+        name="eza",
+        cmd="eza",
+        set_up="set_up_eza",
+        owner="eza-community",
+        repo="eza",
+        assets=(
+            Asset(
+                system="Darwin",
+                owner="cargo-bins",
+                repo="cargo-quickinstall",
+                tag="eza",
+                not_endswith=("sig",),
+            ),
+            Asset(system="Linux", match_c_std_lib=True, not_endswith=("zip",)),
+        ),
+    ),
+    App(
+        name="fd",
+        cmd="fd",
+        set_up="set_up_fd",
+        owner="sharkdp",
+        repo="fd",
+        assets=(Asset(match_c_std_lib=True),),
+    ),
+    App(
+        name="fzf",
+        cmd="fzf",
+        set_up="set_up_fzf",
+        owner="junegunn",
+        repo="fzf",
+        assets=(Asset(),),
+    ),
+    App(name="git", cmd="git", set_up="set_up_git", packages=("git",)),
+    App(
+        name="jq",
+        cmd="jq",
+        set_up="setup_jq",
+        owner="jqlang",
+        repo="jq",
+        assets=(Asset(decompress=None, not_endswith=("linux64",)),),
+    ),
+    App(
+        name="just",
+        cmd="just",
+        set_up="set_up_just",
+        owner="casey",
+        repo="just",
+        assets=(Asset(),),
+    ),
+    App(
+        name="nvim",
+        cmd="nvim",
+        set_up="set_up_nvim",
+        owner="neovim",
+        repo="neovim",
+        assets=(Asset(not_endswith=("appimage", "zsync")),),
+    ),
+    App(
+        name="restic",
+        cmd="restic",
+        set_up="set_up_restic",
+        owner="restic",
+        repo="restic",
+        version_args=("version",),
+        assets=(Asset(decompress="bz2"),),
+    ),
+    App(
+        name="ripgrep",
+        cmd="rg",
+        set_up="setup_ripgrep",
+        owner="burntsushi",
+        repo="ripgrep",
+        assets=(Asset(not_endswith=("sha256",)),),
+    ),
+    App(name="rsync", cmd="rsync", set_up="set_up_rsync", packages=("rsync",)),
+    App(
+        name="ruff",
+        cmd="ruff",
+        set_up="setup_ruff",
+        owner="astral-sh",
+        repo="ruff",
+        assets=(Asset(match_c_std_lib=True, not_endswith=("sha256",)),),
+    ),
+    App(
+        name="sd",
+        cmd="sd",
+        set_up="setup_sd",
+        owner="chmln",
+        repo="sd",
+        assets=(Asset(match_c_std_lib=True),),
+    ),
+    App(
+        name="shellcheck",
+        cmd="shellcheck",
+        set_up="setup_shellcheck",
+        owner="koalaman",
+        repo="shellcheck",
+        assets=(Asset(not_endswith=("tar.xz",)),),
+    ),
+    App(
+        name="shfmt",
+        cmd="shfmt",
+        set_up="setup_shfmt",
+        owner="mvdan",
+        repo="sh",
+        assets=(Asset(decompress=None),),
+    ),
+    App(
+        name="sops",
+        cmd="sops",
+        set_up="set_up_sops",
+        owner="getsops",
+        repo="sops",
+        assets=(Asset(decompress=None, not_endswith=("json",)),),
+    ),
+    App(
+        name="starship",
+        cmd="starship",
+        set_up="set_up_starship",
+        owner="starship",
+        repo="starship",
+        assets=(Asset(match_c_std_lib=True, not_endswith=("sha256",)),),
+    ),
+    App(
+        name="taplo",
+        cmd="taplo",
+        set_up="setup_taplo",
+        owner="tamasfe",
+        repo="taplo",
+        assets=(Asset(),),
+    ),
+    App(
+        name="uv",
+        cmd="uv",
+        set_up="set_up_uv",
+        owner="astral-sh",
+        repo="uv",
+        assets=(Asset(match_c_std_lib=True, not_endswith=("sha256",)),),
+    ),
+    App(
+        name="watchexec",
+        cmd="watchexec",
+        set_up="setup_watchexec",
+        owner="watchexec",
+        repo="watchexec",
+        assets=(
+            Asset(
+                decompress="lzma",
+                match_c_std_lib=True,
+                not_endswith=("b3", "deb", "rpm", "sha256", "sha512"),
+            ),
+        ),
+    ),
+    App(
+        name="yq",
+        cmd="yq",
+        set_up="setup_yq",
+        owner="mikefarah",
+        repo="yq",
+        assets=(Asset(decompress=None, not_endswith=("tar.gz",)),),
+    ),
+    App(
+        name="zoxide",
+        cmd="zoxide",
+        set_up="set_up_zoxide",
+        owner="ajeetdsouza",
+        repo="zoxide",
+        assets=(Asset(),),
+    ),
+]
+
+
+def get_app(name: str, /) -> App:
+    """Get a known app by name."""
+    try:
+        return one(a for a in APPS if a.name == name)
+    except OneEmptyError:
+        msg = f"Unknown app {name!r}; must be one of {[a.name for a in APPS]}"
+        raise ValueError(msg) from None
+
+
+__all__ = ["APPS", "App", "Asset", "Decompress", "get_app"]
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import cache
+from logging import DEBUG
+from re import IGNORECASE
+from typing import TYPE_CHECKING
+
+from utilities.core import OneNonUniqueError, always_iterable, one, to_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from collections.abc import Set as AbstractSet
+
+    from utilities.types import MaybeSequenceStr
+
+    from installer.apps.github import GitHubAsset
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class AssetCandidate:
+    asset: GitHubAsset
+    score: int = 0
+    rejections: list[str] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> bool:
+        return len(self.rejections) == 0
+
+
+def rank_assets(
+    assets: Iterable[GitHubAsset],
+    /,
+    *,
+    system: AbstractSet[str] | None = None,
+    c_std_lib: AbstractSet[str] | None = None,
+    machine: AbstractSet[str] | None = None,
+    not_matches: MaybeSequenceStr | None = None,
+    endswith: MaybeSequenceStr | None = None,
+    not_endswith: MaybeSequenceStr | None = None,
+) -> list[AssetCandidate]:
+    """Rank a set of GitHub assets, recording why each one was rejected."""
+    rules = _compile_rules(
+        system=_to_frozenset(system),
+        c_std_lib=_to_frozenset(c_std_lib),
+        machine=_to_frozenset(machine),
+        not_matches=_to_tuple(not_matches),
+        endswith=_to_tuple(endswith),
+        not_endswith=_to_tuple(not_endswith),
+    )
+    candidates: list[AssetCandidate] = []
+    for asset in assets:
+        candidate = AssetCandidate(asset=asset)
+        for rule in rules:
+            if rule.predicate(asset.name):
+                candidate.score += 1
+            else:
+                candidate.rejections.append(rule.description)
+        candidates.append(candidate)
+    return sorted(candidates, key=lambda c: -c.score)
+
+
+def select_asset(
+    assets: Iterable[GitHubAsset],
+    /,
+    *,
+    system: AbstractSet[str] | None = None,
+    c_std_lib: AbstractSet[str] | None = None,
+    machine: AbstractSet[str] | None = None,
+    not_matches: MaybeSequenceStr | None = None,
+    endswith: MaybeSequenceStr | None = None,
+    not_endswith: MaybeSequenceStr | None = None,
+) -> GitHubAsset:
+    """Select the unique GitHub asset satisfying a set of rules."""
+    candidates = rank_assets(
+        assets,
+        system=system,
+        c_std_lib=c_std_lib,
+        machine=machine,
+        not_matches=not_matches,
+        endswith=endswith,
+        not_endswith=not_endswith,
+    )
+    if _LOGGER.isEnabledFor(DEBUG):
+        for candidate in candidates:
+            _LOGGER.debug(
+                "%s %r (score %d)%s",
+                "Accepted" if candidate.accepted else "Rejected",
+                candidate.asset.name,
+                candidate.score,
+                "" if candidate.accepted else f": {'; '.join(candidate.rejections)}",
+            )
+    accepted = [c.asset for c in candidates if c.accepted]
+    if len(accepted) == 0:
+        for candidate in candidates[:3]:
+            _LOGGER.warning(
+                "Near miss %r: %s",
+                candidate.asset.name,
+                "; ".join(candidate.rejections),
+            )
+    try:
+        return one(accepted)
+    except OneNonUniqueError as error:
+        raise OneNonUniqueError(
+            iterables=([a.name for a in accepted],),
+            first=error.first.name,
+            second=error.second.name,
+        ) from None
+
+
+##
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class _Rule:
+    description: str
+    predicate: Callable[[str], bool]
+
+
+@cache
+def _compile_rules(
+    *,
+    system: frozenset[str] | None = None,
+    c_std_lib: frozenset[str] | None = None,
+    machine: frozenset[str] | None = None,
+    not_matches: tuple[str, ...] | None = None,
+    endswith: tuple[str, ...] | None = None,
+    not_endswith: tuple[str, ...] | None = None,
+) -> tuple[_Rule, ...]:
+    rules: list[_Rule] = []
+    for name, group in [
+        ("system", system),
+        ("C standard library", c_std_lib),
+        ("machine", machine),
+    ]:
+        if group is not None:
+            pattern = _compile_alternation(sorted(group), flags=IGNORECASE)
+            rules.append(
+                _Rule(
+                    description=f"{name} not in {sorted(group)}",
+                    predicate=lambda text, p=pattern: p.search(text) is not None,
+                )
+            )
+    if not_matches is not None:
+        pattern = _compile_alternation(not_matches)
+        rules.append(
+            _Rule(
+                description=f"matches one of {list(not_matches)}",
+                predicate=lambda text, p=pattern: p.search(text) is None,
+            )
+        )
+    if endswith is not None:
+        rules.append(
+            _Rule(
+                description=f"does not end with one of {list(endswith)}",
+                predicate=lambda text, s=endswith: text.endswith(s),
+            )
+        )
+    if not_endswith is not None:
+        rules.append(
+            _Rule(
+                description=f"ends with one of {list(not_endswith)}",
+                predicate=lambda text, s=not_endswith: not text.endswith(s),
+            )
+        )
+    return tuple(rules)
+
+
+def _compile_alternation(
+    patterns: Iterable[str], /, *, flags: int = 0
+) -> re.Pattern[str]:
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags=flags)
+
+
+def _to_frozenset(group: AbstractSet[str] | None, /) -> frozenset[str] | None:
+    return None if group is None else frozenset(group)
+
+
+def _to_tuple(text: MaybeSequenceStr | None, /) -> tuple[str, ...] | None:
+    return None if text is None else tuple(always_iterable(text))
+
+
+__all__ = ["AssetCandidate", "rank_assets", "select_asset"]
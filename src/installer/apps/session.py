@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from atexit import register
+from dataclasses import dataclass
+from functools import cache
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from utilities.core import to_logger
+from utilities.inflect import counted_noun
+
+from installer.apps.constants import DOWNLOAD_CONNECTIONS, INSTALL_MAX_WORKERS
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+@cache
+def get_session() -> Session:
+    """Get the process-wide HTTP session."""
+    session = Session()
+    # every concurrent install may download over all of its connections at once
+    adapter = HTTPAdapter(
+        pool_maxsize=max(INSTALL_MAX_WORKERS * DOWNLOAD_CONNECTIONS, 10)
+    )
+    for prefix in ["http://", "https://"]:
+        session.mount(prefix, adapter)
+    _ = register(_log_connection_stats)
+    return session
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class ConnectionStats:
+    host: str
+    connections: int
+    requests: int
+
+    @property
+    def reused(self) -> int:
+        return self.requests - self.connections
+
+
+def get_connection_stats() -> list[ConnectionStats]:
+    """Get the connection reuse statistics of the process-wide HTTP session."""
+    stats: dict[str, ConnectionStats] = {}
+    adapters = get_session().adapters.values()
+    for adapter in {id(a): a for a in adapters}.values():
+        if not isinstance(adapter, HTTPAdapter):
+            continue
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():  # noqa: SIM118
+            if (pool := pools.get(key)) is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = stats.setdefault(
+                host, ConnectionStats(host=host, connections=0, requests=0)
+            )
+            entry.connections += pool.num_connections
+            entry.requests += pool.num_requests
+    return sorted(stats.values(), key=lambda s: s.host)
+
+
+def _log_connection_stats() -> None:
+    for stats in get_connection_stats():
+        _LOGGER.debug(
+            "%s: %s over %s",
+            stats.host,
+            counted_noun(stats.requests, "request"),
+            counted_noun(stats.connections, "connection"),
+        )
+
+
+__all__ = ["ConnectionStats", "get_connection_stats", "get_session"]
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import astuple, dataclass, field, fields
+from datetime import UTC, datetime
+from hashlib import file_digest
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+
+from installer.apps.constants import GITHUB_TOKEN, PATH_STATE_DB
+from installer.apps.github import get_latest_release
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from utilities.types import PathLike, SecretLike
+
+    from installer.apps.github import GitHubAsset, GitHubRelease
+
+
+_LOGGER = to_logger(__name__)
+_RECORDING: ContextVar[_Recording | None] = ContextVar("_RECORDING", default=None)
+_STAGING: ContextVar[bool] = ContextVar("_STAGING", default=False)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS installed (
+    app TEXT NOT NULL,
+    path TEXT NOT NULL,
+    owner TEXT,
+    repo TEXT,
+    tag TEXT,
+    asset TEXT,
+    digest TEXT,
+    sha256 TEXT,
+    inode INTEGER,
+    mtime_ns INTEGER,
+    installed_at TEXT NOT NULL,
+    PRIMARY KEY (app, path)
+)
+"""
+_SCHEMA_CONVERGED = """
+CREATE TABLE IF NOT EXISTS converged (
+    node TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    converged_at TEXT NOT NULL
+)
+"""
+_INSERT = "INSERT OR REPLACE INTO installed VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class InstalledArtifact:
+    app: str
+    path: str = ""
+    owner: str | None = None
+    repo: str | None = None
+    tag: str | None = None
+    asset: str | None = None
+    digest: str | None = None
+    sha256: str | None = None
+    inode: int | None = None
+    mtime_ns: int | None = None
+    installed_at: str = field(default_factory=lambda: datetime.now(tz=UTC).isoformat())
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row, /) -> InstalledArtifact:
+        return cls(**{f.name: row[f.name] for f in fields(cls)})
+
+
+def get_installed(
+    app: str | None = None, /, *, path: PathLike = PATH_STATE_DB
+) -> list[InstalledArtifact]:
+    """Get the recorded artifacts of an app, or of all apps."""
+    with _yield_connection(path) as conn:
+        if app is None:
+            rows = conn.execute("SELECT * FROM installed ORDER BY app, path")
+        else:
+            rows = conn.execute(
+                "SELECT * FROM installed WHERE app = ? ORDER BY path", (app,)
+            )
+        return [InstalledArtifact.from_row(r) for r in rows]
+
+
+def set_installed(
+    app: str,
+    artifacts: Sequence[InstalledArtifact],
+    /,
+    *,
+    path: PathLike = PATH_STATE_DB,
+) -> None:
+    """Replace the recorded artifacts of an app."""
+    with _yield_connection(path) as conn, conn:
+        _ = conn.execute("DELETE FROM installed WHERE app = ?", (app,))
+        _ = conn.executemany(_INSERT, [astuple(a) for a in artifacts])
+
+
+def get_converged_digest(node: str, /, *, path: PathLike = PATH_STATE_DB) -> str | None:
+    """Get the input digest a node was last converged with."""
+    with _yield_connection(path) as conn:
+        row = conn.execute(
+            "SELECT digest FROM converged WHERE node = ?", (node,)
+        ).fetchone()
+    return None if row is None else row["digest"]
+
+
+def set_converged_digest(
+    node: str, digest: str, /, *, path: PathLike = PATH_STATE_DB
+) -> None:
+    """Record the input digest a node was converged with."""
+    now = datetime.now(tz=UTC).isoformat()
+    with _yield_connection(path) as conn, conn:
+        _ = conn.execute(
+            "INSERT OR REPLACE INTO converged VALUES (?, ?, ?)", (node, digest, now)
+        )
+
+
+def is_up_to_date(
+    app: str,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    path: PathLike = PATH_STATE_DB,
+) -> bool:
+    """Check if an app was installed from the latest release."""
+    try:
+        installed = next(a for a in get_installed(app, path=path) if a.tag is not None)
+    except StopIteration:
+        _LOGGER.info("No installed release recorded for %r", app)
+        return False
+    if (installed.owner is None) or (installed.repo is None):
+        return False
+    latest = get_latest_release(installed.owner, installed.repo, token=token)
+    if latest.tag_name != installed.tag:
+        _LOGGER.info(
+            "%r is at %r but the latest release is %r",
+            app,
+            installed.tag,
+            latest.tag_name,
+        )
+        return False
+    if installed.digest is None:
+        return True
+    return any(
+        (a.name == installed.asset) and (a.digest in {None, installed.digest})
+        for a in latest.assets
+    )
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class _Recording:
+    assets: list[tuple[str, str, GitHubRelease, GitHubAsset]] = field(
+        default_factory=list
+    )
+    paths: list[Path] = field(default_factory=list)
+
+
+def note_resolved_asset(
+    owner: str, repo: str, release: GitHubRelease, asset: GitHubAsset, /
+) -> None:
+    """Note a resolved GitHub asset against the install being recorded, if any."""
+    if (recording := _RECORDING.get()) is not None:
+        recording.assets.append((owner, repo, release, asset))
+
+
+def note_installed_path(path: PathLike, /) -> None:
+    """Note an installed path against the install being recorded, if any."""
+    if (recording := _RECORDING.get()) is not None:
+        recording.paths.append(Path(path))
+
+
+@contextmanager
+def yield_recorded_install(
+    app: str, /, *, path: PathLike = PATH_STATE_DB
+) -> Iterator[None]:
+    """Record the artifacts an app is installed as, on success."""
+    if _STAGING.get():
+        yield
+        return
+    recording = _Recording()
+    token = _RECORDING.set(recording)
+    try:
+        yield
+    finally:
+        _RECORDING.reset(token)
+    artifacts = [_to_artifact(app, recording, p) for p in recording.paths or [None]]
+    set_installed(app, artifacts, path=path)
+
+
+@contextmanager
+def yield_staged_install() -> Iterator[None]:
+    """Install into a staging directory, without recording the artifacts."""
+    token = _STAGING.set(True)
+    try:
+        yield
+    finally:
+        _STAGING.reset(token)
+
+
+##
+
+
+def _to_artifact(
+    app: str, recording: _Recording, path: Path | None, /
+) -> InstalledArtifact:
+    artifact = InstalledArtifact(app=app)
+    if len(recording.assets) >= 1:
+        owner, repo, release, asset = recording.assets[-1]
+        artifact.owner, artifact.repo = owner, repo
+        artifact.tag, artifact.asset = release.tag_name, asset.name
+        artifact.digest = asset.digest
+    if path is not None:
+        artifact.path = str(path)
+        with contextlib.suppress(OSError):
+            stat = path.stat()
+            artifact.inode, artifact.mtime_ns = stat.st_ino, stat.st_mtime_ns
+            if path.is_file():
+                with path.open(mode="rb") as fh:
+                    artifact.sha256 = file_digest(fh, "sha256").hexdigest()
+    return artifact
+
+
+##
+
+
+@contextmanager
+def _yield_connection(path: PathLike, /) -> Iterator[sqlite3.Connection]:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.closing(sqlite3.connect(path, timeout=30)) as conn:
+        conn.row_factory = sqlite3.Row
+        _ = conn.execute(_SCHEMA)
+        _ = conn.execute(_SCHEMA_CONVERGED)
+        yield conn
+
+
+__all__ = [
+    "InstalledArtifact",
+    "get_converged_digest",
+    "get_installed",
+    "is_up_to_date",
+    "note_installed_path",
+    "note_resolved_asset",
+    "set_converged_digest",
+    "set_installed",
+    "yield_recorded_install",
+    "yield_staged_install",
+]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import shutil
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from re import search
+from typing import TYPE_CHECKING
+
+from requests import RequestException
+from utilities.concurrent import concurrent_map
+from utilities.core import ReadTextError, read_text, to_logger, write_text
+from utilities.inflect import counted_noun
+from utilities.subprocess import RunError, run
+
+from installer.apps.constants import (
+    GITHUB_TOKEN,
+    PATH_STATE_DB,
+    PATH_VERSION_CACHE,
+    STATUS_MAX_WORKERS,
+)
+from installer.apps.github import get_latest_release
+from installer.apps.registry import APPS
+from installer.apps.state import get_installed
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from utilities.types import PathLike, SecretLike
+
+    from installer.apps.registry import App
+    from installer.apps.state import InstalledArtifact
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class AppStatus:
+    app: str
+    path: str | None = None
+    installed: str | None = None
+    latest: str | None = None
+
+    @property
+    def outdated(self) -> bool:
+        if (self.installed is None) or (self.latest is None):
+            return False
+        installed, latest = map(_extract_version, [self.installed, self.latest])
+        return (
+            (installed is not None) and (latest is not None) and (installed != latest)
+        )
+
+
+def get_statuses(
+    apps: Iterable[App] = APPS,
+    /,
+    *,
+    token: SecretLike | None = GITHUB_TOKEN,
+    max_workers: int = STATUS_MAX_WORKERS,
+    state: PathLike = PATH_STATE_DB,
+    cache: PathLike = PATH_VERSION_CACHE,
+) -> list[AppStatus]:
+    """Get the installed and latest versions of a set of apps, concurrently."""
+    apps = list(apps)
+    recorded = {a.path: a for a in get_installed(path=state) if a.tag is not None}
+    cached, versions = _read_versions(cache), {}
+    statuses = concurrent_map(
+        partial(
+            _get_status,
+            token=token,
+            recorded=recorded,
+            cached=cached,
+            versions=versions,
+        ),
+        apps,
+        parallelism="threads",
+        max_workers=max_workers,
+    )
+    write_text(cache, json.dumps(versions, indent=2, sort_keys=True), overwrite=True)
+    _LOGGER.info("%s outdated", counted_noun(sum(s.outdated for s in statuses), "app"))
+    return statuses
+
+
+def format_statuses(statuses: Iterable[AppStatus], /) -> str:
+    """Format a set of app statuses as a table."""
+    rows = [("APP", "INSTALLED", "LATEST", "STATUS")]
+    for status in statuses:
+        if status.installed is None:
+            state = "missing"
+        elif status.outdated:
+            state = "outdated"
+        else:
+            state = "ok"
+        rows.append((
+            status.app,
+            "-"
+            if status.installed is None
+            else (_extract_version(status.installed) or status.installed),
+            "-" if status.latest is None else status.latest,
+            state,
+        ))
+    widths = [max(map(len, col)) for col in zip(*rows, strict=True)]
+    return "\n".join(
+        "  ".join(c.ljust(w) for c, w in zip(row, widths, strict=True)).rstrip()
+        for row in rows
+    )
+
+
+##
+
+
+def _get_status(
+    app: App,
+    /,
+    *,
+    token: SecretLike | None,
+    recorded: dict[str, InstalledArtifact],
+    cached: dict[str, str],
+    versions: dict[str, str],
+) -> AppStatus:
+    status = AppStatus(app=app.name, path=shutil.which(app.cmd))
+    if status.path is not None:
+        status.installed = _get_installed_version(
+            app,
+            status.path,
+            recorded=recorded.get(status.path),
+            cached=cached,
+            versions=versions,
+        )
+    if (app.owner is not None) and (app.repo is not None):
+        try:
+            status.latest = get_latest_release(
+                app.owner, app.repo, token=token
+            ).tag_name
+        except RequestException as error:
+            _LOGGER.warning(
+                "Unable to get the latest release of %r: %s", app.name, error
+            )
+    return status
+
+
+def _get_installed_version(
+    app: App,
+    path: str,
+    /,
+    *,
+    recorded: InstalledArtifact | None,
+    cached: dict[str, str],
+    versions: dict[str, str],
+) -> str | None:
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    if (
+        (recorded is not None)
+        and (recorded.inode == stat.st_ino)
+        and (recorded.mtime_ns == stat.st_mtime_ns)
+    ):
+        return recorded.tag
+    key = f"{path}:{stat.st_ino}:{stat.st_mtime_ns}"
+    if (version := cached.get(key)) is None:
+        try:
+            output = run(path, *app.version_args, return_=True)
+        except RunError:
+            _LOGGER.warning("Unable to get the version of %r", app.name)
+            return None
+        lines = (output or "").strip().splitlines()
+        version = lines[0] if len(lines) >= 1 else ""
+    versions[key] = version
+    return version
+
+
+def _extract_version(text: str, /) -> str | None:
+    match = search(r"\d+(?:\.\d+)+", text)
+    return None if match is None else match.group()
+
+
+def _read_versions(path: PathLike, /) -> dict[str, str]:
+    with contextlib.suppress(ReadTextError, json.JSONDecodeError):
+        return json.loads(read_text(path))
+    return {}
+
+
+__all__ = ["AppStatus", "format_statuses", "get_statuses"]
@@ -1,126 +1,108 @@
 from __future__ import annotations
 
-from click import group, version_option
+from importlib import import_module
+from typing import TYPE_CHECKING, override
+
+from click import Group, command, group, version_option
 from utilities.click import CONTEXT_SETTINGS
 
 from installer import __version__
-from installer.apps.cli import (
-    age_sub_cmd,
-    apt_package_sub_cmd,
-    bat_sub_cmd,
-    btm_sub_cmd,
-    curl_sub_cmd,
-    delta_sub_cmd,
-    direnv_sub_cmd,
-    docker_sub_cmd,
-    dust_sub_cmd,
-    eza_sub_cmd,
-    fd_sub_cmd,
-    fzf_sub_cmd,
-    git_sub_cmd,
-    jq_sub_cmd,
-    just_sub_cmd,
-    nvim_sub_cmd,
-    pve_fake_subscription_sub_cmd,
-    restic_sub_cmd,
-    ripgrep_sub_cmd,
-    rsync_sub_cmd,
-    ruff_sub_cmd,
-    sd_sub_cmd,
-    shellcheck_sub_cmd,
-    shfmt_sub_cmd,
-    sops_sub_cmd,
-    starship_sub_cmd,
-    taplo_sub_cmd,
-    uv_sub_cmd,
-    watchexec_sub_cmd,
-    yq_sub_cmd,
-    zoxide_sub_cmd,
-)
-from installer.clone.cli import git_clone_sub_cmd
-from installer.configs.cli import (
-    setup_authorized_keys_sub_cmd,
-    setup_ssh_config_sub_cmd,
-    setup_sshd_sub_cmd,
-)
 
+if TYPE_CHECKING:
+    from click import Command, Context, HelpFormatter
 
-@group(**CONTEXT_SETTINGS)
-@version_option(version=__version__)
-def cli() -> None: ...
 
+_APPS = "installer.apps.cli"
+_CLONE = "installer.clone.cli"
+_CONFIGS = "installer.configs.cli"
+_PROFILE = "installer.profile.cli"
+_COMMANDS: dict[str, tuple[str, str, str]] = {
+    "apt-package": (_APPS, "apt_package_sub_cmd", "Set up a set of 'apt' packages"),
+    "age": (_APPS, "age_sub_cmd", "Set up 'age'"),
+    "bat": (_APPS, "bat_sub_cmd", "Set up 'bat'"),
+    "batch": (_APPS, "batch_sub_cmd", "Set up apps read as JSON lines from stdin"),
+    "btm": (_APPS, "btm_sub_cmd", "Set up 'btm'"),
+    "curl": (_APPS, "curl_sub_cmd", "Set up 'curl'"),
+    "delta": (_APPS, "delta_sub_cmd", "Set up 'delta'"),
+    "direnv": (_APPS, "direnv_sub_cmd", "Set up 'direnv'"),
+    "docker": (_APPS, "docker_sub_cmd", "Set up 'docker'"),
+    "dust": (_APPS, "dust_sub_cmd", "Set up 'dust'"),
+    "eza": (_APPS, "eza_sub_cmd", "Set up 'eza'"),
+    "fd": (_APPS, "fd_sub_cmd", "Set up 'fd'"),
+    "fzf": (_APPS, "fzf_sub_cmd", "Set up 'fzf'"),
+    "install": (_APPS, "install_sub_cmd", "Set up several apps concurrently"),
+    "jq": (_APPS, "jq_sub_cmd", "Set up 'jq'"),
+    "git": (_APPS, "git_sub_cmd", "Set up 'git'"),
+    "just": (_APPS, "just_sub_cmd", "Set up 'just'"),
+    "nvim": (_APPS, "nvim_sub_cmd", "Set up 'nvim'"),
+    "outdated": (_APPS, "outdated_sub_cmd", "List the apps with a newer release"),
+    "pve-fake-subscription": (
+        _APPS,
+        "pve_fake_subscription_sub_cmd",
+        "Set up 'pve-fake-subscription'",
+    ),
+    "push": (_APPS, "push_sub_cmd", "Download apps once, then copy them to many hosts"),
+    "restic": (_APPS, "restic_sub_cmd", "Set up 'restic'"),
+    "ripgrep": (_APPS, "ripgrep_sub_cmd", "Set up 'ripgrep'"),
+    "ruff": (_APPS, "ruff_sub_cmd", "Set up 'ruff'"),
+    "rsync": (_APPS, "rsync_sub_cmd", "Set up 'rsync'"),
+    "sd": (_APPS, "sd_sub_cmd", "Set up 'sd'"),
+    "shellcheck": (_APPS, "shellcheck_sub_cmd", "Set up 'shellcheck'"),
+    "shfmt": (_APPS, "shfmt_sub_cmd", "Set up 'shfmt'"),
+    "sops": (_APPS, "sops_sub_cmd", "Set up 'sops'"),
+    "starship": (_APPS, "starship_sub_cmd", "Set up 'starship'"),
+    "status": (_APPS, "status_sub_cmd", "Show the installed and latest app versions"),
+    "taplo": (_APPS, "taplo_sub_cmd", "Set up 'taplo'"),
+    "uv": (_APPS, "uv_sub_cmd", "Set up 'uv'"),
+    "watchexec": (_APPS, "watchexec_sub_cmd", "Set up 'watchexec'"),
+    "yq": (_APPS, "yq_sub_cmd", "Set up 'yq'"),
+    "zoxide": (_APPS, "zoxide_sub_cmd", "Set up 'zoxide'"),
+    ##
+    "git-clone": (_CLONE, "git_clone_sub_cmd", "Clone a repo with a deploy key."),
+    ##
+    "setup-authorized-keys": (
+        _CONFIGS,
+        "setup_authorized_keys_sub_cmd",
+        "Set up the SSH authorized keys",
+    ),
+    "setup-ssh-config": (_CONFIGS, "setup_ssh_config_sub_cmd", "Set up the SSH config"),
+    "setup-sshd-config": (_CONFIGS, "setup_sshd_sub_cmd", "Set up the SSHD config"),
+    ##
+    "apply": (_PROFILE, "apply_sub_cmd", "Converge the machine to a profile"),
+}
 
-_ = cli.command(name="apt-package", help="Set up an 'apt' package", **CONTEXT_SETTINGS)(
-    apt_package_sub_cmd
-)
-_ = cli.command(name="age", help="Set up 'age'", **CONTEXT_SETTINGS)(age_sub_cmd)
-_ = cli.command(name="bat", help="Set up 'bat'", **CONTEXT_SETTINGS)(bat_sub_cmd)
-_ = cli.command(name="btm", help="Set up 'btm'", **CONTEXT_SETTINGS)(btm_sub_cmd)
-_ = cli.command(name="curl", help="Set up 'curl'", **CONTEXT_SETTINGS)(curl_sub_cmd)
-_ = cli.command(name="delta", help="Set up 'delta'", **CONTEXT_SETTINGS)(delta_sub_cmd)
-_ = cli.command(name="direnv", help="Set up 'direnv'", **CONTEXT_SETTINGS)(
-    direnv_sub_cmd
-)
-_ = cli.command(name="docker", help="Set up 'docker'", **CONTEXT_SETTINGS)(
-    docker_sub_cmd
-)
-_ = cli.command(name="dust", help="Set up 'dust'", **CONTEXT_SETTINGS)(dust_sub_cmd)
-_ = cli.command(name="eza", help="Set up 'eza'", **CONTEXT_SETTINGS)(eza_sub_cmd)
-_ = cli.command(name="fd", help="Set up 'fd'", **CONTEXT_SETTINGS)(fd_sub_cmd)
-_ = cli.command(name="fzf", help="Set up 'fzf'", **CONTEXT_SETTINGS)(fzf_sub_cmd)
-_ = cli.command(name="jq", help="Set up 'jq'", **CONTEXT_SETTINGS)(jq_sub_cmd)
-_ = cli.command(name="git", help="Set up 'git'", **CONTEXT_SETTINGS)(git_sub_cmd)
-_ = cli.command(name="just", help="Set up 'just'", **CONTEXT_SETTINGS)(just_sub_cmd)
-_ = cli.command(name="nvim", help="Set up 'nvim'", **CONTEXT_SETTINGS)(nvim_sub_cmd)
-_ = cli.command(
-    name="pve-fake-subscription",
-    help="Set up 'pve-fake-subscription'",
-    **CONTEXT_SETTINGS,
-)(pve_fake_subscription_sub_cmd)
-_ = cli.command(name="restic", help="Set up 'restic'", **CONTEXT_SETTINGS)(
-    restic_sub_cmd
-)
-_ = cli.command(name="ripgrep", help="Set up 'ripgrep'", **CONTEXT_SETTINGS)(
-    ripgrep_sub_cmd
-)
-_ = cli.command(name="ruff", help="Set up 'ruff'", **CONTEXT_SETTINGS)(ruff_sub_cmd)
-_ = cli.command(name="rsync", help="Set up 'rsync'", **CONTEXT_SETTINGS)(rsync_sub_cmd)
-_ = cli.command(name="sd", help="Set up 'sd'", **CONTEXT_SETTINGS)(sd_sub_cmd)
-_ = cli.command(name="shellcheck", help="Set up 'shellcheck'", **CONTEXT_SETTINGS)(
-    shellcheck_sub_cmd
-)
-_ = cli.command(name="shfmt", help="Set up 'shfmt'", **CONTEXT_SETTINGS)(shfmt_sub_cmd)
-_ = cli.command(name="sops", help="Set up 'sops'", **CONTEXT_SETTINGS)(sops_sub_cmd)
-_ = cli.command(name="starship", help="Set up 'starship'", **CONTEXT_SETTINGS)(
-    starship_sub_cmd
-)
-_ = cli.command(name="taplo", help="Set up 'taplo'", **CONTEXT_SETTINGS)(taplo_sub_cmd)
-_ = cli.command(name="uv", help="Set up 'uv'", **CONTEXT_SETTINGS)(uv_sub_cmd)
-_ = cli.command(name="watchexec", help="Set up 'watchexec'", **CONTEXT_SETTINGS)(
-    watchexec_sub_cmd
-)
-_ = cli.command(name="yq", help="Set up 'yq'", **CONTEXT_SETTINGS)(yq_sub_cmd)
-_ = cli.command(name="zoxide", help="Set up 'zoxide'", **CONTEXT_SETTINGS)(
-    zoxide_sub_cmd
-)
 
+class _LazyGroup(Group):
+    @override
+    def list_commands(self, ctx: Context) -> list[str]:
+        return sorted({*self.commands, *_COMMANDS})
 
-_ = cli.command(
-    name="git-clone", help="Clone a repo with a deploy key.", **CONTEXT_SETTINGS
-)(git_clone_sub_cmd)
+    @override
+    def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+        try:
+            module, attr, help_ = _COMMANDS[cmd_name]
+        except KeyError:
+            return None
+        func = getattr(import_module(module), attr)
+        cmd = command(name=cmd_name, help=help_, **CONTEXT_SETTINGS)(func)
+        self.add_command(cmd)
+        return cmd
 
+    @override
+    def format_commands(self, ctx: Context, formatter: HelpFormatter) -> None:
+        rows = [
+            (name, _COMMANDS[name][2] if name in _COMMANDS else "")
+            for name in self.list_commands(ctx)
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
 
-_ = cli.command(
-    name="setup-authorized-keys",
-    help="Set up the SSH authorized keys",
-    **CONTEXT_SETTINGS,
-)(setup_authorized_keys_sub_cmd)
-_ = cli.command(
-    name="setup-ssh-config", help="Set up the SSH config", **CONTEXT_SETTINGS
-)(setup_ssh_config_sub_cmd)
-_ = cli.command(
-    name="setup-sshd-config", help="Set up the SSHD config", **CONTEXT_SETTINGS
-)(setup_sshd_sub_cmd)
+
+@group(cls=_LazyGroup, **CONTEXT_SETTINGS)
+@version_option(version=__version__)
+def cli() -> None: ...
 
 
 if __name__ == "__main__":
@@ -30,6 +30,7 @@ from utilities.subprocess import (
 )
 
 from installer.configs.constants import FILE_SYSTEM_ROOT
+from installer.fleet import run_on_ssh_targets
 from installer.utilities import ensure_line_or_lines, split_ssh
 
 if TYPE_CHECKING:
@@ -66,34 +67,39 @@ def set_up_authorized_keys(
         if (owner is not None) or (group is not None):
             chown(path, sudo=sudo, recursive=True, user=owner, group=group)
     else:
-        user, hostname = split_ssh(ssh)
-        utilities.subprocess.ssh(
-            user,
-            hostname,
-            *maybe_sudo_cmd(*tee_cmd(path), sudo=sudo),
-            batch_mode=batch_mode,
-            input=text,
-            retry=retry,
-            logger=_LOGGER,
-        )
-        if perms is not None:
-            utilities.subprocess.ssh(
-                user,
-                hostname,
-                *maybe_sudo_cmd(*chmod_cmd(path, perms, recursive=True), sudo=sudo),
-                retry=retry,
-                logger=_LOGGER,
-            )
-        if (owner is not None) or (group is not None):
+
+        def set_up_remote(target: str, /) -> None:
+            user, hostname = split_ssh(target)
             utilities.subprocess.ssh(
                 user,
                 hostname,
-                *maybe_sudo_cmd(
-                    *chown_cmd(path, recursive=True, user=owner, group=group), sudo=sudo
-                ),
+                *maybe_sudo_cmd(*tee_cmd(path), sudo=sudo),
+                batch_mode=batch_mode,
+                input=text,
                 retry=retry,
                 logger=_LOGGER,
             )
+            if perms is not None:
+                utilities.subprocess.ssh(
+                    user,
+                    hostname,
+                    *maybe_sudo_cmd(*chmod_cmd(path, perms, recursive=True), sudo=sudo),
+                    retry=retry,
+                    logger=_LOGGER,
+                )
+            if (owner is not None) or (group is not None):
+                utilities.subprocess.ssh(
+                    user,
+                    hostname,
+                    *maybe_sudo_cmd(
+                        *chown_cmd(path, recursive=True, user=owner, group=group),
+                        sudo=sudo,
+                    ),
+                    retry=retry,
+                    logger=_LOGGER,
+                )
+
+        _ = run_on_ssh_targets(ssh, set_up_remote)
 
 
 ##
@@ -156,19 +162,31 @@ def set_up_ssh_config(
         tee(config, text, sudo=sudo)
         mkdir(config_d, sudo=sudo)
     else:
-        user, hostname = split_ssh(ssh)
-        cmds: list[list[str]] = [mkdir_cmd(config, parent=True), mkdir_cmd(config_d)]
-        utilities.subprocess.ssh(
-            user,
-            hostname,
-            *BASH_LS,
-            input="\n".join(map(join, cmds)),
-            retry=retry,
-            logger=_LOGGER,
-        )
-        utilities.subprocess.ssh(
-            user, hostname, *tee_cmd(config), input=text, retry=retry, logger=_LOGGER
-        )
+
+        def set_up_remote(target: str, /) -> None:
+            user, hostname = split_ssh(target)
+            cmds: list[list[str]] = [
+                mkdir_cmd(config, parent=True),
+                mkdir_cmd(config_d),
+            ]
+            utilities.subprocess.ssh(
+                user,
+                hostname,
+                *BASH_LS,
+                input="\n".join(map(join, cmds)),
+                retry=retry,
+                logger=_LOGGER,
+            )
+            utilities.subprocess.ssh(
+                user,
+                hostname,
+                *tee_cmd(config),
+                input=text,
+                retry=retry,
+                logger=_LOGGER,
+            )
+
+        _ = run_on_ssh_targets(ssh, set_up_remote)
 
 
 ##
@@ -188,16 +206,20 @@ def set_up_sshd_config(
     if ssh is None:
         tee(path, text, sudo=sudo)
     else:
-        user, hostname = split_ssh(ssh)
-        path = Path("/etc/ssh/sshd_config.d/default.conf")
-        utilities.subprocess.ssh(
-            user,
-            hostname,
-            *maybe_sudo_cmd(*tee_cmd(path), sudo=sudo),
-            input=text,
-            retry=retry,
-            logger=_LOGGER,
-        )
+
+        def set_up_remote(target: str, /) -> None:
+            user, hostname = split_ssh(target)
+            path = Path("/etc/ssh/sshd_config.d/default.conf")
+            utilities.subprocess.ssh(
+                user,
+                hostname,
+                *maybe_sudo_cmd(*tee_cmd(path), sudo=sudo),
+                input=text,
+                retry=retry,
+                logger=_LOGGER,
+            )
+
+        _ = run_on_ssh_targets(ssh, set_up_remote)
 
 
 def sshd_config(*, permit_root_login: bool = False) -> str:
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+from signal import SIGTERM
+from subprocess import Popen
+from threading import Thread
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+import utilities.subprocess
+from utilities.concurrent import concurrent_map
+from utilities.core import get_env, has_env, is_pytest, read_text, to_logger
+from utilities.inflect import counted_noun
+
+from installer.ssh import enable_ssh_multiplexing
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+SSH_MAX_WORKERS = get_env("INSTALLER_SSH_MAX_WORKERS", default="16", transform=int)
+SSH_TIMEOUT = (
+    get_env("INSTALLER_SSH_TIMEOUT", transform=float)
+    if has_env("INSTALLER_SSH_TIMEOUT")
+    else None
+)
+_LOGGER = to_logger(__name__)
+_KILL_GRACE = 5.0
+_CHILDREN: ContextVar[set[int] | None] = ContextVar("_CHILDREN", default=None)
+
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class HostResult:
+    target: str
+    duration: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def format_host_results(results: Iterable[HostResult], /) -> str:
+    """Format a set of per-host results as a summary."""
+    results = list(results)
+    rows = [("HOST", "RESULT", "TIME")]
+    rows.extend(
+        (r.target, "ok" if r.ok else f"failed: {r.error}", f"{r.duration:.1f}s")
+        for r in results
+    )
+    widths = [max(map(len, col)) for col in zip(*rows, strict=True)]
+    lines = [
+        "  ".join(c.ljust(w) for c, w in zip(row, widths, strict=True)).rstrip()
+        for row in rows
+    ]
+    succeeded = counted_noun(sum(r.ok for r in results), "host")
+    failed = sum(not r.ok for r in results)
+    lines.append(f"{succeeded} succeeded, {failed} failed")
+    return "\n".join(lines)
+
+
+def get_ssh_targets(ssh: str, /) -> list[str]:
+    """Get the targets of an '--ssh' value: a list, or an '@' inventory file."""
+    if ssh.startswith("@"):
+        lines = read_text(ssh.removeprefix("@")).splitlines()
+        parts = [line.split("#", 1)[0] for line in lines]
+    else:
+        parts = ssh.split(",")
+    targets = list(dict.fromkeys(p.strip() for p in parts if p.strip() != ""))
+    if len(targets) == 0:
+        msg = f"No SSH targets in {ssh!r}"
+        raise ValueError(msg)
+    # only remote work pays for a master connection per host
+    if not is_pytest():
+        _ = enable_ssh_multiplexing()
+    return targets
+
+
+def run_on_ssh_targets(
+    ssh: str,
+    func: Callable[[str], None],
+    /,
+    *,
+    max_workers: int = SSH_MAX_WORKERS,
+    timeout: float | None = SSH_TIMEOUT,
+) -> list[HostResult]:
+    """Run a function against every target of an '--ssh' value concurrently."""
+    targets = get_ssh_targets(ssh)
+    _LOGGER.info("Running against %s...", counted_noun(targets, "host"))
+    _track_children()
+    pairs = concurrent_map(
+        partial(_run_on_target, func, timeout=timeout),
+        targets,
+        parallelism="threads",
+        max_workers=max_workers,
+    )
+    results = [r for r, _ in pairs]
+    _LOGGER.info("Results:\n%s", format_host_results(results))
+    if len(failed := [r.target for r in results if not r.ok]) >= 1:
+        errors = [e for _, e in pairs if e is not None]
+        if (len(targets) == 1) and (len(errors) == 1):
+            raise errors[0]
+        msg = f"Failed on {counted_noun(failed, 'host')}: {failed}"
+        raise RuntimeError(msg) from (errors[0] if len(errors) >= 1 else None)
+    return results
+
+
+##
+
+
+class _TrackedPopen(Popen[Any]):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        if (pids := _CHILDREN.get()) is not None:
+            kwargs["start_new_session"] = True
+        super().__init__(*args, **kwargs)
+        if pids is not None:
+            pids.add(self.pid)
+
+
+def _track_children() -> None:
+    # 'utilities.subprocess.run' takes no 'Popen' options, so swap in one which
+    # starts each process of a target in a session of its own
+    utilities.subprocess.Popen = _TrackedPopen
+
+
+def _run_on_target(
+    func: Callable[[str], None], target: str, /, *, timeout: float | None
+) -> tuple[HostResult, Exception | None]:
+    errors: list[Exception] = []
+    pids: set[int] = set()
+
+    def run_target() -> None:
+        _ = _CHILDREN.set(pids)
+        try:
+            func(target)
+        except Exception as error:  # noqa: BLE001
+            errors.append(error)
+
+    start = perf_counter()
+    thread = Thread(target=run_target, name=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    duration = perf_counter() - start
+    if thread.is_alive():
+        _LOGGER.error("%r timed out after %ss", target, timeout)
+        # a thread cannot be cancelled, so end the process groups it started
+        for pid in pids:
+            _LOGGER.debug("Killing process group %d of %r...", pid, target)
+            with suppress(ProcessLookupError, PermissionError):
+                os.killpg(pid, SIGTERM)
+        thread.join(_KILL_GRACE)
+        error = f"timed out after {timeout}s"
+        return HostResult(target=target, duration=duration, error=error), None
+    if len(errors) >= 1:
+        _LOGGER.error("%r failed: %s", target, errors[0])
+        result = HostResult(target=target, duration=duration, error=repr(errors[0]))
+        return result, errors[0]
+    return HostResult(target=target, duration=duration), None
+
+
+__all__ = [
+    "SSH_MAX_WORKERS",
+    "SSH_TIMEOUT",
+    "HostResult",
+    "format_host_results",
+    "get_ssh_targets",
+    "run_on_ssh_targets",
+]
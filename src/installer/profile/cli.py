@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import ClickException, argument, echo, option
+from utilities.core import is_pytest, set_up_logging
+
+from installer.profile.lib import converge, format_results, load_profile
+
+if TYPE_CHECKING:
+    from utilities.types import PathLike
+
+
+@argument("path", type=utilities.click.Path(exist="existing file"))
+@option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Converge every node, even those whose inputs are unchanged",
+)
+def apply_sub_cmd(*, path: PathLike, force: bool) -> None:
+    if is_pytest():
+        return
+    set_up_logging(__name__, root=True)
+    results = converge(load_profile(path), force=force)
+    echo(format_results(results))
+    if not all(r.ok for r in results):
+        msg = f"Failed to converge {[r.node for r in results if not r.ok]}"
+        raise ClickException(msg)
+
+
+__all__ = ["apply_sub_cmd"]
@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tomllib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from graphlib import CycleError, TopologicalSorter
+from hashlib import file_digest, sha256
+from importlib import import_module
+from inspect import signature
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Literal
+
+from utilities.core import read_text, to_logger
+from utilities.inflect import counted_noun
+
+from installer.apps.constants import INSTALL_MAX_WORKERS, PATH_STATE_DB
+from installer.apps.dpkg import get_installed_packages
+from installer.apps.registry import get_app
+from installer.apps.state import get_converged_digest, set_converged_digest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+    from concurrent.futures import Future
+
+    from utilities.types import PathLike
+
+
+type NodeStatus = Literal["changed", "unchanged", "failed", "blocked"]
+_LOGGER = to_logger(__name__)
+_APPS = "installer.apps.lib"
+_CLONE = "installer.clone.lib"
+_CONFIGS = "installer.configs.lib"
+_NEEDS: dict[str, tuple[str, ...]] = {"app:docker": ("app:curl",)}
+_FILE_KEYS = {"key", "starship_toml"}
+
+
+##
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Node:
+    name: str
+    module: str
+    func: str
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    needs: tuple[str, ...] = ()
+    apt: bool = False
+
+    @property
+    def digest(self) -> str:
+        return self.get_digest(self.state)
+
+    @property
+    def state(self) -> dict[str, Any] | None:
+        """The observed state of what the node converges, or None if remote."""
+        arguments = self.get_arguments()
+        if arguments.get("ssh") is not None:
+            return None
+        if self.name == "apt":
+            installed = set(get_installed_packages(self.args))
+            return {p: p in installed for p in self.args}
+        if self.name.startswith("app:"):
+            cmd = get_app(self.name.removeprefix("app:")).cmd
+            return {"binary": _stat_binary(cmd, arguments.get("path_binaries"))}
+        return {str(p): _hash_file(p) for p in _get_state_paths(self.func, arguments)}
+
+    def get_arguments(self) -> dict[str, Any]:
+        bound = signature(self.load()).bind(*self.args, **self.kwargs)
+        bound.apply_defaults()
+        return bound.arguments
+
+    def get_digest(self, state: Mapping[str, Any] | None, /) -> str:
+        files = {
+            k: _hash_file(v)
+            for k, v in self.kwargs.items()
+            if (k in _FILE_KEYS) and (v is not None)
+        }
+        data = {
+            "func": f"{self.module}:{self.func}",
+            "args": self.args,
+            "kwargs": self.kwargs,
+            "files": files,
+            "state": state,
+        }
+        text = json.dumps(data, sort_keys=True, default=str)
+        return sha256(text.encode()).hexdigest()
+
+    def load(self) -> Callable[..., None]:
+        return getattr(import_module(self.module), self.func)
+
+
+@dataclass(kw_only=True, slots=True)
+class NodeResult:
+    node: str
+    status: NodeStatus
+    duration: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in {"changed", "unchanged"}
+
+
+def load_profile(path: PathLike, /) -> list[Node]:
+    """Load the nodes of a profile file."""
+    data = _expand_user(tomllib.loads(read_text(path)))
+    defaults: dict[str, Any] = data.pop("defaults", {})
+    packages: list[str] = data.pop("apt", [])
+    nodes: list[Node] = []
+    for name, kwargs in data.pop("apps", {}).items():
+        app = get_app(name)
+        nodes.append(
+            _make_node(
+                f"app:{name}",
+                _APPS,
+                app.set_up,
+                defaults,
+                kwargs=kwargs,
+                apt=app.owner is None,
+            )
+        )
+    if (kwargs := data.pop("authorized_keys", None)) is not None:
+        keys = kwargs.pop("keys")
+        nodes.append(
+            _make_node(
+                "authorized-keys",
+                _CONFIGS,
+                "set_up_authorized_keys",
+                defaults,
+                args=(keys,),
+                kwargs=kwargs,
+            )
+        )
+    if (kwargs := data.pop("ssh_config", None)) is not None:
+        nodes.append(
+            _make_node(
+                "ssh-config", _CONFIGS, "set_up_ssh_config", defaults, kwargs=kwargs
+            )
+        )
+    if (kwargs := data.pop("sshd", None)) is not None:
+        nodes.append(
+            _make_node("sshd", _CONFIGS, "set_up_sshd_config", defaults, kwargs=kwargs)
+        )
+    for kwargs in data.pop("clone", []):
+        key, owner, repo = (kwargs.pop(k) for k in ["key", "owner", "repo"])
+        nodes.append(
+            _make_node(
+                f"clone:{owner}/{repo}",
+                _CLONE,
+                "git_clone",
+                defaults,
+                args=(key, owner, repo),
+                kwargs=kwargs,
+                needs=("app:git",),
+            )
+        )
+    if len(data) >= 1:
+        msg = f"Invalid profile sections: {sorted(data)}"
+        raise ValueError(msg)
+    return _add_needs(nodes, defaults, packages=packages)
+
+
+def converge(
+    nodes: Sequence[Node],
+    /,
+    *,
+    max_workers: int = INSTALL_MAX_WORKERS,
+    force: bool = False,
+    state: PathLike = PATH_STATE_DB,
+) -> list[NodeResult]:
+    """Converge a set of nodes, running independent nodes concurrently."""
+    by_name = {n.name: n for n in nodes}
+    sorter = TopologicalSorter({n.name: n.needs for n in nodes})
+    try:
+        sorter.prepare()
+    except CycleError as error:
+        msg = f"Profile has a dependency cycle: {error.args[1]}"
+        raise ValueError(msg) from None
+    _LOGGER.info("Converging %s...", counted_noun(nodes, "node"))
+    results: dict[str, NodeResult] = {}
+    futures: dict[Future[NodeResult], str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while sorter.is_active():
+            for name in sorter.get_ready():
+                node = by_name[name]
+                if failed := [n for n in node.needs if not results[n].ok]:
+                    msg = f"Dependencies failed: {failed}"
+                    results[name] = NodeResult(node=name, status="blocked", error=msg)
+                    sorter.done(name)
+                else:
+                    future = pool.submit(_converge_node, node, force=force, state=state)
+                    futures[future] = name
+            if len(futures) >= 1:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    results[name] = future.result()
+                    sorter.done(name)
+    return [results[n.name] for n in nodes]
+
+
+def format_results(results: Iterable[NodeResult], /) -> str:
+    """Format a set of converge results as a summary."""
+    results = list(results)
+    rows = [("NODE", "STATUS", "TIME")]
+    rows.extend(
+        (
+            r.node,
+            r.status if r.error is None else f"{r.status}: {r.error}",
+            f"{r.duration:.1f}s",
+        )
+        for r in results
+    )
+    widths = [max(map(len, col)) for col in zip(*rows, strict=True)]
+    lines = [
+        "  ".join(c.ljust(w) for c, w in zip(row, widths, strict=True)).rstrip()
+        for row in rows
+    ]
+    counts = {
+        s: sum(r.status == s for r in results)
+        for s in ["changed", "unchanged", "failed", "blocked"]
+    }
+    lines.append(", ".join(f"{n} {s}" for s, n in counts.items()))
+    return "\n".join(lines)
+
+
+##
+
+
+def _make_node(
+    name: str,
+    module: str,
+    func: str,
+    defaults: Mapping[str, Any],
+    /,
+    *,
+    args: tuple[Any, ...] = (),
+    kwargs: Mapping[str, Any] | None = None,
+    needs: tuple[str, ...] = (),
+    apt: bool = False,
+) -> Node:
+    sig = signature(getattr(import_module(module), func))
+    kwargs = {
+        **{k: v for k, v in defaults.items() if k in sig.parameters},
+        **({} if kwargs is None else kwargs),
+    }
+    try:
+        _ = sig.bind(*args, **kwargs)
+    except TypeError as error:
+        msg = f"Invalid options for {name!r}: {error}"
+        raise ValueError(msg) from None
+    return Node(
+        name=name,
+        module=module,
+        func=func,
+        args=args,
+        kwargs=kwargs,
+        needs=(*needs, *_NEEDS.get(name, ())),
+        apt=apt,
+    )
+
+
+def _add_needs(
+    nodes: Sequence[Node],
+    defaults: Mapping[str, Any],
+    /,
+    *,
+    packages: Sequence[str] = (),
+) -> list[Node]:
+    missing = {d for n in nodes for d in n.needs} - {n.name for n in nodes}
+    extra = [
+        _make_node(
+            name,
+            _APPS,
+            (app := get_app(name.removeprefix("app:"))).set_up,
+            defaults,
+            apt=app.owner is None,
+        )
+        for name in sorted(missing)
+    ]
+    nodes = [*extra, *nodes]
+    # the packages of 'apt'-backed apps are installed up front in one transaction
+    packages = list(
+        dict.fromkeys([
+            *packages,
+            *(
+                p
+                for n in nodes
+                if n.name.startswith("app:")
+                for p in get_app(n.name.removeprefix("app:")).packages
+            ),
+        ])
+    )
+    if len(packages) >= 1:
+        nodes = [
+            _make_node(
+                "apt",
+                _APPS,
+                "set_up_apt_package",
+                defaults,
+                args=tuple(packages),
+                apt=True,
+            ),
+            *nodes,
+        ]
+    # 'apt' nodes contend for the dpkg lock, so chain them in declaration order
+    apt = [n.name for n in nodes if n.apt]
+    previous = dict(zip(apt[1:], apt, strict=False))
+    return [
+        replace(n, needs=(*n.needs, previous[n.name])) if n.name in previous else n
+        for n in nodes
+    ]
+
+
+def _converge_node(node: Node, /, *, force: bool, state: PathLike) -> NodeResult:
+    start = perf_counter()
+    try:
+        # the digest only vouches for a step whose outcome is still observed in place
+        observed = node.state
+        if (
+            (not force)
+            and _is_satisfied(observed)
+            and (
+                get_converged_digest(node.name, path=state) == node.get_digest(observed)
+            )
+        ):
+            _LOGGER.info("%r is unchanged", node.name)
+            return NodeResult(node=node.name, status="unchanged")
+        _LOGGER.info("Converging %r...", node.name)
+        node.load()(*node.args, **node.kwargs)
+        set_converged_digest(node.name, node.digest, path=state)
+    except Exception as error:
+        _LOGGER.exception("Failed to converge %r", node.name)
+        return NodeResult(
+            node=node.name,
+            status="failed",
+            duration=perf_counter() - start,
+            error=repr(error),
+        )
+    return NodeResult(node=node.name, status="changed", duration=perf_counter() - start)
+
+
+def _expand_user(obj: Any, /) -> Any:
+    match obj:
+        case str() if obj.startswith("~"):
+            return str(Path(obj).expanduser())
+        case list():
+            return [_expand_user(o) for o in obj]
+        case dict():
+            return {k: _expand_user(v) for k, v in obj.items()}
+        case _:
+            return obj
+
+
+def _get_state_paths(func: str, arguments: Mapping[str, Any], /) -> list[Path]:
+    match func:
+        case "set_up_authorized_keys":
+            return [Path(arguments["home"], ".ssh/authorized_keys")]
+        case "set_up_ssh_config":
+            return [Path(arguments["home"], ".ssh/config")]
+        case "set_up_sshd_config":
+            return [Path(arguments["root"], "etc/ssh/sshd_config.d/default.conf")]
+        case "git_clone":
+            return [Path(arguments["dest"], ".git/HEAD")]
+        case _:
+            return []
+
+
+def _is_satisfied(state: Mapping[str, Any] | None, /) -> bool:
+    return (state is not None) and all(
+        (v is not None) and (v is not False) for v in state.values()
+    )
+
+
+def _stat_binary(
+    cmd: str, path_binaries: PathLike | None, /
+) -> tuple[str, int, int] | None:
+    if (path_binaries is not None) and (path := Path(path_binaries, cmd)).is_file():
+        which = str(path)
+    elif (which := shutil.which(cmd)) is None:
+        return None
+    stat = Path(which).stat()
+    return which, stat.st_size, stat.st_mtime_ns
+
+
+def _hash_file(path: PathLike, /) -> str | None:
+    try:
+        with Path(path).open(mode="rb") as fh:
+            return file_digest(fh, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+__all__ = ["Node", "NodeResult", "converge", "format_results", "load_profile"]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from shlex import join
+from tempfile import mkdtemp
+from typing import TYPE_CHECKING
+
+from utilities.core import get_env, to_logger
+from utilities.subprocess import RunError, run
+
+if TYPE_CHECKING:
+    from collections.abc import MutableMapping
+
+    from utilities.types import PathLike
+
+
+SSH_CONTROL_DIR_ENV = "INSTALLER_SSH_CONTROL_DIR"
+SSH_CONTROL_PERSIST = get_env(
+    "INSTALLER_SSH_CONTROL_PERSIST", default="60", transform=int
+)
+_LOGGER = to_logger(__name__)
+# '$TMPDIR' is too deep on macOS for a socket path
+_CONTROL_BASE = Path("/tmp")  # noqa: S108
+# 'sun_path' is 104 bytes on macOS; '%C' is 40 characters & 'ssh' appends a
+# 17-character suffix to the master's temporary socket
+_SUN_PATH_MAX = 104
+_CONTROL_NAME_LEN = 1 + 40 + 17
+
+
+##
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SSHMultiplexer:
+    ssh: Path
+    path: Path
+
+    @property
+    def bin(self) -> Path:
+        return self.path / "bin"
+
+    @property
+    def control(self) -> Path:
+        return self.path / "control"
+
+    def close(self) -> None:
+        for socket in self.control.glob("*"):
+            _LOGGER.debug("Closing SSH master %r...", str(socket))
+            with contextlib.suppress(RunError):
+                _ = run(
+                    str(self.ssh),
+                    "-o",
+                    f"ControlPath={socket}",
+                    "-O",
+                    "exit",
+                    "installer",
+                    return_=True,
+                )
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def enable_ssh_multiplexing(
+    *,
+    persist: int = SSH_CONTROL_PERSIST,
+    env: MutableMapping[str, str] | None = None,
+    base: PathLike = _CONTROL_BASE,
+) -> SSHMultiplexer | None:
+    """Route every 'ssh' call of this process through one master per host."""
+    env = os.environ if env is None else env
+    if SSH_CONTROL_DIR_ENV in env:
+        return None
+    if (ssh := shutil.which("ssh", path=env.get("PATH"))) is None:
+        return None
+    mux = SSHMultiplexer(
+        ssh=Path(ssh), path=Path(mkdtemp(prefix="installer-ssh-", dir=base))
+    )
+    if len(os.fsencode(mux.control)) + _CONTROL_NAME_LEN >= _SUN_PATH_MAX:
+        _LOGGER.warning(
+            "%r is too long for an SSH control socket; not multiplexing",
+            str(mux.control),
+        )
+        shutil.rmtree(mux.path, ignore_errors=True)
+        return None
+    mux.bin.mkdir()
+    mux.control.mkdir(mode=0o700)
+    wrapper = mux.bin / "ssh"
+    args = join([
+        ssh,
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={mux.control}/%C",
+        "-o",
+        f"ControlPersist={persist}",
+    ])
+    _ = wrapper.write_text(f'#!/bin/sh\nexec {args} "$@"\n')
+    wrapper.chmod(0o755)
+    env["PATH"] = os.pathsep.join([str(mux.bin), env.get("PATH", os.defpath)])
+    env[SSH_CONTROL_DIR_ENV] = str(mux.control)
+    _ = atexit.register(mux.close)
+    return mux
+
+
+__all__ = [
+    "SSH_CONTROL_DIR_ENV",
+    "SSH_CONTROL_PERSIST",
+    "SSHMultiplexer",
+    "enable_ssh_multiplexing",
+]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import re
 import shutil
 from pathlib import Path
-from shlex import join
+from shlex import join, quote
+from threading import Lock
 from typing import TYPE_CHECKING, assert_never
 
 import utilities.subprocess
@@ -18,7 +20,13 @@ from utilities.core import (
     write_text,
 )
 from utilities.pydantic import extract_secret
-from utilities.subprocess import BASH_LS, uv_tool_run_cmd
+from utilities.subprocess import BASH_LS, MANAGED_PYTHON
+
+from installer import __version__
+from installer.apps.inventory import probe_inventory
+from installer.apps.registry import APPS
+from installer.apps.state import is_up_to_date, yield_recorded_install
+from installer.fleet import run_on_ssh_targets
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -34,6 +42,13 @@ if TYPE_CHECKING:
 
 
 _LOGGER = to_logger(__name__)
+_REMOTE_ROOT = "$HOME/.local/share/installer"
+_EOF = "INSTALLER_EOF"
+_PACKAGE = "dycw-installer[cli]"
+_RELEASE_VERSION = re.compile(r"^\d+(\.\d+)*$")
+_LOCK_TRIES = 300
+_PATH_LOCKS: dict[Path, Lock] = {}
+_PATH_LOCKS_LOCK = Lock()
 
 
 ##
@@ -49,14 +64,99 @@ def ensure_line_or_lines(
     group: str | int | None = None,
 ) -> None:
     text = normalize_str("\n".join(always_iterable(line_or_lines)))
-    try:
-        contents = read_text(path)
-    except ReadTextError:
-        write_text(path, text, perms=perms, owner=owner, group=group)
-        return
-    if text not in contents:
-        with Path(path).open(mode="a") as fh:
-            _ = fh.write(f"\n\n{text}")
+    with get_path_lock(path):
+        try:
+            contents = read_text(path)
+        except ReadTextError:
+            write_text(path, text, perms=perms, owner=owner, group=group)
+            return
+        if text not in contents:
+            with Path(path).open(mode="a") as fh:
+                _ = fh.write(f"\n\n{text}")
+
+
+def get_path_lock(path: PathLike, /) -> Lock:
+    """Get the lock guarding writes to a path within this process."""
+    with _PATH_LOCKS_LOCK:
+        return _PATH_LOCKS.setdefault(Path(path).resolve(), Lock())
+
+
+##
+
+
+def installer_cli_script(
+    *args: str, version: str = __version__, stdin: str | None = None
+) -> str:
+    """Script to run the installer CLI at a version, installing it if missing."""
+    if _RELEASE_VERSION.search(version):
+        pinned = quote(f"{_PACKAGE}=={version}")
+        install = normalize_str(f"""
+root="$base/{version}"
+if ! [ -f "$root/.installed" ]; then
+    lock
+    if ! [ -f "$root/.installed" ]; then
+        install "$root" {pinned}
+        if [ "$installed" != {quote(version)} ]; then
+            echo "Installed 'dycw-installer' $installed, not {version}" >&2
+            exit 1
+        fi
+        touch "$root/.installed"
+    fi
+    unlock
+fi
+""")
+    else:
+        # a development version runs the latest release, keyed by its own version
+        install = normalize_str(f"""
+echo "'dycw-installer' {version} is unreleased; using the latest release" >&2
+lock
+install "$base/.latest" {quote(_PACKAGE)}
+root="$base/$installed"
+if ! [ -f "$root/.installed" ]; then
+    rm -rf "$root"
+    touch "$base/.latest/.installed"
+    mv "$base/.latest" "$root"
+fi
+rm -rf "$base/.latest"
+unlock
+""")
+    heredoc = "" if stdin is None else f" <<'{_EOF}'\n{normalize_str(stdin)}{_EOF}"
+    # 'mkdir' is an atomic lock on every platform, unlike 'flock'
+    return normalize_str(f"""
+set -e
+base="{_REMOTE_ROOT}"
+lock() {{
+    mkdir -p "$base"
+    tries=0
+    until mkdir "$base/.lock" 2>/dev/null; do
+        tries=$((tries + 1))
+        if [ "$tries" -ge {_LOCK_TRIES} ]; then
+            echo "Timed out waiting for $base/.lock" >&2
+            exit 1
+        fi
+        sleep 1
+    done
+    trap 'rmdir "$base/.lock"' EXIT
+}}
+unlock() {{
+    rmdir "$base/.lock"
+    trap - EXIT
+}}
+install() {{
+    rm -rf "$1"
+    uv venv --quiet --relocatable {MANAGED_PYTHON} "$1"
+    if ! uv pip install --quiet --python "$1/bin/python" "$2"; then
+        echo "Unable to install '$2'" >&2
+        exit 1
+    fi
+    installed=$(uv pip show --python "$1/bin/python" dycw-installer | sed -n 's/^Version: //p')
+    if [ -z "$installed" ]; then
+        echo "Unable to read the installed version of '$2'" >&2
+        exit 1
+    fi
+}}
+{install}exec "$root/bin/cli" {join(args)}{heredoc}
+""")
 
 
 ##
@@ -75,24 +175,39 @@ def set_up_local_or_ssh(
         case None:
             if (shutil.which(cmd) is None) or force:
                 _LOGGER.info("Setting up %r...", cmd)
-                set_up_local()
+                with yield_recorded_install(cmd):
+                    set_up_local()
             else:
                 _LOGGER.info("%r is already set up", cmd)
         case str():
-            ssh_user, ssh_hostname = split_ssh(ssh)
-            _LOGGER.info("Setting up %r on %r...", cmd, ssh_hostname)
-            utilities.subprocess.ssh(
-                ssh_user,
-                ssh_hostname,
-                *BASH_LS,
-                input=normalize_str("\n".join(map(join, cmds))),
-                retry=retry,
-                logger=_LOGGER,
-            )
+
+            def set_up_remote(target: str, /) -> None:
+                hostname = split_ssh(target)[1]
+                if (not force) and _is_on_remote_path(cmd, target, retry=retry):
+                    _LOGGER.info("%r is already set up on %r", cmd, hostname)
+                    return
+                _LOGGER.info("Setting up %r on %r...", cmd, hostname)
+                run_cmds_over_ssh(target, *cmds, retry=retry)
+
+            _ = run_on_ssh_targets(ssh, set_up_remote)
         case never:
             assert_never(never)
 
 
+def run_cmds_over_ssh(
+    ssh: str, /, *cmds: SequenceStr, retry: Retry | None = None
+) -> None:
+    ssh_user, ssh_hostname = split_ssh(ssh)
+    utilities.subprocess.ssh(
+        ssh_user,
+        ssh_hostname,
+        *BASH_LS,
+        input=normalize_str("\n".join(map(join, cmds))),
+        retry=retry,
+        logger=_LOGGER,
+    )
+
+
 ##
 
 
@@ -103,6 +218,7 @@ def set_up_local_or_ssh_installer_cli(
     *,
     ssh: str | None = None,
     force: bool = False,
+    latest: bool = False,
     etc: bool = False,
     group: str | int | None = None,
     home: PathLike | None = None,
@@ -123,17 +239,21 @@ def set_up_local_or_ssh_installer_cli(
         case None:
             if (shutil.which(cmd) is None) or force:
                 _LOGGER.info("Setting up %r...", cmd)
-                set_up_local()
+            elif latest and not is_up_to_date(cmd, token=token):
+                _LOGGER.info("Upgrading %r...", cmd)
             else:
                 _LOGGER.info("%r is already set up", cmd)
+                return
+            with yield_recorded_install(cmd):
+                set_up_local()
         case str():
-            ssh_user, ssh_hostname = split_ssh(ssh)
-            _LOGGER.info("Setting up %r on %r...", cmd, ssh_hostname)
             args: list[str] = []
             if etc:
                 args.append("--etc")
             if force:
                 args.append("--force")
+            if latest:
+                args.append("--latest")
             if group is not None:
                 args.extend(["--group", str(group)])
             if home is not None:
@@ -160,15 +280,27 @@ def set_up_local_or_ssh_installer_cli(
                 args.extend(["--token", extract_secret(token)])
             if user is not None:
                 args.extend(["--user", user])
-            utilities.subprocess.ssh(
-                ssh_user,
-                ssh_hostname,
-                *uv_tool_run_cmd(
-                    "cli", cmd, *args, from_="dycw-installer[cli]", latest=True
-                ),
-                retry=retry,
-                logger=_LOGGER,
-            )
+
+            def set_up_remote(target: str, /) -> None:
+                ssh_user, ssh_hostname = split_ssh(target)
+                if (
+                    (not force)
+                    and (not latest)
+                    and _is_on_remote_path(cmd, target, retry=retry)
+                ):
+                    _LOGGER.info("%r is already set up on %r", cmd, ssh_hostname)
+                    return
+                _LOGGER.info("Setting up %r on %r...", cmd, ssh_hostname)
+                utilities.subprocess.ssh(
+                    ssh_user,
+                    ssh_hostname,
+                    *BASH_LS,
+                    input=installer_cli_script(cmd, *args),
+                    retry=retry,
+                    logger=_LOGGER,
+                )
+
+            _ = run_on_ssh_targets(ssh, set_up_remote)
         case never:
             assert_never(never)
 
@@ -239,12 +371,30 @@ def ssh_uv_install(
     utilities.subprocess.ssh(
         ssh_user,
         ssh_hostname,
-        *uv_tool_run_cmd(
-            "cli", cmd, *parts, *args, from_="dycw-installer[cli]", latest=True
-        ),
+        *BASH_LS,
+        input=installer_cli_script(cmd, *parts, *args),
         retry=retry,
         logger=_LOGGER,
     )
 
 
-__all__ = ["ensure_line_or_lines", "set_up_local_or_ssh", "split_ssh", "ssh_uv_install"]
+##
+
+
+def _is_on_remote_path(cmd: str, target: str, /, *, retry: Retry | None = None) -> bool:
+    if len(apps := [a for a in APPS if a.cmd == cmd]) == 0:
+        return False
+    ssh_user, ssh_hostname = split_ssh(target)
+    inventory = probe_inventory(ssh_user, ssh_hostname, apps=apps, retry=retry)
+    return cmd in inventory.apps
+
+
+__all__ = [
+    "ensure_line_or_lines",
+    "get_path_lock",
+    "installer_cli_script",
+    "run_cmds_over_ssh",
+    "set_up_local_or_ssh",
+    "split_ssh",
+    "ssh_uv_install",
+]
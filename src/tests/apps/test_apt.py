@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from os import utime
+from time import time
+from typing import TYPE_CHECKING
+
+from pytest import fixture, mark, param
+from utilities.subprocess import run
+
+import installer.apps.apt
+from installer.apps.apt import apt_install, apt_update_cmd, is_apt_lists_fresh
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+@fixture
+def stamps(*, tmp_path: Path) -> tuple[Path, Path]:
+    return tmp_path / "update-success-stamp", tmp_path / "pkgcache.bin"
+
+
+@fixture
+def sources(*, tmp_path: Path) -> Path:
+    path = tmp_path / "apt"
+    (path / "sources.list.d").mkdir(parents=True)
+    _ = (path / "sources.list").write_text("")
+    for path_i in [path / "sources.list", path / "sources.list.d"]:
+        _set_mtime(path_i, time() - 7200)
+    return path
+
+
+def _set_mtime(path: Path, mtime: float, /) -> None:
+    path.touch()
+    utime(path, (mtime, mtime))
+
+
+class TestIsAptListsFresh:
+    @mark.parametrize(
+        ("age", "expected"), [param(60, True), param(7200, False)], ids=str
+    )
+    def test_age(
+        self, *, stamps: tuple[Path, Path], sources: Path, age: int, expected: bool
+    ) -> None:
+        _set_mtime(stamps[0], time() - age)
+        result = is_apt_lists_fresh(ttl=3600, stamps=stamps, sources=sources)
+        assert result is expected
+
+    def test_fallback(self, *, stamps: tuple[Path, Path], sources: Path) -> None:
+        _set_mtime(stamps[1], time() - 60)
+        assert is_apt_lists_fresh(ttl=3600, stamps=stamps, sources=sources)
+
+    def test_first_stamp_wins(
+        self, *, stamps: tuple[Path, Path], sources: Path
+    ) -> None:
+        _set_mtime(stamps[0], time() - 7200)
+        _set_mtime(stamps[1], time() - 60)
+        assert not is_apt_lists_fresh(ttl=3600, stamps=stamps, sources=sources)
+
+    def test_source_changed(self, *, stamps: tuple[Path, Path], sources: Path) -> None:
+        _set_mtime(stamps[0], time() - 60)
+        _ = (sources / "sources.list.d" / "docker.sources").write_text("")
+        assert not is_apt_lists_fresh(ttl=3600, stamps=stamps, sources=sources)
+
+    def test_missing(self, *, stamps: tuple[Path, Path], sources: Path) -> None:
+        assert not is_apt_lists_fresh(ttl=3600, stamps=stamps, sources=sources)
+
+
+class TestAptUpdateCmd:
+    @mark.parametrize(
+        ("ttl", "stamp", "age", "source_changed", "expected"),
+        [
+            param(3600, 0, 60, False, False),
+            param(3600, 0, 7200, False, True),
+            param(3600, 0, 60, True, True),
+            param(30, 0, 0, False, False),
+            param(3600, 1, 60, False, False),
+            param(3600, None, 0, False, True),
+        ],
+    )
+    def test_main(
+        self,
+        *,
+        tmp_path: Path,
+        stamps: tuple[Path, Path],
+        sources: Path,
+        monkeypatch: MonkeyPatch,
+        ttl: int,
+        stamp: int | None,
+        age: int,
+        source_changed: bool,
+        expected: bool,
+    ) -> None:
+        bin_ = tmp_path / "bin"
+        bin_.mkdir()
+        apt = bin_ / "apt"
+        _ = apt.write_text(f"#!/bin/sh\ntouch {tmp_path / 'updated'}\n")
+        apt.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_}:/usr/bin:/bin")
+        if stamp is not None:
+            _set_mtime(stamps[stamp], time() - age)
+        if source_changed:
+            _ = (sources / "sources.list.d" / "docker.sources").write_text("")
+        _ = run(*apt_update_cmd(ttl=ttl, stamps=stamps, sources=sources), return_=True)
+        assert (tmp_path / "updated").exists() is expected
+
+
+class TestAptInstall:
+    def test_nothing_missing(self, *, monkeypatch: MonkeyPatch) -> None:
+        calls: list[tuple[str, ...]] = []
+
+        def run(*args: str, **_: object) -> None:
+            calls.append(args)
+
+        def get_missing_packages(*_: object, **__: object) -> list[str]:
+            return []
+
+        monkeypatch.setattr(installer.apps.apt, "run", run)
+        monkeypatch.setattr(
+            installer.apps.apt, "get_missing_packages", get_missing_packages
+        )
+        apt_install("curl", "git")
+        assert calls == []
+        apt_install("curl", "git", force=True, ttl=0)
+        assert calls == [
+            ("apt", "update", "-y"),
+            ("apt", "install", "-y", "curl", "git"),
+        ]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from os import utime
+from typing import TYPE_CHECKING
+
+from installer.apps.cache import (
+    evict_asset_cache,
+    get_asset_cache_path,
+    get_cached_asset,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestEvictAssetCache:
+    def test_main(self, *, tmp_path: Path) -> None:
+        paths = [tmp_path / f"owner/repo/tag/1/asset{i}" for i in range(3)]
+        for i, path in enumerate(paths):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _ = path.write_bytes(b"x" * 10)
+            utime(path, (i, i))
+        result = evict_asset_cache(root=tmp_path, max_size=20)
+        assert result == [paths[0]]
+        assert not paths[0].exists()
+        assert paths[1].exists()
+        assert paths[2].exists()
+
+    def test_keep(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "owner/repo/tag/1/asset"
+        path.parent.mkdir(parents=True)
+        _ = path.write_bytes(b"x" * 10)
+        result = evict_asset_cache(root=tmp_path, max_size=0, keep=path)
+        assert result == []
+        assert path.exists()
+
+    def test_remove_empty_parents(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "owner/repo/tag/1/asset"
+        path.parent.mkdir(parents=True)
+        _ = path.write_bytes(b"x")
+        _ = evict_asset_cache(root=tmp_path, max_size=0)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_missing_root(self, *, tmp_path: Path) -> None:
+        assert evict_asset_cache(root=tmp_path / "missing") == []
+
+
+class TestGetAssetCachePath:
+    def test_size(self, *, tmp_path: Path) -> None:
+        result = get_asset_cache_path(
+            "owner", "repo", "tag", "asset", size=123, root=tmp_path
+        )
+        assert result == tmp_path / "owner/repo/tag/123/asset"
+
+    def test_digest(self, *, tmp_path: Path) -> None:
+        result = get_asset_cache_path(
+            "owner",
+            "repo",
+            "tag",
+            "asset",
+            size=123,
+            digest="sha256:abc",
+            root=tmp_path,
+        )
+        assert result == tmp_path / "owner/repo/tag/sha256-abc/asset"
+
+
+class TestGetCachedAsset:
+    def test_hit(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "asset"
+        _ = path.write_bytes(b"abc")
+        utime(path, (0, 0))
+        assert get_cached_asset(path, size=3) == path
+        assert path.stat().st_mtime > 0
+
+    def test_miss(self, *, tmp_path: Path) -> None:
+        assert get_cached_asset(tmp_path / "asset", size=3) is None
+
+    def test_size_mismatch(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "asset"
+        _ = path.write_bytes(b"abc")
+        assert get_cached_asset(path, size=4) is None
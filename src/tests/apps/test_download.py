@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+from bz2 import compress as compress_bz2
+from functools import partial
+from gzip import compress as compress_gzip
+from hashlib import sha256
+from io import BytesIO
+from lzma import compress as compress_lzma
+from os import urandom
+from tarfile import TarFile, TarInfo
+from typing import TYPE_CHECKING
+
+from pytest import mark, param, raises
+
+import installer.apps.download
+from installer.apps.cache import evict_asset_cache, get_asset_cache_path
+from installer.apps.download import (
+    ResolvedAsset,
+    _decompress_bz2,
+    _decompress_gzip,
+    _decompress_lzma,
+    _download_asset,
+    _get_part_paths,
+    _probe_ranges,
+    _write_checkpoint,
+    _yield_extracted_asset,
+    extract_asset,
+    yield_extracted_assets,
+)
+from installer.apps.github import GitHubAsset, GitHubRelease
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+    from typing import BinaryIO
+
+    from pytest import MonkeyPatch
+
+    from tests.conftest import HTTPServer
+
+
+def _make_tar(files: dict[str, bytes], /) -> bytes:
+    buffer = BytesIO()
+    with TarFile(fileobj=buffer, mode="w") as tf:
+        for name, data in files.items():
+            info = TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, BytesIO(data))
+    return buffer.getvalue()
+
+
+def _serve(
+    http_server: HTTPServer, name: str, data: bytes, /
+) -> tuple[GitHubRelease, GitHubAsset]:
+    http_server.files[f"/{name}"] = data
+    asset = GitHubAsset(
+        name=name,
+        size=len(data),
+        browser_download_url=f"{http_server.url}/{name}",
+        digest=f"sha256:{sha256(data).hexdigest()}",
+    )
+    return GitHubRelease(tag_name="v1", assets=[asset]), asset
+
+
+class TestExtractAsset:
+    def test_main(
+        self, *, http_server: HTTPServer, tmp_path: Path, monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            installer.apps.download,
+            "get_asset_cache_path",
+            partial(get_asset_cache_path, root=tmp_path),
+        )
+        data = compress_gzip(_make_tar({"binary": b"contents"}))
+        release, asset = _serve(http_server, "asset.tar.gz", data)
+        resolved = ResolvedAsset(
+            owner="owner", repo="repo", release=release, asset=asset, decompress="gzip"
+        )
+        with yield_extracted_assets() as root:
+            extract_asset(resolved, root, token=None)
+            extract_asset(resolved, root, token=None)
+            with _yield_extracted_asset(
+                "owner", "repo", release, asset, _decompress_gzip, token=None
+            ) as result:
+                assert result.is_relative_to(root)
+                assert result.read_bytes() == b"contents"
+        assert len(http_server.requests) == 1
+        assert not root.exists()
+
+
+class TestDownloadAsset:
+    def test_ranges(self, *, http_server: HTTPServer, tmp_path: Path) -> None:
+        data = urandom(1000)
+        _, asset = _serve(http_server, "asset", data)
+        dest = tmp_path / "asset"
+        ranged = _probe_ranges(asset, token=None, connections=4, min_part_size=100)
+        _download_asset(asset, dest, token=None, ranged=ranged)
+        assert dest.read_bytes() == data
+        methods = [m for m, _, _ in http_server.requests]
+        assert methods == ["HEAD", "GET", "GET", "GET", "GET"]
+        ranges = sorted(h["Range"] for m, _, h in http_server.requests if m == "GET")
+        assert ranges == [
+            "bytes=0-249",
+            "bytes=250-499",
+            "bytes=500-749",
+            "bytes=750-999",
+        ]
+
+    def test_single_stream(self, *, http_server: HTTPServer, tmp_path: Path) -> None:
+        data = urandom(1000)
+        _, asset = _serve(http_server, "asset", data)
+        dest = tmp_path / "asset"
+        ranged = _probe_ranges(asset, token=None, connections=4, min_part_size=600)
+        assert ranged is None
+        _download_asset(asset, dest, token=None)
+        assert dest.read_bytes() == data
+        ((method, _, headers),) = http_server.requests
+        assert method == "GET"
+        assert "Range" not in headers
+
+    def test_ranges_invalid_digest(
+        self, *, http_server: HTTPServer, tmp_path: Path
+    ) -> None:
+        _, asset = _serve(http_server, "asset", urandom(1000))
+        asset.digest = "sha256:0"
+        ranged = _probe_ranges(asset, token=None, connections=4, min_part_size=100)
+        with raises(ValueError, match=r"Invalid digest for 'asset'"):
+            _download_asset(asset, tmp_path / "asset", token=None, ranged=ranged)
+
+    def test_ranges_interrupted(
+        self, *, http_server: HTTPServer, tmp_path: Path
+    ) -> None:
+        data = urandom(1000)
+        _, asset = _serve(http_server, "asset", data)
+        http_server.fail_after["/asset"] = 100
+        dest = tmp_path / "asset"
+        ranged = _probe_ranges(asset, token=None, connections=4, min_part_size=100)
+        _download_asset(asset, dest, token=None, ranged=ranged)
+        assert dest.read_bytes() == data
+        assert sum(m == "GET" for m, _, _ in http_server.requests) == 5
+
+    def test_interrupted(self, *, http_server: HTTPServer, tmp_path: Path) -> None:
+        data = urandom(100_000)
+        _, asset = _serve(http_server, "asset", data)
+        http_server.fail_after["/asset"] = 50_000
+        dest = tmp_path / "asset"
+        _download_asset(asset, dest, token=None)
+        assert dest.read_bytes() == data
+        (_, _, headers1), (_, _, headers2) = http_server.requests
+        assert "Range" not in headers1
+        offset = int(headers2["Range"].removeprefix("bytes=").removesuffix("-"))
+        assert 0 < offset <= 50_000
+        assert headers2["If-Range"] == f'"{sha256(data).hexdigest()}"'
+
+    def test_resume(self, *, http_server: HTTPServer, tmp_path: Path) -> None:
+        data = urandom(1000)
+        _, asset = _serve(http_server, "asset", data)
+        dest = tmp_path / "asset"
+        part, checkpoint = _get_part_paths(dest)
+        _ = part.write_bytes(data[:300])
+        _write_checkpoint(checkpoint, asset, etag=f'"{sha256(data).hexdigest()}"')
+        _download_asset(asset, dest, token=None)
+        assert dest.read_bytes() == data
+        assert not part.exists()
+        assert not checkpoint.exists()
+        ((_, _, headers),) = http_server.requests
+        assert headers["Range"] == "bytes=300-"
+
+    def test_resume_changed(self, *, http_server: HTTPServer, tmp_path: Path) -> None:
+        data = urandom(1000)
+        _, asset = _serve(http_server, "asset", data)
+        dest = tmp_path / "asset"
+        part, checkpoint = _get_part_paths(dest)
+        _ = part.write_bytes(urandom(300))
+        _write_checkpoint(checkpoint, asset, etag='"stale"')
+        _download_asset(asset, dest, token=None)
+        assert dest.read_bytes() == data
+
+
+class TestYieldExtractedAsset:
+    @mark.parametrize(
+        ("compress", "decompress", "suffix"),
+        [
+            param(compress_bz2, _decompress_bz2, "tar.bz2"),
+            param(compress_gzip, _decompress_gzip, "tar.gz"),
+            param(compress_lzma, _decompress_lzma, "tar.xz"),
+        ],
+    )
+    def test_single_file(
+        self,
+        *,
+        http_server: HTTPServer,
+        compress: Callable[[bytes], bytes],
+        decompress: Callable[[BinaryIO], BinaryIO],
+        suffix: str,
+    ) -> None:
+        data = compress(_make_tar({"binary": b"contents"}))
+        release, asset = _serve(http_server, f"asset.{suffix}", data)
+        with _yield_extracted_asset(
+            "owner", "repo", release, asset, decompress, token=None, cache=False
+        ) as result:
+            assert result.name == "binary"
+            assert result.read_bytes() == b"contents"
+        assert not result.exists()
+
+    def test_multiple_files(self, *, http_server: HTTPServer) -> None:
+        data = compress_gzip(_make_tar({"a": b"a", "b": b"b"}))
+        release, asset = _serve(http_server, "asset.tar.gz", data)
+        with _yield_extracted_asset(
+            "owner", "repo", release, asset, _decompress_gzip, token=None, cache=False
+        ) as result:
+            assert result.is_dir()
+            assert {p.name for p in result.iterdir()} == {"a", "b"}
+
+    def test_not_a_tar(self, *, http_server: HTTPServer) -> None:
+        data = compress_bz2(b"binary contents")
+        release, asset = _serve(http_server, "restic_linux_amd64.bz2", data)
+        with _yield_extracted_asset(
+            "owner", "repo", release, asset, _decompress_bz2, token=None, cache=False
+        ) as result:
+            assert result.name == "restic_linux_amd64"
+            assert result.read_bytes() == b"binary contents"
+
+    def test_cache(
+        self, *, http_server: HTTPServer, tmp_path: Path, monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            installer.apps.download,
+            "get_asset_cache_path",
+            partial(get_asset_cache_path, root=tmp_path),
+        )
+        monkeypatch.setattr(
+            installer.apps.download,
+            "evict_asset_cache",
+            partial(evict_asset_cache, root=tmp_path),
+        )
+        data = compress_gzip(_make_tar({"binary": b"contents"}))
+        release, asset = _serve(http_server, "asset.tar.gz", data)
+        for _ in range(2):
+            with _yield_extracted_asset(
+                "owner", "repo", release, asset, _decompress_gzip, token=None
+            ) as result:
+                assert result.read_bytes() == b"contents"
+        assert len(http_server.requests) == 1
+        (cached,) = (p for p in tmp_path.rglob("*") if p.is_file())
+        assert cached.read_bytes() == data
+
+    def test_ranges(self, *, http_server: HTTPServer) -> None:
+        data = compress_gzip(_make_tar({"binary": urandom(1000)}), compresslevel=0)
+        release, asset = _serve(http_server, "asset.tar.gz", data)
+        with _yield_extracted_asset(
+            "owner",
+            "repo",
+            release,
+            asset,
+            _decompress_gzip,
+            token=None,
+            cache=False,
+            min_part_size=len(data) // 2,
+        ) as result:
+            assert result.name == "binary"
+        assert sum(m == "GET" for m, _, _ in http_server.requests) == 2
+
+    def test_interrupted(self, *, http_server: HTTPServer) -> None:
+        data = compress_gzip(_make_tar({"binary": urandom(1000)}), compresslevel=0)
+        release, asset = _serve(http_server, "asset.tar.gz", data)
+        http_server.fail_after["/asset.tar.gz"] = len(data) // 2
+        with _yield_extracted_asset(
+            "owner", "repo", release, asset, _decompress_gzip, token=None, cache=False
+        ) as result:
+            assert result.name == "binary"
+        assert len(http_server.requests) == 2
+
+    def test_invalid_digest(self, *, http_server: HTTPServer) -> None:
+        data = compress_gzip(_make_tar({"binary": b"contents"}))
+        release, asset = _serve(http_server, "asset.tar.gz", data)
+        asset.digest = "sha256:0"
+        with (
+            raises(ValueError, match=r"Invalid digest for 'asset\.tar\.gz'"),
+            _yield_extracted_asset(
+                "owner",
+                "repo",
+                release,
+                asset,
+                _decompress_gzip,
+                token=None,
+                cache=False,
+            ),
+        ):
+            ...
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest import fixture
+
+from installer.apps.dpkg import (
+    get_dpkg_index,
+    get_installed_packages,
+    get_missing_packages,
+    parse_dpkg_status,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+_STATUS = """\
+Package: curl
+Status: install ok installed
+Architecture: amd64
+Version: 7.88.1-10
+Description: command line tool for transferring data with URL syntax
+ curl is a command line tool for transferring data with URL syntax.
+ .
+ Package: not-a-package
+
+Package: docker.io
+Status: deinstall ok config-files
+Architecture: amd64
+Version: 20.10.24
+
+Package: libc6
+Status: install ok installed
+Architecture: amd64
+Version: 2.36-9
+
+Package: libc6
+Status: install ok not-installed
+Architecture: i386
+"""
+
+
+@fixture
+def path(*, tmp_path: Path) -> Path:
+    path = tmp_path / "status"
+    _ = path.write_text(_STATUS)
+    return path
+
+
+class TestParseDpkgStatus:
+    def test_main(self) -> None:
+        index = parse_dpkg_status(_STATUS)
+        assert set(index) == {"curl", "docker.io", "libc6"}
+        assert index["curl"].version == "7.88.1-10"
+        assert index["curl"].installed
+        assert not index["docker.io"].installed
+        assert index["libc6"].installed
+
+
+class TestGetDpkgIndex:
+    def test_main(self, *, path: Path) -> None:
+        index = get_dpkg_index(path=path)
+        assert get_dpkg_index(path=path) is index
+        _ = path.write_text(f"{_STATUS}\nPackage: git\nStatus: install ok installed\n")
+        assert "git" in get_dpkg_index(path=path)
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert get_dpkg_index(path=tmp_path / "missing") == {}
+
+
+class TestGetInstalledPackages:
+    def test_main(self, *, path: Path) -> None:
+        packages = ["curl", "docker.io", "git"]
+        assert get_installed_packages(packages, path=path) == ["curl"]
+        assert get_missing_packages(packages, path=path) == ["docker.io", "git"]
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from pydantic import SecretStr
+from pytest import fixture, mark, raises
+
+import installer.apps.github
+from installer.apps.github import (
+    GitHubRelease,
+    get_github_json,
+    get_latest_release,
+    get_release,
+    iter_github_json,
+    resolve_releases,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+    from utilities.types import StrMapping
+
+    from tests.conftest import HTTPServer
+
+
+_TOKEN = SecretStr("token")
+_RELEASE = {
+    "tag_name": "v1.0.0",
+    "assets": [
+        {
+            "name": "asset.tar.gz",
+            "size": 123,
+            "browser_download_url": "https://example.com/asset.tar.gz",
+            "digest": "sha256:abc",
+        }
+    ],
+}
+
+
+@fixture
+def api(*, http_server: HTTPServer, monkeypatch: MonkeyPatch) -> HTTPServer:
+    monkeypatch.setattr(installer.apps.github, "GITHUB_API_URL", http_server.url)
+    http_server.files["/repos/owner/repo/releases/latest"] = json.dumps(
+        _RELEASE
+    ).encode()
+    return http_server
+
+
+class TestGetGitHubJSON:
+    def test_main(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        path = "repos/owner/repo/releases/latest"
+        result1 = get_github_json(path, token=None, root=tmp_path)
+        result2 = get_github_json(path, token=None, root=tmp_path)
+        assert result1 == result2 == _RELEASE
+        (_, _, headers1), (_, _, headers2) = api.requests
+        assert "If-None-Match" not in headers1
+        assert "If-None-Match" in headers2
+
+    def test_no_cache(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        path = "repos/owner/repo/releases/latest"
+        for _ in range(2):
+            _ = get_github_json(path, token=None, cache=False, root=tmp_path)
+        assert all("If-None-Match" not in h for _, _, h in api.requests)
+        assert list(tmp_path.iterdir()) == []
+
+    @mark.usefixtures("api")
+    def test_corrupt_entry(self, *, tmp_path: Path) -> None:
+        path = "repos/owner/repo/releases/latest"
+        _ = get_github_json(path, token=None, root=tmp_path)
+        for entry in tmp_path.iterdir():
+            _ = entry.write_text("corrupt")
+        assert get_github_json(path, token=None, root=tmp_path) == _RELEASE
+
+
+def _releases(*tags: str) -> list[StrMapping]:
+    return [{**_RELEASE, "id": hash(t) % 1000, "tag_name": t} for t in tags]
+
+
+class TestGetRelease:
+    def test_search(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        releases = _releases("v1x2", "v1.2.0")
+        api.files["/repos/owner/repo/releases"] = json.dumps(releases).encode()
+        release = get_release("owner", "repo", "v1.2", token=None, root=tmp_path)
+        assert release.tag_name == "v1x2"
+        ((_, path, _),) = api.requests
+        assert path == "/repos/owner/repo/releases"
+
+    def test_regex(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        releases = _releases("v2.0.0", "v1.2.3", "v1.0.0")
+        api.files["/repos/owner/repo/releases"] = json.dumps(releases).encode()
+        release = get_release("owner", "repo", r"^v1\.", token=None, root=tmp_path)
+        assert release.tag_name == "v1.2.3"
+        assert len(release.assets) == 1
+        assert len(api.requests) == 1
+        index = json.loads((tmp_path / "tags/owner/repo.json").read_text())
+        assert list(index) == ["v2.0.0", "v1.2.3", "v1.0.0"]
+
+    def test_index(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        releases = _releases("v1.2.3", "v1.0.0")
+        api.files["/repos/owner/repo/releases"] = json.dumps(releases).encode()
+        _ = get_release("owner", "repo", r"^v1\.", token=None, root=tmp_path)
+        new, old = _releases("v1.3.0", "v1.0.0")
+        api.files["/repos/owner/repo/releases"] = json.dumps([new, *releases]).encode()
+        api.files[f"/repos/owner/repo/releases/{old['id']}"] = json.dumps(old).encode()
+        api.requests.clear()
+        release = get_release("owner", "repo", r"^v1\.0", token=None, root=tmp_path)
+        assert release.tag_name == "v1.0.0"
+        paths = [p for _, p, _ in api.requests]
+        assert paths == [
+            "/repos/owner/repo/releases",
+            f"/repos/owner/repo/releases/{old['id']}",
+        ]
+        index = json.loads((tmp_path / "tags/owner/repo.json").read_text())
+        assert list(index) == ["v1.3.0", "v1.2.3", "v1.0.0"]
+
+    def test_stale_index(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        releases = _releases("v1.0.0")
+        api.files["/repos/owner/repo/releases"] = json.dumps(releases).encode()
+        path = tmp_path / "tags/owner/repo.json"
+        path.parent.mkdir(parents=True)
+        _ = path.write_text(json.dumps({"v1.0.0": releases[0]["id"], "v0.9.0": 1}))
+        with raises(ValueError, match=r"No release of owner/repo matches"):
+            _ = get_release("owner", "repo", r"^v0\.", token=None, root=tmp_path)
+        assert ("GET", "/repos/owner/repo/releases/1") in {
+            (m, p) for m, p, _ in api.requests
+        }
+        assert json.loads(path.read_text()) == {"v1.0.0": releases[0]["id"]}
+
+    def test_no_match(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        api.files["/repos/owner/repo/releases"] = json.dumps(_releases("v1")).encode()
+        with raises(ValueError, match=r"No release of owner/repo matches '\^v2'"):
+            _ = get_release("owner", "repo", "^v2", token=None, root=tmp_path)
+
+
+class TestIterGitHubJSON:
+    def test_pagination(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        api.files["/items"] = json.dumps([1, 2]).encode()
+        api.files["/items2"] = json.dumps([3]).encode()
+        api.headers["/items"] = {"Link": f'<{api.url}/items2?page=2>; rel="next"'}
+        result = list(iter_github_json("items", token=None, root=tmp_path))
+        assert result == [1, 2, 3]
+        (_, path1, _), (_, path2, _) = api.requests
+        assert (path1, path2) == ("/items", "/items2")
+
+    def test_stops_early(self, *, api: HTTPServer, tmp_path: Path) -> None:
+        api.files["/items"] = json.dumps([1, 2]).encode()
+        api.headers["/items"] = {"Link": f'<{api.url}/items2?page=2>; rel="next"'}
+        assert next(iter_github_json("items", token=None, root=tmp_path)) == 1
+        assert len(api.requests) == 1
+
+
+class TestResolveReleases:
+    def test_main(self, *, api: HTTPServer, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr(installer.apps.github, "_RELEASES", {})
+        asset = {"name": "asset.tar.gz", "size": 123, "downloadUrl": "https://x/a"}
+        release = {"tagName": "v1.0.0", "releaseAssets": {"nodes": [asset]}}
+        data = {
+            "r0": {"latestRelease": release},
+            "r1": {"releases": {"nodes": [{**release, "tagName": "v2.0.0"}, release]}},
+            "r2": None,
+        }
+        api.files["/graphql"] = json.dumps({"data": data}).encode()
+        specs = [
+            ("owner", "repo", None),
+            ("owner", "other", r"^v1\."),
+            ("owner", "missing", None),
+        ]
+        result = resolve_releases(specs, token=_TOKEN, chunk_size=3)
+        assert set(result) == set(specs[:2])
+        assert all(r.tag_name == "v1.0.0" for r in result.values())
+        (body,) = api.bodies
+        assert json.loads(body)["variables"] == {
+            "o0": "owner",
+            "n0": "repo",
+            "o1": "owner",
+            "n1": "other",
+            "o2": "owner",
+            "n2": "missing",
+        }
+        num_requests = len(api.requests)
+        assert get_latest_release("owner", "repo", token=None) is result[specs[0]]
+        assert get_release("owner", "other", r"^v1\.", token=None) is result[specs[1]]
+        assert len(api.requests) == num_requests
+
+    def test_chunks(self, *, api: HTTPServer, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr(installer.apps.github, "_RELEASES", {})
+        api.files["/graphql"] = json.dumps({"data": {}}).encode()
+        specs = [("owner", f"repo{i}", None) for i in range(5)]
+        assert resolve_releases(specs, token=_TOKEN, chunk_size=2) == {}
+        assert len(api.bodies) == 3
+
+    def test_no_token(self, *, api: HTTPServer) -> None:
+        assert resolve_releases([("owner", "repo", None)], token=None) == {}
+        assert api.requests == []
+
+
+class TestGitHubRelease:
+    def test_from_json(self) -> None:
+        release = GitHubRelease.from_json(_RELEASE)
+        assert release.tag_name == "v1.0.0"
+        (asset,) = release.assets
+        assert asset.name == "asset.tar.gz"
+        assert asset.size == 123
+        assert asset.digest == "sha256:abc"
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+from subprocess import check_output
+from sys import executable
+from typing import TYPE_CHECKING
+
+from pytest import mark, param, raises
+
+import installer.apps.host
+from installer.apps.host import (
+    Platform,
+    get_platform,
+    get_system_name,
+    load_platform,
+    make_platform,
+    yield_platform,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+_GLIBC = "ldd (Debian GLIBC 2.36-9+deb12u10) 2.36"
+_MUSL = "musl libc (x86_64)\nVersion 1.2.5"
+
+
+class TestMakePlatform:
+    @mark.parametrize(
+        ("system", "machine", "ldd", "c_std_lib_group", "machine_group"),
+        [
+            param("Linux", "x86_64", _GLIBC, {"gnu", "glibc"}, {"x86_64", "amd64"}),
+            param("Linux", "aarch64", _MUSL, {"musl"}, {"aarch64", "arm64"}),
+            param("Darwin", "arm64", None, None, {"aarch64", "arm64"}),
+        ],
+    )
+    def test_main(
+        self,
+        *,
+        system: str,
+        machine: str,
+        ldd: str | None,
+        c_std_lib_group: set[str] | None,
+        machine_group: set[str],
+    ) -> None:
+        platform = make_platform(system, machine, ldd=ldd)
+        assert platform.system == system
+        assert platform.c_std_lib_group == c_std_lib_group
+        assert machine_group <= platform.machine_group
+
+    def test_invalid(self) -> None:
+        with raises(ValueError, match=r"Invalid machine type"):
+            _ = make_platform("Linux", "riscv64", ldd=_GLIBC)
+
+    def test_json(self) -> None:
+        platform = make_platform("Linux", "x86_64", ldd=_GLIBC)
+        assert Platform.from_json(json.loads(json.dumps(platform.to_json()))) == (
+            platform
+        )
+
+
+class TestLoadPlatform:
+    def test_main(self, *, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+        probes: list[None] = []
+
+        def probe_platform() -> Platform:
+            probes.append(None)
+            return make_platform("Linux", "x86_64", ldd=_GLIBC)
+
+        monkeypatch.setattr(installer.apps.host, "probe_platform", probe_platform)
+        path = tmp_path / "platform.json"
+        first = load_platform(path=path)
+        second = load_platform(path=path)
+        assert first == second
+        assert len(probes) == 1
+
+    def test_key_changed(self, *, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+        path = tmp_path / "platform.json"
+        platform = make_platform("Linux", "x86_64", ldd=_GLIBC)
+        _ = path.write_text(json.dumps({"key": "old", "platform": platform.to_json()}))
+        monkeypatch.setattr(
+            installer.apps.host,
+            "probe_platform",
+            lambda: make_platform("Linux", "aarch64", ldd=_MUSL),
+        )
+        assert load_platform(path=path).c_std_lib_group == {"musl"}
+        assert json.loads(path.read_text())["key"] != "old"
+
+    def test_corrupt(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "platform.json"
+        _ = path.write_text("{")
+        assert load_platform(path=path).system == "Linux"
+
+
+class TestYieldPlatform:
+    def test_main(self) -> None:
+        local = get_system_name()
+        platform = make_platform("Darwin", "arm64", ldd=None)
+        with yield_platform(platform):
+            assert get_platform() == platform
+            assert get_system_name() == "Darwin"
+        assert get_system_name() == local
+
+
+class TestImport:
+    def test_no_probe(self) -> None:
+        code = (
+            "import installer.cli, installer.apps.host; "
+            "print(installer.apps.host._get_local_platform.cache_info().misses)"
+        )
+        assert check_output([executable, "-c", code], text=True).strip() == "0"
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import shutil
+from time import perf_counter, sleep
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import utilities.subprocess
+from pytest import fixture, mark, raises
+from utilities.subprocess import RunCalledProcessError
+
+import installer.apps.install
+from installer.apps.host import make_platform
+from installer.apps.install import (
+    InstallResult,
+    format_results,
+    install_apps,
+    install_apps_over_ssh,
+    parse_results,
+    run_batch,
+)
+from installer.apps.inventory import Inventory, RemoteApp
+
+if TYPE_CHECKING:
+    from pytest import MonkeyPatch
+
+
+_DELAY = 0.2
+
+
+def _which_bin(cmd: str, /) -> str:
+    return f"/usr/bin/{cmd}"
+
+
+def _which_none(_: str, /) -> None:
+    return None
+
+
+@fixture
+def calls(*, monkeypatch: MonkeyPatch) -> list[tuple[str, dict[str, object]]]:
+    calls: list[tuple[str, dict[str, object]]] = []
+
+    def make(name: str, /) -> object:
+        def set_up(*, sudo: bool = False, latest: bool = False) -> None:
+            if name == "setup_jq":
+                msg = "boom"
+                raise RuntimeError(msg)
+            calls.append((name, {"sudo": sudo, "latest": latest}))
+
+        return set_up
+
+    def set_up_apt_package(*packages: str, sudo: bool = False) -> None:
+        calls.append(("set_up_apt_package", {"packages": packages, "sudo": sudo}))
+
+    lib = SimpleNamespace(
+        set_up_apt_package=set_up_apt_package,
+        set_up_bat=make("set_up_bat"),
+        set_up_curl=make("set_up_curl"),
+        set_up_docker=make("set_up_docker"),
+        set_up_fd=make("set_up_fd"),
+        setup_jq=make("setup_jq"),
+    )
+
+    def import_module(_: str, /) -> object:
+        return lib
+
+    def resolve_releases(*_: object, **__: object) -> None: ...
+
+    def resolve_asset(app: object, /, **_: object) -> object:
+        return app
+
+    def extract_asset(app: SimpleNamespace, *_: object, **__: object) -> None:
+        sleep(_DELAY)
+        calls.append(("extract_asset", {"app": app.name}))
+
+    monkeypatch.setattr(installer.apps.install, "import_module", import_module)
+    monkeypatch.setattr(installer.apps.install, "resolve_asset", resolve_asset)
+    monkeypatch.setattr(installer.apps.install, "extract_asset", extract_asset)
+    monkeypatch.setattr(shutil, "which", _which_none)
+    monkeypatch.setattr(installer.apps.install, "get_system_name", lambda: "Linux")
+    monkeypatch.setattr(installer.apps.install, "resolve_releases", resolve_releases)
+    return calls
+
+
+class TestInstallApps:
+    def test_main(self, *, calls: list[tuple[str, dict[str, object]]]) -> None:
+        start = perf_counter()
+        results = install_apps(
+            ["bat", "fd", "jq", "bat"], sudo=True, latest=True, force=True
+        )
+        assert perf_counter() - start <= 2 * _DELAY
+        assert [r.app for r in results] == ["bat", "fd", "jq"]
+        assert [r.ok for r in results] == [True, True, False]
+        assert results[2].error == "RuntimeError('boom')"
+        assert sorted(calls[:3], key=repr) == [
+            ("extract_asset", {"app": "bat"}),
+            ("extract_asset", {"app": "fd"}),
+            ("extract_asset", {"app": "jq"}),
+        ]
+        assert calls[3:] == [
+            ("set_up_bat", {"sudo": True, "latest": True}),
+            ("set_up_fd", {"sudo": True, "latest": True}),
+        ]
+
+    def test_installed(
+        self, *, calls: list[tuple[str, dict[str, object]]], monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(shutil, "which", _which_bin)
+        results = install_apps(["bat", "fd"], sudo=True)
+        assert all(r.ok for r in results)
+        assert calls == [
+            ("set_up_bat", {"sudo": True, "latest": False}),
+            ("set_up_fd", {"sudo": True, "latest": False}),
+        ]
+
+    def test_packages(self, *, calls: list[tuple[str, dict[str, object]]]) -> None:
+        results = install_apps(["curl", "docker", "bat"], sudo=True)
+        assert all(r.ok for r in results)
+        assert calls == [
+            ("extract_asset", {"app": "bat"}),
+            (
+                "set_up_apt_package",
+                {"packages": ("curl", "ca-certificates"), "sudo": True},
+            ),
+            ("set_up_curl", {"sudo": True, "latest": False}),
+            ("set_up_docker", {"sudo": True, "latest": False}),
+            ("set_up_bat", {"sudo": True, "latest": False}),
+        ]
+
+
+class TestRunBatch:
+    def test_main(self, *, calls: list[tuple[str, dict[str, object]]]) -> None:
+        specs = [
+            {"app": "bat", "sudo": True},
+            {"app": "fd", "latest": True, "invalid": 1},
+            {"app": "jq"},
+            {"app": "invalid"},
+        ]
+        start = perf_counter()
+        results = {r.app: r for r in run_batch(specs)}
+        assert perf_counter() - start <= 2 * _DELAY
+        assert {a for a, r in results.items() if r.ok} == {"bat", "fd"}
+        assert results["invalid"].error is not None
+        assert "Unknown app 'invalid'" in results["invalid"].error
+        assert sorted(calls, key=repr) == [
+            ("extract_asset", {"app": "bat"}),
+            ("extract_asset", {"app": "fd"}),
+            ("extract_asset", {"app": "jq"}),
+            ("set_up_bat", {"sudo": True, "latest": False}),
+            ("set_up_fd", {"sudo": False, "latest": True}),
+        ]
+
+
+@fixture
+def remote_apps(*, monkeypatch: MonkeyPatch) -> dict[str, RemoteApp]:
+    remote_apps: dict[str, RemoteApp] = {}
+
+    def probe_inventory(*_: object, **__: object) -> Inventory:
+        platform = make_platform("Linux", "x86_64", ldd=None)
+        return Inventory(platform=platform, apps=remote_apps)
+
+    monkeypatch.setattr(installer.apps.install, "probe_inventory", probe_inventory)
+    return remote_apps
+
+
+class TestInstallAppsOverSSH:
+    @mark.usefixtures("remote_apps")
+    def test_main(self, *, monkeypatch: MonkeyPatch) -> None:
+        inputs: list[str] = []
+
+        def ssh(*_: object, input: str, **__: object) -> str:  # noqa: A002
+            inputs.append(input)
+            return 'log line\n{"app": "jq", "duration": 1.0, "error": null}\n'
+
+        monkeypatch.setattr(utilities.subprocess, "ssh", ssh)
+        results = install_apps_over_ssh(
+            [{"app": "jq", "token": "secret"}], "user@host1,user@host2"
+        )
+        assert results == {
+            "user@host1": [InstallResult(app="jq", duration=1.0)],
+            "user@host2": [InstallResult(app="jq", duration=1.0)],
+        }
+        assert len(inputs) == 2
+        assert (
+            'batch <<\'INSTALLER_EOF\'\n{"app": "jq", "token": "secret"}\n' in inputs[0]
+        )
+
+    def test_skip(
+        self, *, monkeypatch: MonkeyPatch, remote_apps: dict[str, RemoteApp]
+    ) -> None:
+        remote_apps["jq"] = RemoteApp(path="/usr/bin/jq", version="jq-1.7")
+        inputs: list[str] = []
+
+        def ssh(*_: object, input: str, **__: object) -> str:  # noqa: A002
+            inputs.append(input)
+            return '{"app": "fd", "duration": 1.0, "error": null}\n'
+
+        monkeypatch.setattr(utilities.subprocess, "ssh", ssh)
+        results = install_apps_over_ssh([{"app": "jq"}, {"app": "fd"}], "user@host")
+        assert results == {"user@host": [InstallResult(app="fd", duration=1.0)]}
+        assert '{"app": "jq"}' not in inputs[0]
+        assert install_apps_over_ssh([{"app": "jq"}], "user@host") == {"user@host": []}
+        assert len(inputs) == 1
+
+    @mark.usefixtures("remote_apps")
+    def test_failed(self, *, monkeypatch: MonkeyPatch) -> None:
+
+        def ssh(*_: object, **__: object) -> str:
+            stdout = '{"app": "jq", "duration": 1.0, "error": "boom"}\n'
+            raise RunCalledProcessError(cmd="ssh", stdout=stdout, stderr="")
+
+        monkeypatch.setattr(utilities.subprocess, "ssh", ssh)
+        with raises(RuntimeError, match=r"Failed to install \['jq', 'fd'\]"):
+            _ = install_apps_over_ssh([{"app": "jq"}, {"app": "fd"}], "user@host")
+
+    def test_unknown(self) -> None:
+        with raises(ValueError, match=r"Unknown app 'invalid'"):
+            _ = install_apps_over_ssh([{"app": "invalid"}], "user@host")
+
+
+class TestParseResults:
+    def test_main(self) -> None:
+        text = '{"app": "jq", "duration": 1.0, "error": null}\nlog line\n{invalid\n'
+        assert parse_results(text) == [InstallResult(app="jq", duration=1.0)]
+
+
+class TestFormatResults:
+    def test_main(self) -> None:
+        results = [
+            InstallResult(app="ripgrep", duration=1.23),
+            InstallResult(app="uv", duration=0.5, error="boom"),
+        ]
+        assert format_results(results).splitlines() == [
+            "APP      RESULT        TIME",
+            "ripgrep  ok            1.2s",
+            "uv       failed: boom  0.5s",
+            "1 app installed, 1 failed in 1.2s",
+        ]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import utilities.subprocess
+from pytest import fixture, raises
+from utilities.subprocess import run
+
+from installer.apps.inventory import (
+    RemoteApp,
+    inventory_script,
+    parse_inventory,
+    probe_inventory,
+)
+from installer.apps.registry import get_app
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+_OUTPUT = (
+    '{"system":"Linux","machine":"x86_64","ldd":null,"shell":"bash",'
+    '"apps":{"jq":{"path":"/usr/bin/jq","version":"jq-1.7"}},'
+    '"packages":{"htop":true,"tmux":false}}'
+)
+
+
+@fixture
+def env(*, tmp_path: Path) -> dict[str, str]:
+    bin_ = tmp_path / "bin"
+    bin_.mkdir()
+    jq = bin_ / "jq"
+    _ = jq.write_text("#!/bin/sh\necho 'jq-1.7 \"x\" \\'\necho second\n")
+    dpkg_query = bin_ / "dpkg-query"
+    _ = dpkg_query.write_text(
+        '#!/bin/sh\nfor last; do :; done\n[ "$last" != htop ] || printf "ok installed"\n'
+    )
+    for path in [jq, dpkg_query]:
+        path.chmod(0o755)
+    return {"PATH": f"{bin_}:/usr/bin:/bin", "SHELL": "/bin/zsh"}
+
+
+class TestInventoryScript:
+    def test_main(self, *, tmp_path: Path, env: dict[str, str]) -> None:
+        script = inventory_script(
+            apps=[get_app("jq"), get_app("restic")], packages=["htop", "tmux"]
+        )
+        output = run("sh", input=script, env=env, return_=True)
+        inventory = parse_inventory(output)
+        assert inventory.shell == "zsh"
+        assert inventory.apps == {
+            "jq": RemoteApp(path=str(tmp_path / "bin/jq"), version='jq-1.7 "x" \\')
+        }
+        assert inventory.packages == {"htop": True, "tmux": False}
+
+
+class TestParseInventory:
+    def test_main(self) -> None:
+        inventory = parse_inventory(f"motd\n{_OUTPUT}\n")
+        assert inventory.platform.system == "Linux"
+        assert inventory.platform.c_std_lib_group is None
+        assert inventory.apps["jq"].version == "jq-1.7"
+        assert inventory.get_missing_packages(["htop", "tmux", "curl"]) == [
+            "tmux",
+            "curl",
+        ]
+
+    def test_error(self) -> None:
+        with raises(ValueError, match=r"No inventory in 'motd'"):
+            _ = parse_inventory("motd")
+
+
+class TestProbeInventory:
+    def test_main(self, *, monkeypatch: MonkeyPatch) -> None:
+        calls: list[tuple[object, ...]] = []
+
+        def ssh(*args: object, **__: object) -> str:
+            calls.append(args)
+            return _OUTPUT
+
+        monkeypatch.setattr(utilities.subprocess, "ssh", ssh)
+        inventory = probe_inventory("user", "host")
+        assert calls == [("user", "host", "sh", "-l")]
+        assert set(inventory.apps) == {"jq"}
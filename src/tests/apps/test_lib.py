@@ -3,10 +3,12 @@ from __future__ import annotations
 from re import escape, search
 from typing import TYPE_CHECKING
 
+from pydantic import SecretStr
 from utilities.core import normalize_multi_line_str
 from utilities.pytest import run_test_frac, throttle_test
 from utilities.subprocess import run
 
+import installer.apps.lib
 from installer.apps.lib import (
     set_up_age,
     set_up_bat,
@@ -40,6 +42,8 @@ from tests.conftest import RUN_TEST_FRAC, THROTTLE_DURATION
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from pytest import MonkeyPatch
+
 
 class TestSetUpAge:
     @run_test_frac(frac=RUN_TEST_FRAC)
@@ -248,6 +252,23 @@ class TestSetUpRipgrep:
         """)
         assert search(escape(pattern), result) is not None, result
 
+    def test_latest(self, *, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+        def which(cmd: str, /) -> str:
+            return f"/usr/bin/{cmd}"
+
+        tokens: list[object] = []
+
+        def is_up_to_date(*_: object, token: object, **__: object) -> bool:
+            tokens.append(token)
+            return True
+
+        monkeypatch.setattr(installer.apps.lib.shutil, "which", which)
+        monkeypatch.setattr(installer.apps.lib, "is_up_to_date", is_up_to_date)
+        secret = SecretStr("secret")
+        setup_ripgrep(token=secret, path_binaries=tmp_path, latest=True)
+        assert list(tmp_path.iterdir()) == []
+        assert tokens == [secret]
+
 
 class TestSetUpRuff:
     @run_test_frac(frac=RUN_TEST_FRAC)
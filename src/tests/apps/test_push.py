@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import utilities.subprocess
+from pytest import fixture, mark, param, raises
+
+import installer.apps.push
+from installer.apps.host import get_system_name, make_platform
+from installer.apps.push import probe_remote_platform, push_apps
+
+if TYPE_CHECKING:
+    from pytest import MonkeyPatch
+
+    from installer.apps.host import Platform
+
+
+_GLIBC = "ldd (Debian GLIBC 2.36-9+deb12u10) 2.36"
+_PLATFORMS = {
+    "user@linux1": make_platform("Linux", "x86_64", ldd=_GLIBC),
+    "user@linux2": make_platform("Linux", "x86_64", ldd=_GLIBC),
+    "user@mac": make_platform("Darwin", "arm64", ldd=None),
+}
+
+
+@fixture
+def staged(*, monkeypatch: MonkeyPatch) -> list[tuple[str, str]]:
+    staged: list[tuple[str, str]] = []
+
+    def make(name: str, /) -> object:
+        def set_up(
+            *, token: object = None, path_binaries: Path, force: bool = False
+        ) -> None:
+            _ = (token, force)
+            system = get_system_name()
+            staged.append((name, system))
+            _ = Path(path_binaries, name).write_text(system)
+
+        return set_up
+
+    lib = SimpleNamespace(setup_jq=make("jq"), setup_ripgrep=make("rg"))
+
+    def import_module(_: str, /) -> object:
+        return lib
+
+    def probe_remote_platform(target: str, /, **_: object) -> Platform:
+        return _PLATFORMS[target]
+
+    monkeypatch.setattr(installer.apps.push, "import_module", import_module)
+    monkeypatch.setattr(
+        installer.apps.push, "probe_remote_platform", probe_remote_platform
+    )
+    return staged
+
+
+class TestProbeRemotePlatform:
+    def test_main(self, *, monkeypatch: MonkeyPatch) -> None:
+        output = json.dumps({
+            "system": "Darwin",
+            "machine": "arm64",
+            "ldd": None,
+            "shell": "zsh",
+            "apps": {},
+            "packages": {},
+        })
+
+        def ssh(*_: object, **__: object) -> str:
+            return output
+
+        monkeypatch.setattr(utilities.subprocess, "ssh", ssh)
+        assert probe_remote_platform("user@host") == _PLATFORMS["user@mac"]
+
+
+class TestPushApps:
+    def test_main(
+        self, *, monkeypatch: MonkeyPatch, staged: list[tuple[str, str]]
+    ) -> None:
+        pushed: dict[str, dict[str, str]] = {}
+
+        def push_files(files: list[Path], target: str, /, **_: object) -> None:
+            pushed[target] = {f.name: f.read_text() for f in files}
+
+        monkeypatch.setattr(installer.apps.push, "_push_files", push_files)
+        results = push_apps(["jq", "ripgrep"], ",".join(_PLATFORMS))
+        assert all(r.ok for r in results)
+        assert sorted(staged) == [
+            ("jq", "Darwin"),
+            ("jq", "Linux"),
+            ("rg", "Darwin"),
+            ("rg", "Linux"),
+        ]
+        assert pushed == {
+            "user@linux1": {"jq": "Linux", "rg": "Linux"},
+            "user@linux2": {"jq": "Linux", "rg": "Linux"},
+            "user@mac": {"jq": "Darwin", "rg": "Darwin"},
+        }
+
+    def test_probe_failed(
+        self, *, monkeypatch: MonkeyPatch, staged: list[tuple[str, str]]
+    ) -> None:
+        pushed: list[str] = []
+
+        def probe_remote_platform(target: str, /, **_: object) -> Platform:
+            if target == "user@linux2":
+                msg = "unreachable"
+                raise OSError(msg)
+            return _PLATFORMS[target]
+
+        def push_files(_: list[Path], target: str, /, **__: object) -> None:
+            pushed.append(target)
+
+        monkeypatch.setattr(
+            installer.apps.push, "probe_remote_platform", probe_remote_platform
+        )
+        monkeypatch.setattr(installer.apps.push, "_push_files", push_files)
+        with raises(RuntimeError, match=r"Failed on 1 host: \['user@linux2'\]"):
+            _ = push_apps(["jq"], ",".join(_PLATFORMS))
+        assert sorted(staged) == [("jq", "Darwin"), ("jq", "Linux")]
+        assert sorted(pushed) == ["user@linux1", "user@mac"]
+
+    @mark.parametrize("app", [param("curl"), param("fzf"), param("nvim")])
+    def test_unpushable(self, *, app: str) -> None:
+        with raises(ValueError, match=r"cannot be pushed"):
+            _ = push_apps([app], "user@host")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pytest import raises
+
+from installer.apps.registry import APPS, get_app
+
+
+class TestApps:
+    def test_unique(self) -> None:
+        names = [a.name for a in APPS]
+        assert len(set(names)) == len(names)
+
+
+class TestGetAsset:
+    def test_main(self) -> None:
+        app = get_app("eza")
+        darwin, linux = app.get_asset("Darwin"), app.get_asset("Linux")
+        assert darwin is not None
+        assert darwin.owner == "cargo-bins"
+        assert linux is not None
+        assert linux.owner is None
+
+    def test_none(self) -> None:
+        assert get_app("curl").get_asset("Linux") is None
+
+
+class TestGetApp:
+    def test_main(self) -> None:
+        assert get_app("ripgrep").cmd == "rg"
+
+    def test_unknown(self) -> None:
+        with raises(ValueError, match=r"Unknown app 'invalid'"):
+            _ = get_app("invalid")
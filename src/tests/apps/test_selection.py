@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from itertools import product
+from time import perf_counter
+
+from pytest import mark, param, raises
+from utilities.core import OneEmptyError, OneNonUniqueError
+
+from installer.apps.github import GitHubAsset
+from installer.apps.selection import rank_assets, select_asset
+
+_TARGETS = [
+    "aarch64-apple-darwin",
+    "aarch64-pc-windows-msvc",
+    "aarch64-unknown-linux-gnu",
+    "aarch64-unknown-linux-musl",
+    "arm-unknown-linux-musleabihf",
+    "armv7-unknown-linux-gnueabihf",
+    "armv7-unknown-linux-musleabihf",
+    "i686-pc-windows-msvc",
+    "i686-unknown-linux-gnu",
+    "i686-unknown-linux-musl",
+    "powerpc64-unknown-linux-gnu",
+    "powerpc64le-unknown-linux-gnu",
+    "riscv64gc-unknown-linux-gnu",
+    "s390x-unknown-linux-gnu",
+    "x86_64-apple-darwin",
+    "x86_64-pc-windows-msvc",
+    "x86_64-unknown-linux-gnu",
+    "x86_64-unknown-linux-musl",
+]
+
+
+def _listing(name: str, /, *extra: str) -> list[GitHubAsset]:
+    names = [
+        f"{name}-{t}.{'zip' if 'windows' in t else 'tar.gz'}{s}"
+        for t, s in product(_TARGETS, ["", ".sha256"])
+    ]
+    return [
+        GitHubAsset(name=n, size=1, browser_download_url=f"https://example.com/{n}")
+        for n in [*names, *extra]
+    ]
+
+
+_UV = _listing(
+    "uv",
+    "dist-manifest.json",
+    "sha256.sum",
+    "source.tar.gz",
+    "source.tar.gz.sha256",
+    "uv-installer.ps1",
+    "uv-installer.sh",
+)
+_RUFF = _listing(
+    "ruff", "dist-manifest.json", "ruff-installer.ps1", "ruff-installer.sh"
+)
+_STARSHIP = _listing(
+    "starship",
+    "starship-x86_64-pc-windows-msvc.msi",
+    "starship-x86_64-unknown-freebsd.tar.gz",
+)
+_DARWIN, _LINUX = {"darwin", "macos"}, {"linux"}
+_GNU, _MUSL = {"gnu", "glibc"}, {"musl"}
+_ARM64, _X86_64 = {"aarch64", "arm64"}, {"amd64", "intel64", "x64", "x86_64"}
+
+
+class TestSelectAsset:
+    @mark.parametrize(
+        ("assets", "system", "c_std_lib", "machine", "expected"),
+        [
+            param(_UV, _LINUX, _GNU, _X86_64, "uv-x86_64-unknown-linux-gnu.tar.gz"),
+            param(_UV, _LINUX, _MUSL, _ARM64, "uv-aarch64-unknown-linux-musl.tar.gz"),
+            param(_UV, _DARWIN, None, _ARM64, "uv-aarch64-apple-darwin.tar.gz"),
+            param(_RUFF, _LINUX, _GNU, _ARM64, "ruff-aarch64-unknown-linux-gnu.tar.gz"),
+            param(_RUFF, _DARWIN, None, _X86_64, "ruff-x86_64-apple-darwin.tar.gz"),
+            param(
+                _STARSHIP,
+                _LINUX,
+                _GNU,
+                _X86_64,
+                "starship-x86_64-unknown-linux-gnu.tar.gz",
+            ),
+        ],
+    )
+    def test_main(
+        self,
+        *,
+        assets: list[GitHubAsset],
+        system: set[str],
+        c_std_lib: set[str] | None,
+        machine: set[str],
+        expected: str,
+    ) -> None:
+        result = select_asset(
+            assets,
+            system=system,
+            c_std_lib=c_std_lib,
+            machine=machine,
+            not_endswith=["sha256"],
+        )
+        assert result.name == expected
+
+    def test_endswith_str(self) -> None:
+        assets = [
+            GitHubAsset(name=n, size=1, browser_download_url="")
+            for n in ["pkg.deb", "pkg.tar.gz", "pkg.rpm"]
+        ]
+        assert select_asset(assets, endswith="deb").name == "pkg.deb"
+
+    def test_not_matches(self) -> None:
+        result = select_asset(
+            _UV, system=_LINUX, machine=_X86_64, not_matches=["gnu", r"\.sha256$"]
+        )
+        assert result.name == "uv-x86_64-unknown-linux-musl.tar.gz"
+
+    def test_empty(self) -> None:
+        with raises(OneEmptyError):
+            _ = select_asset(_UV, system={"freebsd"})
+
+    def test_non_unique(self) -> None:
+        with raises(OneNonUniqueError, match=r"uv-x86_64-unknown-linux-gnu\.tar\.gz"):
+            _ = select_asset(_UV, system=_LINUX, c_std_lib=_GNU, machine=_X86_64)
+
+
+class TestRankAssets:
+    def test_main(self) -> None:
+        candidates = rank_assets(
+            _UV, system=_LINUX, c_std_lib=_GNU, machine=_X86_64, not_endswith=["sha256"]
+        )
+        first, second, *_ = candidates
+        assert first.accepted
+        assert first.score == 4
+        assert not second.accepted
+        assert second.score == 3
+        assert len(second.rejections) == 1
+
+
+class TestBenchmark:
+    def test_main(self) -> None:
+        listings = [_UV, _RUFF, _STARSHIP]
+        platforms = [
+            (_LINUX, _GNU, _X86_64),
+            (_LINUX, _MUSL, _ARM64),
+            (_DARWIN, None, _ARM64),
+            (_DARWIN, None, _X86_64),
+        ]
+        n = 100
+        start = perf_counter()
+        for _ in range(n):
+            for assets, (system, c_std_lib, machine) in product(listings, platforms):
+                _ = select_asset(
+                    assets,
+                    system=system,
+                    c_std_lib=c_std_lib,
+                    machine=machine,
+                    not_endswith=["sha256"],
+                )
+        mean = (perf_counter() - start) / (n * len(listings) * len(platforms))
+        assert mean <= 1e-3
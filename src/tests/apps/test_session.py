@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from installer.apps.session import get_connection_stats, get_session
+
+if TYPE_CHECKING:
+    from tests.conftest import HTTPServer
+
+
+class TestGetConnectionStats:
+    def test_main(self, *, http_server: HTTPServer) -> None:
+        http_server.files["/file"] = b"contents"
+        for _ in range(3):
+            with get_session().get(f"{http_server.url}/file") as resp:
+                assert resp.content == b"contents"
+        (stats,) = (s for s in get_connection_stats() if s.host == f"{http_server.url}")
+        assert stats.connections == 1
+        assert stats.requests == 3
+        assert stats.reused == 2
+
+
+class TestGetSession:
+    def test_main(self) -> None:
+        assert get_session() is get_session()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from hashlib import sha256
+from typing import TYPE_CHECKING
+
+from pytest import fixture, mark, param
+
+import installer.apps.state
+from installer.apps.github import GitHubAsset, GitHubRelease
+from installer.apps.state import (
+    InstalledArtifact,
+    get_converged_digest,
+    get_installed,
+    is_up_to_date,
+    note_installed_path,
+    note_resolved_asset,
+    set_converged_digest,
+    set_installed,
+    yield_recorded_install,
+    yield_staged_install,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+def _release(tag: str, digest: str | None, /) -> GitHubRelease:
+    asset = GitHubAsset(
+        name="tool.tar.gz", size=1, browser_download_url="", digest=digest
+    )
+    return GitHubRelease(tag_name=tag, assets=[asset])
+
+
+@fixture
+def path(*, tmp_path: Path) -> Path:
+    return tmp_path / "state.sqlite"
+
+
+class TestConvergedDigest:
+    def test_main(self, *, path: Path) -> None:
+        assert get_converged_digest("app:jq", path=path) is None
+        set_converged_digest("app:jq", "abc", path=path)
+        set_converged_digest("app:jq", "def", path=path)
+        assert get_converged_digest("app:jq", path=path) == "def"
+
+
+class TestYieldRecordedInstall:
+    def test_main(self, *, tmp_path: Path, path: Path) -> None:
+        release = _release("v1", "sha256:1")
+        binary = tmp_path / "tool"
+        with yield_recorded_install("tool", path=path):
+            note_resolved_asset("owner", "repo", release, release.assets[0])
+            _ = binary.write_bytes(b"binary")
+            note_installed_path(binary)
+        (artifact,) = get_installed("tool", path=path)
+        assert artifact.path == str(binary)
+        assert (artifact.owner, artifact.repo) == ("owner", "repo")
+        assert (artifact.tag, artifact.asset) == ("v1", "tool.tar.gz")
+        assert artifact.digest == "sha256:1"
+        assert artifact.sha256 == sha256(b"binary").hexdigest()
+        assert artifact.inode == binary.stat().st_ino
+        assert artifact.mtime_ns == binary.stat().st_mtime_ns
+
+    def test_reinstall(self, *, tmp_path: Path, path: Path) -> None:
+        for name in ["old", "new"]:
+            with yield_recorded_install("tool", path=path):
+                note_installed_path(tmp_path / name)
+        (artifact,) = get_installed("tool", path=path)
+        assert artifact.path == str(tmp_path / "new")
+
+    def test_nothing_noted(self, *, path: Path) -> None:
+        with yield_recorded_install("tool", path=path):
+            ...
+        (artifact,) = get_installed("tool", path=path)
+        assert artifact.path == ""
+        assert artifact.tag is None
+
+    def test_outside(self, *, tmp_path: Path, path: Path) -> None:
+        note_installed_path(tmp_path / "tool")
+        assert get_installed(path=path) == []
+
+    def test_staged(self, *, tmp_path: Path, path: Path) -> None:
+        with yield_staged_install(), yield_recorded_install("tool", path=path):
+            note_installed_path(tmp_path / "tool")
+        assert get_installed(path=path) == []
+
+
+class TestIsUpToDate:
+    @mark.parametrize(
+        ("tag", "digest", "expected"),
+        [
+            param("v1", "sha256:1", True),
+            param("v1", None, True),
+            param("v1", "sha256:2", False),
+            param("v2", "sha256:1", False),
+        ],
+    )
+    def test_main(
+        self,
+        *,
+        path: Path,
+        monkeypatch: MonkeyPatch,
+        tag: str,
+        digest: str | None,
+        expected: bool,
+    ) -> None:
+        artifact = InstalledArtifact(
+            app="tool",
+            owner="owner",
+            repo="repo",
+            tag="v1",
+            asset="tool.tar.gz",
+            digest="sha256:1",
+        )
+        set_installed("tool", [artifact], path=path)
+
+        def get_latest_release(*_: object, **__: object) -> GitHubRelease:
+            return _release(tag, digest)
+
+        monkeypatch.setattr(
+            installer.apps.state, "get_latest_release", get_latest_release
+        )
+        assert is_up_to_date("tool", path=path) is expected
+
+    def test_not_recorded(self, *, path: Path) -> None:
+        assert not is_up_to_date("tool", path=path)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING
+
+from pytest import fixture, mark, param
+
+import installer.apps.status
+from installer.apps.github import GitHubRelease
+from installer.apps.registry import App
+from installer.apps.state import InstalledArtifact, set_installed
+from installer.apps.status import AppStatus, format_statuses, get_statuses
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+_DELAY = 0.2
+
+
+@fixture
+def bin_dir(*, tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    path = tmp_path / "bin"
+    path.mkdir()
+    monkeypatch.setenv("PATH", str(path))
+
+    def get_latest_release(owner: str, repo: str, /, **_: object) -> GitHubRelease:
+        sleep(_DELAY)
+        return GitHubRelease(tag_name=f"v1.2.{len(owner + repo)}")
+
+    monkeypatch.setattr(installer.apps.status, "get_latest_release", get_latest_release)
+    return path
+
+
+def _write_binary(bin_dir: Path, name: str, version: str, /) -> Path:
+    path = bin_dir / name
+    _ = path.write_text(
+        f"#!/bin/sh\necho x >> {bin_dir / f'{name}.calls'}\necho '{name} {version}'\n"
+    )
+    path.chmod(0o755)
+    return path
+
+
+def _app(name: str, /) -> App:
+    return App(name=name, cmd=name, set_up=f"set_up_{name}", owner="o", repo=name)
+
+
+class TestGetStatuses:
+    def test_main(self, *, bin_dir: Path, tmp_path: Path) -> None:
+        _ = _write_binary(bin_dir, "abc", "1.2.4")
+        _ = _write_binary(bin_dir, "defg", "1.2.0")
+        status_abc, status_defg, status_missing = get_statuses(
+            [_app("abc"), _app("defg"), _app("missing")],
+            state=tmp_path / "state.sqlite",
+            cache=tmp_path / "versions.json",
+        )
+        assert status_abc.installed == "abc 1.2.4"
+        assert status_abc.latest == "v1.2.4"
+        assert not status_abc.outdated
+        assert status_defg.outdated
+        assert status_missing.installed is None
+        assert not status_missing.outdated
+
+    @mark.usefixtures("bin_dir")
+    def test_concurrent(self, *, tmp_path: Path) -> None:
+        apps = [_app(f"app{i}") for i in range(10)]
+        start = perf_counter()
+        _ = get_statuses(
+            apps, state=tmp_path / "state.sqlite", cache=tmp_path / "versions.json"
+        )
+        assert perf_counter() - start <= 5 * _DELAY
+
+    def test_version_cache(self, *, bin_dir: Path, tmp_path: Path) -> None:
+        _ = _write_binary(bin_dir, "abc", "1.2.4")
+        for _ in range(2):
+            (status,) = get_statuses(
+                [_app("abc")],
+                state=tmp_path / "state.sqlite",
+                cache=tmp_path / "versions.json",
+            )
+            assert status.installed == "abc 1.2.4"
+        assert (bin_dir / "abc.calls").read_text() == "x\n"
+
+    def test_recorded(self, *, bin_dir: Path, tmp_path: Path) -> None:
+        binary = _write_binary(bin_dir, "abc", "1.2.4")
+        stat = binary.stat()
+        state = tmp_path / "state.sqlite"
+        artifact = InstalledArtifact(
+            app="abc",
+            path=str(binary),
+            tag="v1.2.3",
+            inode=stat.st_ino,
+            mtime_ns=stat.st_mtime_ns,
+        )
+        set_installed("abc", [artifact], path=state)
+        (status,) = get_statuses(
+            [_app("abc")], state=state, cache=tmp_path / "versions.json"
+        )
+        assert status.installed == "v1.2.3"
+        assert status.outdated
+        assert not (bin_dir / "abc.calls").exists()
+
+
+class TestAppStatus:
+    @mark.parametrize(
+        ("installed", "latest", "expected"),
+        [
+            param("ripgrep 14.1.0 (rev abc)", "14.1.0", False),
+            param("jq-1.7.1", "jq-1.8.0", True),
+            param("uv 0.5.0", "v0.5.1", True),
+            param(None, "v0.5.1", False),
+            param("uv", "v0.5.1", False),
+        ],
+    )
+    def test_outdated(
+        self, *, installed: str | None, latest: str, expected: bool
+    ) -> None:
+        status = AppStatus(app="app", installed=installed, latest=latest)
+        assert status.outdated is expected
+
+
+class TestFormatStatuses:
+    def test_main(self) -> None:
+        statuses = [
+            AppStatus(app="uv", installed="uv 0.5.0", latest="0.5.1"),
+            AppStatus(app="ripgrep", latest="14.1.0"),
+        ]
+        assert format_statuses(statuses).splitlines() == [
+            "APP      INSTALLED  LATEST  STATUS",
+            "uv       0.5.0      0.5.1   outdated",
+            "ripgrep  -          14.1.0  missing",
+        ]
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import TYPE_CHECKING, override
 
+from pytest import fixture
 from utilities.constants import HOUR
 from utilities.hypothesis import setup_hypothesis_profiles
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from utilities.types import Duration
 
 
@@ -14,3 +21,83 @@ setup_hypothesis_profiles()
 
 RUN_TEST_FRAC: float = 0.1
 THROTTLE_DURATION: Duration = HOUR
+
+
+@dataclass(kw_only=True, slots=True)
+class HTTPServer:
+    url: str
+    files: dict[str, bytes] = field(default_factory=dict)
+    fail_after: dict[str, int] = field(default_factory=dict)
+    headers: dict[str, dict[str, str]] = field(default_factory=dict)
+    bodies: list[bytes] = field(default_factory=list)
+    requests: list[tuple[str, str, dict[str, str]]] = field(default_factory=list)
+
+
+@fixture
+def http_server() -> Iterator[HTTPServer]:
+    state = HTTPServer(url="")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            self._respond(body=True)
+
+        def do_HEAD(self) -> None:
+            self._respond(body=False)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", 0))
+            state.bodies.append(self.rfile.read(length))
+            self._respond(body=True)
+
+        @override
+        def log_message(self, format: str, *args: object) -> None:
+            _ = (format, args)
+
+        def _respond(self, *, body: bool) -> None:
+            path = self.path.split("?")[0]
+            state.requests.append((self.command, path, dict(self.headers)))
+            try:
+                data = state.files[path]
+            except KeyError:
+                self.send_error(404)
+                return
+            etag = f'"{sha256(data).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            range_ = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if (range_ is not None) and ((if_range is None) or (if_range == etag)):
+                start, end = range_.removeprefix("bytes=").split("-")
+                start, end = int(start), (len(data) - 1 if end == "" else int(end))
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                data = data[start : end + 1]
+            else:
+                self.send_response(200)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("ETag", etag)
+            for key, value in state.headers.get(path, {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            if body and ((n := state.fail_after.pop(path, None)) is not None):
+                _ = self.wfile.write(data[:n])
+                self.close_connection = True
+            elif body:
+                _ = self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    host, port = server.server_address[:2]
+    state.url = f"http://{host!s}:{port}"
+    thread = Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
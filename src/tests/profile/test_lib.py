@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, sleep
+
+from pytest import fixture, raises
+
+from installer.profile.lib import (
+    Node,
+    NodeResult,
+    converge,
+    format_results,
+    load_profile,
+)
+
+_DELAY = 0.2
+_CALLS: list[str] = []
+_LOCK = Lock()
+
+
+def record(name: str, /, **_: object) -> None:
+    sleep(_DELAY)
+    with _LOCK:
+        _CALLS.append(name)
+
+
+def touch(name: str, /, *, path_binaries: str) -> None:
+    record(name)
+    _ = Path(path_binaries, "jq").touch()
+
+
+def fail(name: str, /) -> None:
+    msg = f"{name} failed"
+    raise RuntimeError(msg)
+
+
+def _node(name: str, /, *needs: str, func: str = "record", **kwargs: object) -> Node:
+    return Node(
+        name=name, module=__name__, func=func, args=(name,), kwargs=kwargs, needs=needs
+    )
+
+
+@fixture(autouse=True)
+def calls() -> list[str]:
+    _CALLS.clear()
+    return _CALLS
+
+
+@fixture
+def state(*, tmp_path: Path) -> Path:
+    return tmp_path / "state.sqlite"
+
+
+class TestConverge:
+    def test_main(self, *, calls: list[str], state: Path) -> None:
+        nodes = [_node("a"), _node("b"), _node("c", "a", "b"), _node("d")]
+        start = perf_counter()
+        results = converge(nodes, state=state)
+        assert perf_counter() - start <= 3 * _DELAY
+        assert [r.status for r in results] == ["changed"] * 4
+        assert calls[-1] == "c"
+
+    def test_unchanged(self, *, calls: list[str], state: Path) -> None:
+        _ = converge([_node("a", x=1)], state=state)
+        (result,) = converge([_node("a", x=1)], state=state)
+        assert result.status == "unchanged"
+        (result,) = converge([_node("a", x=2)], state=state)
+        assert result.status == "changed"
+        (result,) = converge([_node("a", x=2)], state=state, force=True)
+        assert result.status == "changed"
+        assert calls == ["a", "a", "a"]
+
+    def test_file_input(self, *, tmp_path: Path, state: Path) -> None:
+        path = tmp_path / "starship.toml"
+        _ = path.write_text("a")
+        _ = converge([_node("a", starship_toml=str(path))], state=state)
+        _ = path.write_text("b")
+        (result,) = converge([_node("a", starship_toml=str(path))], state=state)
+        assert result.status == "changed"
+
+    def test_state_lost(self, *, tmp_path: Path, calls: list[str], state: Path) -> None:
+        node = _node("app:jq", func="touch", path_binaries=str(tmp_path))
+        _ = converge([node], state=state)
+        (result,) = converge([node], state=state)
+        assert result.status == "unchanged"
+        (tmp_path / "jq").unlink()
+        (result,) = converge([node], state=state)
+        assert result.status == "changed"
+        assert (tmp_path / "jq").is_file()
+        assert calls == ["app:jq", "app:jq"]
+
+    def test_state_failed(self, *, calls: list[str], state: Path) -> None:
+        nodes = [_node("a", func="touch"), _node("b", "a"), _node("c")]
+        result_a, result_b, result_c = converge(nodes, state=state)
+        assert result_a.status == "failed"
+        assert result_a.error is not None
+        assert "path_binaries" in result_a.error
+        assert result_b.status == "blocked"
+        assert result_c.ok
+        assert calls == ["c"]
+
+    def test_failed(self, *, calls: list[str], state: Path) -> None:
+        nodes = [_node("a", func="fail"), _node("b", "a"), _node("c")]
+        result_a, result_b, result_c = converge(nodes, state=state)
+        assert result_a.status == "failed"
+        assert result_a.error == "RuntimeError('a failed')"
+        assert result_b.status == "blocked"
+        assert result_c.ok
+        assert calls == ["c"]
+
+    def test_cycle(self, *, state: Path) -> None:
+        with raises(ValueError, match=r"Profile has a dependency cycle"):
+            _ = converge([_node("a", "b"), _node("b", "a")], state=state)
+
+
+class TestLoadProfile:
+    def test_main(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "profile.toml"
+        _ = path.write_text("""
+apt = ["htop", "tmux"]
+
+[defaults]
+sudo = true
+path_binaries = "~/bin"
+
+[apps.ripgrep]
+[apps.docker]
+user = "user"
+
+[sshd]
+permit_root_login = false
+
+[[clone]]
+key = "~/.ssh/deploy"
+owner = "owner"
+repo = "repo"
+""")
+        nodes = {n.name: n for n in load_profile(path)}
+        assert set(nodes) == {
+            "app:curl",
+            "app:docker",
+            "app:git",
+            "app:ripgrep",
+            "apt",
+            "clone:owner/repo",
+            "sshd",
+        }
+        assert nodes["app:ripgrep"].kwargs["sudo"] is True
+        assert not nodes["app:ripgrep"].kwargs["path_binaries"].startswith("~")
+        assert "path_binaries" not in nodes["app:docker"].kwargs
+        assert set(nodes["app:docker"].needs) == {"app:curl", "app:git"}
+        assert nodes["app:curl"].needs == ("apt",)
+        assert nodes["clone:owner/repo"].needs == ("app:git",)
+        assert nodes["apt"].args == ("htop", "tmux", "curl", "git", "ca-certificates")
+        assert nodes["app:ripgrep"].needs == ()
+
+    def test_invalid_option(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "profile.toml"
+        _ = path.write_text("[apps.ripgrep]\ninvalid = 1\n")
+        with raises(ValueError, match=r"Invalid options for 'app:ripgrep'"):
+            _ = load_profile(path)
+
+    def test_invalid_section(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "profile.toml"
+        _ = path.write_text("[invalid]\n")
+        with raises(ValueError, match=r"Invalid profile sections: \['invalid'\]"):
+            _ = load_profile(path)
+
+
+class TestFormatResults:
+    def test_main(self) -> None:
+        results = [
+            NodeResult(node="app:jq", status="changed", duration=1.23),
+            NodeResult(node="sshd", status="unchanged"),
+        ]
+        assert format_results(results).splitlines() == [
+            "NODE    STATUS     TIME",
+            "app:jq  changed    1.2s",
+            "sshd    unchanged  0.0s",
+            "1 changed, 1 unchanged, 0 failed, 0 blocked",
+        ]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from subprocess import check_output
+from sys import executable
 from typing import TYPE_CHECKING
 
 from click.testing import CliRunner
 from pytest import mark, param
 from utilities.constants import MINUTE
+from utilities.core import normalize_multi_line_str
 from utilities.pytest import skipif_ci, throttle_test
 from utilities.subprocess import run
 
@@ -14,6 +17,15 @@ if TYPE_CHECKING:
     from pathlib import Path
 
 
+_HEAVY_MODULES = {
+    "installer.apps.download",
+    "installer.apps.github",
+    "installer.apps.lib",
+    "requests",
+    "utilities.inflect",
+}
+
+
 class TestCLI:
     @mark.parametrize(
         "commands",
@@ -23,6 +35,7 @@ class TestCLI:
             param(["apt-package", "git", "--ssh", "user@hostname"]),
             param(["apt-package", "git", "--sudo"]),
             param(["apt-package", "git", "--retry", "1", "1"]),
+            param(["apt-package", "git", "curl"], id="apt-package many"),
             param(["curl"], id="curl"),
             param(["curl", "--ssh", "user@hostname"]),
             param(["curl", "--sudo"]),
@@ -40,6 +53,7 @@ class TestCLI:
             param(["jq", "--owner", "owner"]),
             param(["jq", "--group", "group"]),
             param(["ripgrep"], id="ripgrep"),
+            param(["ripgrep", "--latest"], id="ripgrep latest"),
             param(["rsync"], id="rsync"),
             param(["rsync", "--ssh", "user@hostname"]),
             param(["rsync", "--sudo"]),
@@ -68,6 +82,13 @@ class TestCLI:
             param(["setup-ssh-config"], id="setup-ssh-config"),
             param(["setup-sshd-config"], id="setup-sshd-config"),
             ##
+            param(["status"], id="status"),
+            param(["outdated"], id="outdated"),
+            param(["install", "jq", "fd"], id="install"),
+            param(["install", "jq", "fd", "--ssh", "user@host"], id="install ssh"),
+            param(["batch"], id="batch"),
+            param(["push", "jq", "--ssh", "user@host"], id="push"),
+            ##
             param(["--version"], id="version"),
         ],
     )
@@ -209,3 +230,20 @@ class TestCLI:
     @throttle_test(duration=MINUTE)
     def test_justfile(self) -> None:
         run("just", "cli", "--help")
+
+
+class TestLazyImports:
+    @mark.parametrize("arg", [param("--help"), param("--version")])
+    def test_main(self, *, arg: str) -> None:
+        code = normalize_multi_line_str(f"""
+            import sys
+            from installer.cli import cli
+            try:
+                cli([{arg!r}])
+            except SystemExit:
+                pass
+            print(*sys.modules, sep="\\n")
+        """)
+        modules = set(check_output([executable, "-c", code], text=True).splitlines())
+        assert "installer.cli" in modules
+        assert modules.isdisjoint(_HEAVY_MODULES)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from signal import SIGTERM
+from subprocess import Popen
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING
+
+from pytest import mark, param, raises
+from utilities.subprocess import RunCalledProcessError, run
+
+from installer.fleet import (
+    HostResult,
+    format_host_results,
+    get_ssh_targets,
+    run_on_ssh_targets,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+_DELAY = 0.2
+
+
+class TestGetSSHTargets:
+    @mark.parametrize(
+        ("ssh", "expected"),
+        [
+            param("user@host1", ["user@host1"]),
+            param("user@host1,user@host2", ["user@host1", "user@host2"]),
+            param(" user@host1 , user@host1, ", ["user@host1"]),
+        ],
+    )
+    def test_main(self, *, ssh: str, expected: list[str]) -> None:
+        assert get_ssh_targets(ssh) == expected
+
+    def test_inventory(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "hosts"
+        _ = path.write_text("# web\nuser@host1\n\nuser@host2  # db\n")
+        assert get_ssh_targets(f"@{path}") == ["user@host1", "user@host2"]
+
+    def test_empty(self) -> None:
+        with raises(ValueError, match=r"No SSH targets in ','"):
+            _ = get_ssh_targets(",")
+
+
+class TestRunOnSSHTargets:
+    def test_main(self) -> None:
+        calls: list[str] = []
+
+        def func(target: str, /) -> None:
+            sleep(_DELAY)
+            calls.append(target)
+
+        targets = [f"user@host{i}" for i in range(10)]
+        start = perf_counter()
+        results = run_on_ssh_targets(",".join(targets), func)
+        assert perf_counter() - start <= 5 * _DELAY
+        assert sorted(calls) == sorted(targets)
+        assert all(r.ok for r in results)
+
+    def test_failures(self) -> None:
+        def func(target: str, /) -> None:
+            if target == "user@host2":
+                msg = "boom"
+                raise ValueError(msg)
+            if target == "user@host3":
+                sleep(10 * _DELAY)
+
+        with raises(RuntimeError, match=r"Failed on 2 hosts"):
+            _ = run_on_ssh_targets(
+                "user@host1,user@host2,user@host3", func, timeout=_DELAY
+            )
+
+    def test_single(self) -> None:
+        def func(target: str, /) -> None:
+            sleep(_DELAY)
+            if target == "user@host2":
+                msg = f"{target} failed"
+                raise ValueError(msg)
+
+        (result,) = run_on_ssh_targets("user@host1", func)
+        assert result.duration >= _DELAY
+        with raises(ValueError, match=r"user@host2 failed"):
+            _ = run_on_ssh_targets("user@host2", func)
+
+    def test_timeout_kills(self) -> None:
+        codes: list[int] = []
+
+        def func(target: str, /) -> None:
+            try:
+                _ = run("sh", "-c", "sleep 30 & wait", target)
+            except RunCalledProcessError as error:
+                codes.append(error.return_code)
+
+        with Popen(["sh", "-c", "sleep 30", "user@host1"]) as other:
+            start = perf_counter()
+            with raises(RuntimeError, match=r"Failed on 1 host"):
+                _ = run_on_ssh_targets("user@host1", func, timeout=_DELAY)
+            assert perf_counter() - start <= 10 * _DELAY
+            assert codes == [-SIGTERM]
+            assert other.poll() is None
+            other.kill()
+
+
+class TestFormatHostResults:
+    def test_main(self) -> None:
+        results = [
+            HostResult(target="user@host1", duration=1.23),
+            HostResult(target="user@host2", duration=0.2, error="timed out"),
+        ]
+        assert format_host_results(results).splitlines() == [
+            "HOST        RESULT             TIME",
+            "user@host1  ok                 1.2s",
+            "user@host2  failed: timed out  0.2s",
+            "1 host succeeded, 1 failed",
+        ]
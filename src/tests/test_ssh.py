@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest import fixture
+from utilities.subprocess import run
+
+from installer.ssh import SSH_CONTROL_DIR_ENV, enable_ssh_multiplexing
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@fixture
+def env(*, tmp_path: Path) -> dict[str, str]:
+    bin_ = tmp_path / "bin"
+    bin_.mkdir()
+    ssh = bin_ / "ssh"
+    _ = ssh.write_text(f'#!/bin/sh\necho "$@" >> {tmp_path / "calls"}\n')
+    ssh.chmod(0o755)
+    return {"PATH": f"{bin_}:/usr/bin:/bin"}
+
+
+class TestEnableSSHMultiplexing:
+    def test_main(self, *, tmp_path: Path, env: dict[str, str]) -> None:
+        mux = enable_ssh_multiplexing(persist=30, env=env)
+        assert mux is not None
+        assert env["PATH"].startswith(f"{mux.bin}:")
+        assert env[SSH_CONTROL_DIR_ENV] == str(mux.control)
+        _ = run("ssh", "user@hostname", "true", env=env)
+        _ = (mux.control / "socket").touch()
+        mux.close()
+        assert not mux.path.exists()
+        assert (tmp_path / "calls").read_text().splitlines() == [
+            (
+                f"-o ControlMaster=auto -o ControlPath={mux.control}/%C"
+                " -o ControlPersist=30 user@hostname true"
+            ),
+            f"-o ControlPath={mux.control / 'socket'} -O exit installer",
+        ]
+
+    def test_already_enabled(self, *, env: dict[str, str]) -> None:
+        mux = enable_ssh_multiplexing(env=env)
+        assert mux is not None
+        assert enable_ssh_multiplexing(env=env) is None
+        mux.close()
+
+    def test_no_ssh(self, *, tmp_path: Path) -> None:
+        assert enable_ssh_multiplexing(env={"PATH": str(tmp_path)}) is None
+
+    def test_path_too_long(self, *, tmp_path: Path, env: dict[str, str]) -> None:
+        base = tmp_path / ("x" * 100)
+        base.mkdir()
+        assert enable_ssh_multiplexing(env=env, base=base) is None
+        assert SSH_CONTROL_DIR_ENV not in env
+        assert list(base.iterdir()) == []
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import TYPE_CHECKING
 
-from pytest import mark, param
+from pytest import fixture, mark, param, raises
+from utilities.subprocess import RunCalledProcessError, run
 
-from installer.utilities import ensure_line_or_lines, split_ssh
+from installer.utilities import ensure_line_or_lines, installer_cli_script, split_ssh
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -33,6 +36,105 @@ class TestEnsureLineOrLines:
         ensure_line_or_lines(path, ["line 3", "line 4"])
         assert path.read_text() == "line 1\nline 2\n\nline 3\nline 4\n"
 
+    def test_concurrent(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "file.txt"
+        lines = [f"line {i}" for i in range(20)]
+        with ThreadPoolExecutor(max_workers=len(lines)) as pool:
+            _ = list(pool.map(partial(ensure_line_or_lines, path), lines * 2))
+        contents = path.read_text()
+        assert all(contents.count(f"{line}\n") == 1 for line in lines)
+
+
+@fixture
+def env(*, tmp_path: Path) -> dict[str, str]:
+    # '9.9.9' is unpublished; '8.8.8' resolves to another version; unpinned is '7.7.7'
+    bin_ = tmp_path / "bin"
+    bin_.mkdir()
+    uv = bin_ / "uv"
+    _ = uv.write_text(f"""#!/bin/sh
+echo "$@" >> {tmp_path / "calls"}
+for last; do :; done
+case "$1 $2" in
+    "venv "*)
+        sleep 0.2
+        mkdir -p "$last/bin"
+        printf '#!/bin/sh\\necho cli "$@"\\n[ "$1" != batch ] || cat\\n' > "$last/bin/cli"
+        chmod +x "$last/bin/cli"
+        ;;
+    "pip install")
+        case $last in
+            *==9.9.9) exit 1 ;;
+            *==8.8.8) version=8.8.9 ;;
+            *==*) version=${{last##*==}} ;;
+            *) version=7.7.7 ;;
+        esac
+        echo "$version" > "$(dirname "$5")/version"
+        ;;
+    "pip show") echo "Name: dycw-installer" && echo "Version: $(cat "$(dirname "$4")/version")" ;;
+esac
+""")
+    uv.chmod(0o755)
+    return {"HOME": str(tmp_path), "PATH": f"{bin_}:/usr/bin:/bin"}
+
+
+class TestInstallerCLIScript:
+    def test_main(self, *, tmp_path: Path, env: dict[str, str]) -> None:
+        script = installer_cli_script("jq", "--sudo", version="1.2.3")
+        for _ in range(2):
+            output = run("sh", input=script, env=env, return_=True)
+            assert output == "cli jq --sudo"
+        root = tmp_path / ".local/share/installer/1.2.3"
+        assert (tmp_path / "calls").read_text().splitlines() == [
+            f"venv --quiet --relocatable --managed-python {root}",
+            f"pip install --quiet --python {root}/bin/python dycw-installer[cli]==1.2.3",
+            f"pip show --python {root}/bin/python dycw-installer",
+        ]
+        assert (root / ".installed").exists()
+
+    @mark.parametrize(
+        ("version", "error"),
+        [
+            param("9.9.9", "Unable to install 'dycw-installer[cli]==9.9.9'"),
+            param("8.8.8", "Installed 'dycw-installer' 8.8.9, not 8.8.8"),
+        ],
+    )
+    def test_error(
+        self, *, tmp_path: Path, env: dict[str, str], version: str, error: str
+    ) -> None:
+        script = installer_cli_script("jq", version=version)
+        with raises(RunCalledProcessError) as exc_info:
+            _ = run("sh", input=script, env=env, return_=True)
+        assert error in exc_info.value.stderr
+        assert not (tmp_path / f".local/share/installer/{version}/.installed").exists()
+        assert not (tmp_path / ".local/share/installer/.lock").exists()
+
+    def test_dev(self, *, tmp_path: Path, env: dict[str, str]) -> None:
+        script = installer_cli_script("jq", version="1.2.3.dev0")
+        for _ in range(2):
+            output = run("sh", input=script, env=env, return_stdout=True)
+            assert output == "cli jq"
+        base = tmp_path / ".local/share/installer"
+        assert sorted(p.name for p in base.iterdir()) == ["7.7.7"]
+        assert (base / "7.7.7/.installed").exists()
+
+    def test_concurrent(self, *, tmp_path: Path, env: dict[str, str]) -> None:
+        script = installer_cli_script("jq", version="1.2.3")
+
+        def run_script(_: int, /) -> str:
+            return run("sh", input=script, env=env, return_=True)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            outputs = list(pool.map(run_script, range(4)))
+        assert outputs == ["cli jq"] * 4
+        calls = (tmp_path / "calls").read_text().splitlines()
+        assert sum(c.startswith("venv") for c in calls) == 1
+        assert not (tmp_path / ".local/share/installer/.lock").exists()
+
+    def test_stdin(self, *, env: dict[str, str]) -> None:
+        script = installer_cli_script("batch", version="1.2.3", stdin='{"app": "jq"}')
+        output = run("sh", input=script, env=env, return_=True)
+        assert output == 'cli batch\n{"app": "jq"}'
+
 
 class TestSplitSSH:
     @mark.parametrize(